@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Mesures de performance de la simulation, de l'affichage, du chargement, des collisions
+et des ajouts et retraits de corps
+
+Les résultats sont comparés à une référence JSON enregistrée dans le dépôt ;
+une mesure moins bonne que la référence au-delà d'un seuil est signalée
+comme une régression et le programme se termine avec le code 1.
+
+    python -m benchmarks.bench_performances                 # compare à la référence
+    python -m benchmarks.bench_performances --enregistrer   # remplace la référence
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+from typing import Callable, Dict, List, Optional
+
+# Le rendu se fait hors écran : le pilote doit être choisi avant l'initialisation de pygame
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from src.modele import CorpsCeleste, SystemeSolaire
+from src.generateur import UA, disque_kepler, vers_systeme, ecrire_json
+from src.catalogue import enregistrer_npz
+from src.diagnostics import calculer_diagnostics
+from src.collisions import detecter_contacts
+from src.simulation import Simulation
+
+REFERENCE = os.path.join(os.path.dirname(__file__), 'reference.json')
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Programme exécuté dans un nouvel interpréteur : import du programme principal,
+# puis création de la fenêtre et première image du système solaire
+CODE_DEMARRAGE = """
+import json, time
+debut = time.perf_counter()
+import src.main
+import_main = time.perf_counter() - debut
+from src.modele import SystemeSolaire
+systeme = SystemeSolaire.depuis_json('data/planets.json')
+debut = time.perf_counter()
+visualisation = src.main.classe_visualisation()()
+visualisation.afficher(systeme)
+premiere_image = time.perf_counter() - debut
+print(json.dumps({'import_main': import_main, 'premiere_image': premiere_image}))
+"""
+
+# Moteurs de calcul des forces et intégrateurs mesurés : nom → fonction
+# configurant une simulation, et nombres de corps mesurés pour chacun
+MOTEURS: Dict[str, Callable[[Simulation], None]] = {
+    'paires': lambda simulation: setattr(simulation, 'modele_forces', None),
+    'vectoriel': lambda simulation: None,
+}
+INTEGRATEURS: Dict[str, Callable[[Simulation], None]] = {
+    'euler_symplectique': lambda simulation: None,
+}
+TAILLES_MOTEURS = {'paires': [10, 30, 100], 'vectoriel': [10, 100, 1000]}
+TAILLES_AFFICHAGE = [100, 1000, 10000]
+TAILLES_CATALOGUE = [1000, 10000]
+TAILLES_COLLISIONS = [10000, 100000]
+TAILLES_MUTATIONS = [10000, 100000]
+PAS_PRECISION = [86400.0, 21600.0, 3600.0]
+
+
+def creer_systeme(nb_corps: int, graine: int = 0) -> SystemeSolaire:
+    """Crée un disque de corps en orbite autour d'une étoile.
+
+    Args:
+        nb_corps (int): Nombre total de corps, étoile comprise
+        graine (int): Graine du générateur aléatoire
+
+    Returns:
+        SystemeSolaire: Système créé
+    """
+    return vers_systeme(disque_kepler(nb_corps - 1, graine=graine, r_min=0.5 * UA, r_max=5 * UA,
+                                      masse_disque=1e20 * (nb_corps - 1)))
+
+
+def energie_totale(systeme: SystemeSolaire) -> float:
+    """Calcule l'énergie mécanique totale d'un système.
+
+    Args:
+        systeme (SystemeSolaire): Système étudié
+
+    Returns:
+        float: Énergie cinétique plus énergie potentielle de gravitation, en J
+    """
+    systeme.synchroniser()
+    return calculer_diagnostics(systeme.masses, systeme.positions, systeme.vitesses)['energie_totale']
+
+
+def chronometrer(fonction: Callable[[], None], repetitions: int = 3) -> float:
+    """Retourne la plus courte durée d'exécution d'une fonction.
+
+    Args:
+        fonction (Callable[[], None]): Fonction mesurée
+        repetitions (int): Nombre d'exécutions
+
+    Returns:
+        float: Durée minimale en secondes
+    """
+    durees = []
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        fonction()
+        durees.append(time.perf_counter() - debut)
+    return min(durees)
+
+
+def mesurer_pas(moteur: str, integrateur: str, nb_corps: int, nb_pas: int = 5) -> float:
+    """Mesure la cadence de simulation.
+
+    Args:
+        moteur (str): Moteur de calcul des forces
+        integrateur (str): Intégrateur
+        nb_corps (int): Nombre de corps
+        nb_pas (int): Nombre de pas par mesure
+
+    Returns:
+        float: Pas simulés par seconde
+    """
+    simulation = Simulation(creer_systeme(nb_corps), dt=3600.0)
+    MOTEURS[moteur](simulation)
+    INTEGRATEURS[integrateur](simulation)
+    simulation.simuler(3600.0)  # Mise en route
+    return nb_pas / chronometrer(lambda: simulation.simuler(nb_pas * 3600.0))
+
+
+def mesurer_precision(integrateur: str, dt: float, duree: float = 365.25 * 86400.0) -> Dict[str, float]:
+    """Mesure l'erreur d'énergie et le coût d'une intégration sur une durée fixe.
+
+    Les couples (coût, erreur) obtenus pour plusieurs pas de temps forment une
+    courbe travail-précision.
+
+    Args:
+        integrateur (str): Intégrateur
+        dt (float): Pas de temps en secondes
+        duree (float): Durée simulée en secondes
+
+    Returns:
+        Dict[str, float]: Erreur relative maximale sur l'énergie et durée de calcul en secondes
+    """
+    simulation = Simulation(creer_systeme(10), dt=dt)
+    INTEGRATEURS[integrateur](simulation)
+    energie_initiale = energie_totale(simulation.systeme)
+    erreur = 0.0
+    duree_calcul = 0.0
+    nb_etapes = 20
+    for _ in range(nb_etapes):
+        debut = time.perf_counter()
+        simulation.simuler(duree / nb_etapes)
+        duree_calcul += time.perf_counter() - debut
+        erreur = max(erreur, abs((energie_totale(simulation.systeme) - energie_initiale) / energie_initiale))
+    return {'erreur_energie': erreur, 'duree': duree_calcul}
+
+
+def mesurer_affichage(nb_corps: int, nb_images: int = 20) -> float:
+    """Mesure la durée moyenne d'une image sous le pilote SDL factice.
+
+    Args:
+        nb_corps (int): Nombre de corps affichés
+        nb_images (int): Nombre d'images mesurées
+
+    Returns:
+        float: Durée moyenne d'une image en secondes
+    """
+    from src.visualisation import Visualisation
+    visualisation = Visualisation()
+    visualisation.qualite.actif = False  # Niveau de détail constant d'une mesure à l'autre
+    systeme = creer_systeme(nb_corps)
+    simulation = Simulation(systeme, dt=3600.0)
+    for _ in range(5):
+        visualisation.afficher(systeme)  # Mise en route : couches et caches
+    duree = 0.0
+    for _ in range(nb_images):
+        # Les corps bougent peu d'une image à l'autre, sans coût de simulation mesuré
+        for corps in systeme.planetes:
+            corps.mettre_a_jour_position(simulation.dt)
+        debut = time.perf_counter()
+        visualisation.afficher(systeme)
+        duree += time.perf_counter() - debut
+    return duree / nb_images
+
+
+def mesurer_chargement(nb_corps: int, format: str = 'json') -> float:
+    """Mesure la durée de chargement d'un catalogue, avec tirage aléatoire des orbites.
+
+    Args:
+        nb_corps (int): Nombre de corps du catalogue
+        format (str): 'json' ou 'npz'
+
+    Returns:
+        float: Durée de chargement en secondes
+    """
+    scenario = disque_kepler(nb_corps - 1, graine=0)
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin = os.path.join(dossier, f'catalogue.{format}')
+        if format == 'npz':
+            enregistrer_npz(scenario, chemin, aleatoire=True)
+            return chronometrer(lambda: SystemeSolaire.depuis_npz(chemin), repetitions=1)
+        ecrire_json(scenario, chemin)
+        with open(chemin, encoding='utf-8') as f:
+            donnees = json.load(f)
+        donnees['aleatoire'] = True
+        with open(chemin, 'w', encoding='utf-8') as f:
+            json.dump(donnees, f)
+        return chronometrer(lambda: SystemeSolaire.depuis_json(chemin), repetitions=1)
+
+
+def mesurer_demarrage(repetitions: int = 3) -> Dict[str, float]:
+    """Mesure le démarrage dans un nouvel interpréteur, sans modules déjà chargés.
+
+    Args:
+        repetitions (int): Nombre de lancements, dont le plus rapide est retenu
+
+    Returns:
+        Dict[str, float]: Durées en secondes de l'import de src.main ('import_main') et de
+        la création de la fenêtre jusqu'à la fin de la première image ('premiere_image')
+    """
+    environnement = dict(os.environ, PYTHONPATH=RACINE)
+    mesures = []
+    for _ in range(repetitions):
+        sortie = subprocess.run([sys.executable, '-c', CODE_DEMARRAGE], cwd=RACINE, env=environnement,
+                                capture_output=True, text=True, check=True).stdout
+        mesures.append(json.loads(sortie.strip().splitlines()[-1]))
+    return {cle: min(mesure[cle] for mesure in mesures) for cle in mesures[0]}
+
+
+def mesurer_collisions(nb_corps: int, dt: float = 3600.0) -> float:
+    """Mesure la durée de la détection des collisions d'un pas.
+
+    Args:
+        nb_corps (int): Nombre de corps du disque
+        dt (float): Pas de temps en secondes, qui fixe la longueur des segments parcourus
+
+    Returns:
+        float: Durée de la détection en secondes
+    """
+    scenario = disque_kepler(nb_corps - 1, graine=0)
+    debut = scenario['positions']
+    fin = debut + scenario['vitesses'] * dt
+    return chronometrer(lambda: detecter_contacts(debut, fin, scenario['rayons']))
+
+
+def mesurer_mutations(nb_corps: int, nb_mutations: int = 2000) -> float:
+    """Mesure la durée moyenne d'un ajout suivi du retrait d'un corps existant.
+
+    Args:
+        nb_corps (int): Nombre de corps du système
+        nb_mutations (int): Nombre d'ajouts et de retraits
+
+    Returns:
+        float: Durée moyenne d'un ajout et d'un retrait en secondes
+    """
+    systeme = creer_systeme(nb_corps)
+    corps_liste = systeme.synchroniser()
+    nouveaux = [CorpsCeleste(f"Ajout {i}", 1e20, 1e3, [UA, 0.0, 0.0], [0.0, 3e4, 0.0], (255, 255, 255))
+                for i in range(nb_mutations)]
+    retires = [corps_liste[i] for i in range(1, 2 * nb_mutations, 2)]
+
+    def muter():
+        for nouveau, ancien in zip(nouveaux, retires):
+            systeme.ajouter_corps(nouveau)
+            systeme.retirer_corps([ancien])
+
+    return chronometrer(muter, repetitions=1) / nb_mutations
+
+
+def executer(rapide: bool = False, afficher: Callable[[str], None] = print) -> Dict[str, Dict]:
+    """Exécute toutes les mesures.
+
+    Args:
+        rapide (bool): Limite chaque série à sa plus petite taille
+        afficher (Callable[[str], None]): Fonction recevant une ligne de progression
+
+    Returns:
+        Dict[str, Dict]: Mesures indexées par nom, chacune avec 'valeur', 'unite' et
+        'sens' ('haut' si une valeur plus grande est meilleure, 'bas' sinon)
+    """
+    def tailles(liste):
+        return liste[:1] if rapide else liste
+
+    resultats = {}
+
+    def noter(nom, valeur, unite, sens):
+        resultats[nom] = {'valeur': valeur, 'unite': unite, 'sens': sens}
+        afficher(f"{nom:60s} {valeur:12.6g} {unite}")
+
+    for moteur, liste in TAILLES_MOTEURS.items():
+        for integrateur in INTEGRATEURS:
+            for n in tailles(liste):
+                noter(f"simulation/{moteur}/{integrateur}/N={n}", mesurer_pas(moteur, integrateur, n), 'pas/s', 'haut')
+    for integrateur in INTEGRATEURS:
+        for dt in tailles(PAS_PRECISION):
+            mesure = mesurer_precision(integrateur, dt)
+            noter(f"precision/{integrateur}/dt={dt:g}/erreur_energie", mesure['erreur_energie'], '', 'bas')
+            noter(f"precision/{integrateur}/dt={dt:g}/duree", mesure['duree'], 's', 'bas')
+    for n in tailles(TAILLES_AFFICHAGE):
+        noter(f"affichage/N={n}", mesurer_affichage(n), 's/image', 'bas')
+    for n in tailles(TAILLES_CATALOGUE):
+        for format in ('json', 'npz'):
+            noter(f"chargement/{format}/N={n}", mesurer_chargement(n, format), 's', 'bas')
+    for nom, duree in mesurer_demarrage().items():
+        noter(f"demarrage/{nom}", duree, 's', 'bas')
+    for n in tailles(TAILLES_COLLISIONS):
+        noter(f"collisions/N={n}", mesurer_collisions(n), 's/pas', 'bas')
+    for n in tailles(TAILLES_MUTATIONS):
+        noter(f"mutations/N={n}", mesurer_mutations(n), 's', 'bas')
+    return resultats
+
+
+def comparer(resultats: Dict[str, Dict], reference: Dict[str, Dict], seuil: float = 0.2) -> List[str]:
+    """Compare des mesures à une référence.
+
+    Args:
+        resultats (Dict[str, Dict]): Mesures retournées par executer
+        reference (Dict[str, Dict]): Mesures de référence
+        seuil (float): Dégradation relative tolérée (0.2 : 20 %)
+
+    Returns:
+        List[str]: Description de chaque régression, vide si aucune
+    """
+    regressions = []
+    for nom, mesure in resultats.items():
+        attendu = reference.get(nom)
+        if attendu is None or attendu['valeur'] <= 0:
+            continue
+        rapport = mesure['valeur'] / attendu['valeur']
+        degradation = 1 / rapport - 1 if mesure['sens'] == 'haut' else rapport - 1
+        if degradation > seuil:
+            regressions.append(f"{nom} : {mesure['valeur']:.6g} {mesure['unite']} contre "
+                               f"{attendu['valeur']:.6g} en référence ({degradation:+.0%})")
+    return regressions
+
+
+def main(arguments: Optional[List[str]] = None) -> int:
+    """Point d'entrée des mesures de performance.
+
+    Args:
+        arguments (Optional[List[str]]): Arguments de la ligne de commande
+
+    Returns:
+        int: Code de sortie, 1 en cas de régression
+    """
+    parser = argparse.ArgumentParser(description='Mesures de performance de la simulation')
+    parser.add_argument('--reference', type=str, default=REFERENCE, help='Fichier JSON de référence')
+    parser.add_argument('--enregistrer', action='store_true', help='Remplace la référence par les mesures')
+    parser.add_argument('--seuil', type=float, default=0.2, help='Dégradation relative tolérée (par défaut 0.2)')
+    parser.add_argument('--rapide', action='store_true', help='Mesure seulement la plus petite taille de chaque série')
+    args = parser.parse_args(arguments)
+
+    resultats = executer(rapide=args.rapide)
+    if args.enregistrer:
+        with open(args.reference, 'w', encoding='utf-8') as f:
+            json.dump({'machine': {'python': platform.python_version(), 'processeur': platform.processor(),
+                                   'systeme': platform.platform()},
+                       'resultats': resultats}, f, indent=2)
+            f.write("\n")
+        print(f"Référence enregistrée dans {args.reference}")
+        return 0
+
+    try:
+        with open(args.reference, encoding='utf-8') as f:
+            reference = json.load(f)
+    except FileNotFoundError:
+        print(f"Pas de référence {args.reference} : relancer avec --enregistrer")
+        return 0
+    regressions = comparer(resultats, reference['resultats'], args.seuil)
+    for regression in regressions:
+        print(f"RÉGRESSION {regression}")
+    if not regressions:
+        print(f"Aucune régression au-delà de {args.seuil:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
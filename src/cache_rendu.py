@@ -0,0 +1,88 @@
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import pygame
+
+
+class CacheRendu:
+    """Cache des ressources de rendu (polices et surfaces de texte).
+
+    Les polices sont créées une seule fois par taille. Les surfaces de texte
+    sont indexées par (texte, couleur, taille, contour) et évincées selon
+    une politique LRU lorsque le cache dépasse sa taille maximale.
+    """
+
+    def __init__(self, taille_max: int = 256):
+        """Initialise le cache.
+
+        Args:
+            taille_max (int): Nombre maximal de surfaces de texte conservées
+        """
+        self.taille_max = taille_max
+        self._polices: Dict[int, pygame.font.Font] = {}
+        self._textes: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+        self.succes = 0  # Nombre de textes trouvés dans le cache
+        self.echecs = 0  # Nombre de textes rendus
+
+    def police(self, taille: int) -> pygame.font.Font:
+        """Retourne la police par défaut pour une taille donnée.
+
+        Args:
+            taille (int): Taille de la police
+
+        Returns:
+            pygame.font.Font: Police créée au premier appel puis réutilisée
+        """
+        police = self._polices.get(taille)
+        if police is None:
+            police = pygame.font.Font(None, taille)
+            self._polices[taille] = police
+        return police
+
+    def texte(self, texte: str, couleur: Tuple[int, int, int], taille: int,
+              contour: Optional[Tuple[int, int, int]] = None) -> pygame.Surface:
+        """Retourne la surface d'un texte, en la rendant si nécessaire.
+
+        Args:
+            texte (str): Texte à rendre
+            couleur (Tuple[int, int, int]): Couleur du texte
+            taille (int): Taille de la police
+            contour (Optional[Tuple[int, int, int]]): Couleur du contour d'un pixel,
+                ou None pour un texte sans contour
+
+        Returns:
+            pygame.Surface: Surface du texte. Avec contour, la surface est agrandie
+            d'un pixel de chaque côté.
+        """
+        cle = (texte, tuple(couleur), taille, contour)
+        surface = self._textes.get(cle)
+        if surface is not None:
+            self._textes.move_to_end(cle)
+            self.succes += 1
+            return surface
+
+        self.echecs += 1
+        police = self.police(taille)
+        rendu = police.render(texte, True, couleur)
+        if contour is None:
+            surface = rendu
+        else:
+            # Le contour est tracé en décalant le texte dans les quatre diagonales
+            rendu_contour = police.render(texte, True, contour)
+            largeur, hauteur = rendu.get_size()
+            surface = pygame.Surface((largeur + 2, hauteur + 2), pygame.SRCALPHA)
+            for dx, dy in [(-1, -1), (-1, 1), (1, -1), (1, 1)]:
+                surface.blit(rendu_contour, (1 + dx, 1 + dy))
+            surface.blit(rendu, (1, 1))
+
+        self._textes[cle] = surface
+        if len(self._textes) > self.taille_max:
+            self._textes.popitem(last=False)
+        return surface
+
+    def vider(self) -> None:
+        """Vide le cache des surfaces de texte."""
+        self._textes.clear()
+
+    def __len__(self) -> int:
+        """Retourne le nombre de surfaces de texte en cache."""
+        return len(self._textes)
@@ -0,0 +1,259 @@
+import json
+import struct
+import zipfile
+from typing import Any, Dict, Iterator, Tuple
+import numpy as np
+
+
+# Colonnes d'un scénario, une ligne par corps, les étoiles en premier
+COLONNES = ('noms', 'masses', 'rayons', 'positions', 'vitesses', 'couleurs')
+
+
+class _Tampon:
+    """Lecture d'un fichier texte par blocs, pour le décodage progressif d'un JSON."""
+
+    BLANCS = ' \t\n\r'
+
+    def __init__(self, fichier, taille_bloc: int):
+        """Initialise un tampon vide.
+
+        Args:
+            fichier: Fichier texte ouvert en lecture
+            taille_bloc (int): Nombre de caractères lus à la fois
+        """
+        self.fichier = fichier
+        self.taille_bloc = taille_bloc
+        self.texte = ''
+        self.position = 0
+        self.fin_fichier = False
+        self.decodeur = json.JSONDecoder()
+
+    def _remplir(self) -> bool:
+        """Ajoute un bloc au tampon après avoir retiré la partie déjà décodée.
+
+        Returns:
+            bool: False si la fin du fichier est atteinte
+        """
+        if self.fin_fichier:
+            return False
+        bloc = self.fichier.read(self.taille_bloc)
+        self.texte = self.texte[self.position:] + bloc
+        self.position = 0
+        self.fin_fichier = not bloc
+        return bool(bloc)
+
+    def _sauter_blancs(self) -> None:
+        """Avance jusqu'au prochain caractère significatif."""
+        while True:
+            while self.position < len(self.texte) and self.texte[self.position] in self.BLANCS:
+                self.position += 1
+            if self.position < len(self.texte) or not self._remplir():
+                return
+
+    def suivant_est(self, caractere: str) -> bool:
+        """Consomme le prochain caractère significatif s'il est celui attendu.
+
+        Args:
+            caractere (str): Caractère attendu
+
+        Returns:
+            bool: True si le caractère a été consommé
+        """
+        self._sauter_blancs()
+        if self.texte.startswith(caractere, self.position):
+            self.position += 1
+            return True
+        return False
+
+    def attendre(self, caractere: str) -> None:
+        """Consomme un caractère obligatoire.
+
+        Args:
+            caractere (str): Caractère attendu
+
+        Raises:
+            json.JSONDecodeError: Si le prochain caractère significatif est différent
+        """
+        if not self.suivant_est(caractere):
+            raise json.JSONDecodeError(f"'{caractere}' attendu", self.texte, self.position)
+
+    def valeur(self) -> Any:
+        """Décode la prochaine valeur JSON complète.
+
+        Returns:
+            Any: Valeur décodée
+
+        Raises:
+            json.JSONDecodeError: Si le texte n'est pas une valeur JSON valide
+        """
+        self._sauter_blancs()
+        while True:
+            try:
+                valeur, fin = self.decodeur.raw_decode(self.texte, self.position)
+            except json.JSONDecodeError:
+                if self._remplir():
+                    continue
+                raise
+            # Un nombre en fin de tampon peut être tronqué : on le relit avec la suite
+            if fin == len(self.texte) and self._remplir():
+                continue
+            self.position = fin
+            return valeur
+
+
+def parcourir_json(chemin: str, taille_bloc: int = 1 << 20) -> Iterator[Tuple[str, Any]]:
+    """Parcourt un objet JSON sans le charger entièrement en mémoire.
+
+    Les tableaux de premier niveau sont parcourus élément par élément ; les
+    autres valeurs sont retournées entières.
+
+    Args:
+        chemin (str): Chemin du fichier JSON
+        taille_bloc (int): Nombre de caractères lus à la fois
+
+    Yields:
+        Tuple[str, Any]: Clé de premier niveau et élément du tableau (ou valeur) associé
+
+    Raises:
+        json.JSONDecodeError: Si le fichier n'est pas un objet JSON valide
+    """
+    with open(chemin, 'r', encoding='utf-8') as f:
+        tampon = _Tampon(f, taille_bloc)
+        tampon.attendre('{')
+        if tampon.suivant_est('}'):
+            return
+        while True:
+            cle = tampon.valeur()
+            if not isinstance(cle, str):
+                raise json.JSONDecodeError("Clé attendue", tampon.texte, tampon.position)
+            tampon.attendre(':')
+            if tampon.suivant_est('['):
+                if not tampon.suivant_est(']'):
+                    while True:
+                        yield cle, tampon.valeur()
+                        if tampon.suivant_est(']'):
+                            break
+                        tampon.attendre(',')
+            else:
+                yield cle, tampon.valeur()
+            if tampon.suivant_est('}'):
+                return
+            tampon.attendre(',')
+
+
+def lire_json(chemin: str) -> Tuple[Dict[str, np.ndarray], bool]:
+    """Lit un fichier de données JSON sous forme de colonnes.
+
+    Args:
+        chemin (str): Chemin du fichier JSON
+
+    Returns:
+        Tuple[Dict[str, np.ndarray], bool]: Scénario (colonnes, 'nb_etoiles' et, si le
+        fichier en a une, section 'forces') et indicateur "aleatoire" du fichier (True par défaut)
+    """
+    lignes = {'etoiles': [], 'planetes': []}
+    aleatoire = True
+    forces = None
+    for cle, valeur in parcourir_json(chemin):
+        if cle in lignes:
+            lignes[cle].append((valeur['nom'], valeur['masse'], valeur['rayon'], valeur['position'],
+                                valeur['vitesse'], valeur['couleur']))
+        elif cle == 'aleatoire':
+            aleatoire = bool(valeur)
+        elif cle == 'forces':
+            forces = forces if forces is not None else []
+            forces.append(valeur)
+    corps = lignes['etoiles'] + lignes['planetes']
+    noms, masses, rayons, positions, vitesses, couleurs = zip(*corps) if corps else ([],) * 6
+    scenario = {
+        'noms': np.array(noms, dtype=str),
+        'masses': np.array(masses, dtype=float),
+        'rayons': np.array(rayons, dtype=float),
+        'positions': np.array(positions, dtype=float).reshape(-1, 3),
+        'vitesses': np.array(vitesses, dtype=float).reshape(-1, 3),
+        'couleurs': np.array(couleurs, dtype=np.uint8).reshape(-1, 3),
+        'nb_etoiles': len(lignes['etoiles']),
+    }
+    if forces is not None:
+        scenario['forces'] = forces
+    return scenario, aleatoire
+
+
+def enregistrer_npz(scenario: Dict[str, np.ndarray], chemin: str, aleatoire: bool = False) -> None:
+    """Écrit un scénario au format binaire en colonnes (.npz non compressé).
+
+    Args:
+        scenario (Dict[str, np.ndarray]): Scénario
+        chemin (str): Chemin du fichier .npz
+        aleatoire (bool): Demande le tirage aléatoire des orbites au chargement
+    """
+    colonnes = {nom: np.ascontiguousarray(scenario[nom]) for nom in COLONNES}
+    np.savez(chemin, nb_etoiles=np.int64(scenario['nb_etoiles']), aleatoire=np.bool_(aleatoire), **colonnes)
+
+
+def charger_npz(chemin: str) -> Tuple[Dict[str, np.ndarray], bool]:
+    """Lit un scénario au format .npz en projetant ses colonnes en mémoire.
+
+    Les colonnes d'une archive non compressée sont des tableaux np.memmap en
+    lecture seule, lus à la demande par le système ; celles d'une archive
+    compressée sont décompressées.
+
+    Args:
+        chemin (str): Chemin du fichier .npz
+
+    Returns:
+        Tuple[Dict[str, np.ndarray], bool]: Scénario et indicateur "aleatoire"
+    """
+    tableaux = {}
+    with zipfile.ZipFile(chemin) as archive, open(chemin, 'rb') as f:
+        for info in archive.infolist():
+            nom = info.filename[:-4] if info.filename.endswith('.npy') else info.filename
+            if info.compress_type != zipfile.ZIP_STORED:
+                with archive.open(info) as membre:
+                    tableaux[nom] = np.lib.format.read_array(membre)
+                continue
+            # Début des données : en-tête local du zip (30 octets, nom et champ extra), puis en-tête .npy
+            f.seek(info.header_offset)
+            longueur_nom, longueur_extra = struct.unpack('<HH', f.read(30)[26:30])
+            f.seek(info.header_offset + 30 + longueur_nom + longueur_extra)
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                forme, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                forme, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+            if not forme or 0 in forme:
+                tableaux[nom] = np.fromfile(f, dtype=dtype, count=int(np.prod(forme))).reshape(forme)
+            else:
+                tableaux[nom] = np.memmap(chemin, dtype=dtype, mode='r', offset=f.tell(), shape=forme,
+                                          order='F' if fortran else 'C')
+    scenario = {nom: tableaux[nom] for nom in COLONNES}
+    scenario['nb_etoiles'] = int(tableaux['nb_etoiles'])
+    return scenario, bool(tableaux.get('aleatoire', True))
+
+
+def perturber_orbites(positions: np.ndarray, vitesses: np.ndarray, ratio: float,
+                      generateur: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """Place des corps à un angle aléatoire de leur orbite et fait varier leur vitesse.
+
+    Chaque corps garde sa distance à l'origine et sa vitesse, à un facteur
+    aléatoire près compris entre 1 - ratio et 1 + ratio ; il est placé dans le
+    plan de l'écliptique, avec une vitesse perpendiculaire à sa position.
+
+    Args:
+        positions (np.ndarray): Positions (N, 3) en mètres
+        vitesses (np.ndarray): Vitesses (N, 3) en m/s
+        ratio (float): Variation relative maximale de la vitesse
+        generateur (np.random.Generator): Générateur aléatoire
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Nouvelles positions et vitesses (N, 3)
+    """
+    n = len(positions)
+    distances = np.sqrt(np.einsum('ij,ij->i', positions, positions))
+    normes = np.sqrt(np.einsum('ij,ij->i', vitesses, vitesses))
+    angles = generateur.uniform(0, 2 * np.pi, n)
+    normes = normes * generateur.uniform(1 - ratio, 1 + ratio, n)
+    cos, sin = np.cos(angles), np.sin(angles)
+    zeros = np.zeros(n)
+    return (np.stack([distances * cos, distances * sin, zeros], axis=1),
+            np.stack([-normes * sin, normes * cos, zeros], axis=1))
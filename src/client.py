@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Visualisation distante d'une simulation diffusée par src/serveur.py
+
+    python -m src.client --port 8765 --frequence 30
+"""
+
+import json
+import socket
+import argparse
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from src.modele import SystemeSolaire
+from src.serveur import ENTETE, COMMANDE, REPONSE, CATALOGUE, ETAT, encoder_json, decoder_etat, ouvrir_socket
+
+
+class ClientInstantanes:
+    """Abonné à un serveur d'instantanés, qui conserve le dernier état reçu.
+
+    Un fil lit les messages du serveur au fur et à mesure : le catalogue des
+    corps, les instantanés (seul le plus récent est gardé) et les réponses
+    aux commandes.
+    """
+
+    def __init__(self, hote: str = '127.0.0.1', port: int = 8765, chemin_unix: Optional[str] = None):
+        """Initialise un client non connecté.
+
+        Args:
+            hote (str): Adresse TCP du serveur
+            port (int): Port TCP du serveur
+            chemin_unix (Optional[str]): Chemin de la socket Unix du serveur, à la place de TCP
+        """
+        self.hote = hote
+        self.port = port
+        self.chemin_unix = chemin_unix
+        self.catalogue: Optional[Dict] = None
+        self.etat: Optional[Tuple[float, int, np.ndarray, np.ndarray]] = None
+        self.nb_etats = 0
+        self.reponses = deque(maxlen=100)
+        self.connecte = False
+        self._socket = None
+        self._fil = None
+        self._condition = threading.Condition()
+        self._systeme: Optional[SystemeSolaire] = None
+        self._version_systeme = None
+
+    def connecter(self, frequence: float = 30.0, precision: int = 32) -> None:
+        """Se connecte au serveur et s'abonne à ses instantanés.
+
+        Args:
+            frequence (float): Nombre maximal d'instantanés par seconde
+            precision (int): 32 ou 64 bits par coordonnée
+
+        Raises:
+            OSError: Si le serveur est injoignable
+        """
+        self._socket = ouvrir_socket(self.hote, self.port, self.chemin_unix)
+        self.connecte = True
+        self._fil = threading.Thread(target=self._lire, name='client-instantanes', daemon=True)
+        self._fil.start()
+        self.envoyer({'commande': 'abonner', 'frequence': frequence, 'precision': precision})
+
+    def envoyer(self, commande: Dict) -> None:
+        """Envoie une commande au serveur (abonner, pause, reprendre, acceleration, sauvegarde).
+
+        Args:
+            commande (Dict): Commande, avec son nom sous la clé 'commande'
+        """
+        self._socket.sendall(encoder_json(COMMANDE, commande))
+
+    def fermer(self) -> None:
+        """Ferme la connexion et attend la fin du fil de lecture."""
+        if self._socket is not None:
+            try:
+                self._socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._socket.close()
+            self._fil.join()
+            self._socket = None
+
+    def _recevoir(self, taille: int) -> bytes:
+        """Lit exactement un nombre d'octets.
+
+        Args:
+            taille (int): Nombre d'octets
+
+        Returns:
+            bytes: Octets lus
+
+        Raises:
+            ConnectionError: Si la connexion est fermée avant la fin
+        """
+        morceaux = []
+        while taille:
+            morceau = self._socket.recv(min(taille, 1 << 20))
+            if not morceau:
+                raise ConnectionError("Connexion fermée par le serveur")
+            morceaux.append(morceau)
+            taille -= len(morceau)
+        return b''.join(morceaux)
+
+    def _lire(self) -> None:
+        """Lit les messages du serveur jusqu'à la fermeture de la connexion."""
+        try:
+            while True:
+                longueur, type_message = ENTETE.unpack(self._recevoir(ENTETE.size))
+                charge = self._recevoir(longueur)
+                with self._condition:
+                    if type_message == ETAT:
+                        self.etat = decoder_etat(charge)
+                        self.nb_etats += 1
+                    elif type_message == CATALOGUE:
+                        self.catalogue = json.loads(charge)
+                    elif type_message == REPONSE:
+                        self.reponses.append(json.loads(charge))
+                    self._condition.notify_all()
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            with self._condition:
+                self.connecte = False
+                self._condition.notify_all()
+
+    def attendre_etat(self, delai: float = 5.0) -> Optional[Tuple[float, int, np.ndarray, np.ndarray]]:
+        """Attend un instantané plus récent que le dernier reçu.
+
+        Args:
+            delai (float): Attente maximale en secondes
+
+        Returns:
+            Optional[Tuple[float, int, np.ndarray, np.ndarray]]: Temps, version du catalogue,
+            positions et vitesses, ou None si aucun instantané n'est arrivé à temps
+        """
+        with self._condition:
+            nb_etats = self.nb_etats
+            if self._condition.wait_for(lambda: self.nb_etats > nb_etats or not self.connecte, delai):
+                return self.etat if self.nb_etats > nb_etats else None
+            return None
+
+    def attendre_reponse(self, delai: float = 5.0) -> Optional[Dict]:
+        """Attend et retire la plus ancienne réponse du serveur.
+
+        Args:
+            delai (float): Attente maximale en secondes
+
+        Returns:
+            Optional[Dict]: Réponse, ou None si aucune n'est arrivée à temps
+        """
+        with self._condition:
+            if self._condition.wait_for(lambda: self.reponses or not self.connecte, delai) and self.reponses:
+                return self.reponses.popleft()
+            return None
+
+    def systeme(self) -> Optional[SystemeSolaire]:
+        """Retourne un système local à l'état du dernier instantané reçu.
+
+        Le système est reconstruit à chaque nouveau catalogue ; sinon, seules
+        ses positions et vitesses sont mises à jour.
+
+        Returns:
+            Optional[SystemeSolaire]: Système, ou None tant qu'aucun instantané
+            cohérent avec le catalogue n'a été reçu
+        """
+        with self._condition:
+            catalogue, etat = self.catalogue, self.etat
+        if catalogue is None or etat is None or etat[1] != catalogue['version']:
+            return self._systeme
+        _, version, positions, vitesses = etat
+        if version != self._version_systeme:
+            systeme = SystemeSolaire()
+            systeme.charger_scenario({
+                'noms': np.array(catalogue['noms'], dtype=str),
+                'masses': np.array(catalogue['masses'], dtype=float),
+                'rayons': np.array(catalogue['rayons'], dtype=float),
+                'positions': positions,
+                'vitesses': vitesses,
+                'couleurs': np.array(catalogue['couleurs'], dtype=np.uint8).reshape(-1, 3),
+                'nb_etoiles': catalogue['nb_etoiles'],
+            })
+            self._systeme, self._version_systeme = systeme, version
+        else:
+            self._systeme.positions[...] = positions
+            self._systeme.vitesses[...] = vitesses
+        return self._systeme
+
+
+def main(arguments: Optional[List[str]] = None) -> None:
+    """Affiche dans une fenêtre la simulation diffusée par un serveur.
+
+    La touche Espace suspend ou reprend la simulation distante.
+
+    Args:
+        arguments (Optional[List[str]]): Arguments de la ligne de commande
+    """
+    parser = argparse.ArgumentParser(description="Visualisation distante d'une simulation")
+    parser.add_argument('--hote', type=str, default='127.0.0.1', help='Adresse du serveur (par défaut 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='Port du serveur (par défaut 8765)')
+    parser.add_argument('--unix', type=str, metavar='CHEMIN', help='Socket Unix du serveur, à la place de TCP')
+    parser.add_argument('--frequence', type=float, default=30.0, help="Nombre maximal d'instantanés par seconde (par défaut 30)")
+    parser.add_argument('--precision', type=int, choices=(32, 64), default=32, help='Bits par coordonnée (par défaut 32)')
+    args = parser.parse_args(arguments)
+
+    from src.visualisation import Visualisation
+    client = ClientInstantanes(args.hote, args.port, args.unix)
+    client.connecter(args.frequence, args.precision)
+    visualisation = Visualisation()
+    en_pause = False
+    try:
+        while client.connecte:
+            client.attendre_etat(delai=1.0 / args.frequence)
+            systeme = client.systeme()
+            if systeme is not None:
+                visualisation.mettre_a_jour_temps(client.etat[0] / (24 * 3600))  # Conversion en jours
+                visualisation.afficher(systeme)
+            if not visualisation.gerer_evenements():
+                break
+            # La pause locale pilote la simulation distante
+            if visualisation.en_pause != en_pause:
+                en_pause = visualisation.en_pause
+                client.envoyer({'commande': 'pause' if en_pause else 'reprendre'})
+    finally:
+        client.fermer()
+
+
+if __name__ == "__main__":
+    main()
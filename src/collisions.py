@@ -0,0 +1,246 @@
+import json
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+
+# Multiplicateurs du hachage des coordonnées entières des cellules
+_HACHAGE = (73856093, 19349663, 83492791)
+
+
+def paires_candidates(debut: np.ndarray, fin: np.ndarray, rayons: np.ndarray,
+                      max_cellules: int = 64) -> Tuple[np.ndarray, np.ndarray]:
+    """Trouve par une grille uniforme les paires de corps dont les volumes balayés peuvent se toucher.
+
+    Chaque corps est englobé, sur tout le pas, dans la boîte contenant sa
+    sphère au début et à la fin du pas. La grille a pour côté le double de
+    l'étendue médiane des boîtes ; chaque boîte est rangée dans les cellules
+    qu'elle recouvre, repérées par hachage de leurs coordonnées, et seules les
+    boîtes d'une même cellule sont comparées. Une paire n'est retenue que dans
+    la cellule du coin inférieur de l'intersection de ses deux boîtes, donc
+    une seule fois. Les boîtes qui recouvriraient plus de max_cellules
+    cellules (étoiles, corps très rapides) sont comparées à toutes les autres.
+    Le coût est proche de O(N) lorsque les corps sont répartis sans
+    concentration extrême à l'échelle de la grille.
+
+    Args:
+        debut (np.ndarray): Positions (N, 3) au début du pas en mètres
+        fin (np.ndarray): Positions (N, 3) à la fin du pas en mètres
+        rayons (np.ndarray): Rayons (N,) en mètres
+        max_cellules (int): Nombre de cellules au-delà duquel une boîte est comparée à toutes les autres
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Indices (K,) du premier et du second corps de chaque paire
+    """
+    n = len(rayons)
+    vide = np.zeros(0, dtype=np.int64)
+    if n < 2:
+        return vide, vide
+    minimums = np.minimum(debut, fin) - rayons[:, np.newaxis]
+    maximums = np.maximum(debut, fin) + rayons[:, np.newaxis]
+    taille = 2.0 * float(np.median(np.max(maximums - minimums, axis=1)))
+    if not taille > 0:
+        taille = 1.0
+    bas = np.floor(minimums / taille).astype(np.int64)
+    haut = np.floor(maximums / taille).astype(np.int64)
+    dimensions = haut - bas + 1
+    nb_cellules = np.prod(dimensions, axis=1)
+    grands = nb_cellules > max_cellules
+
+    # Une entrée (corps, cellule) par cellule recouverte par la boîte d'un corps ordinaire
+    ordinaires = np.flatnonzero(~grands)
+    repetitions = nb_cellules[ordinaires]
+    corps = np.repeat(ordinaires, repetitions)
+    rangs = np.arange(len(corps)) - np.repeat(np.cumsum(repetitions) - repetitions, repetitions)
+    taille_z = dimensions[corps, 2]
+    taille_y = dimensions[corps, 1]
+    cellules = bas[corps] + np.stack([rangs // taille_z // taille_y, rangs // taille_z % taille_y,
+                                      rangs % taille_z], axis=1)
+
+    # Entrées triées par clé de hachage : chaque entrée est associée aux suivantes de même clé
+    cles = cellules[:, 0] * _HACHAGE[0] + cellules[:, 1] * _HACHAGE[1] + cellules[:, 2] * _HACHAGE[2]
+    ordre = np.argsort(cles)
+    cles = cles[ordre]
+    nombres = np.searchsorted(cles, cles, side='right') - np.arange(1, len(cles) + 1)
+    total = int(nombres.sum())
+    premiers = np.repeat(np.arange(len(cles)), nombres)
+    decalages = np.arange(total) - np.repeat(np.cumsum(nombres) - nombres, nombres)
+    entrees_a = ordre[premiers]
+    entrees_b = ordre[premiers + 1 + decalages]
+    a, b = corps[entrees_a], corps[entrees_b]
+    # Même cellule (deux cellules peuvent partager une clé), et cellule de référence de la paire
+    cellule = cellules[entrees_a]
+    retenues = np.all((cellule == cellules[entrees_b]) & (cellule == np.maximum(bas[a], bas[b])), axis=1)
+    paires_a, paires_b = [a[retenues]], [b[retenues]]
+
+    # Grandes boîtes, comparées à toutes les boîtes ordinaires et aux grandes boîtes suivantes
+    indices = np.arange(n)
+    for g in np.flatnonzero(grands):
+        autres = ~grands | (indices > g)
+        autres[g] = False
+        paires_b.append(indices[autres])
+        paires_a.append(np.full(len(paires_b[-1]), g))
+    a, b = np.concatenate(paires_a), np.concatenate(paires_b)
+
+    chevauchent = np.all((minimums[a] <= maximums[b]) & (minimums[b] <= maximums[a]), axis=1)
+    return a[chevauchent], b[chevauchent]
+
+
+def detecter_contacts(debut: np.ndarray, fin: np.ndarray,
+                      rayons: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Détecte les corps qui se touchent au cours d'un pas.
+
+    Les corps se déplacent en ligne droite pendant le pas ; deux sphères se
+    touchent si la distance entre leurs centres, minimale sur le pas, est
+    inférieure à la somme de leurs rayons. Un corps rapide ne peut donc pas
+    traverser un autre corps entre deux pas.
+
+    Args:
+        debut (np.ndarray): Positions (N, 3) au début du pas en mètres
+        fin (np.ndarray): Positions (N, 3) à la fin du pas en mètres
+        rayons (np.ndarray): Rayons (N,) en mètres
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Indices des deux corps de chaque
+        contact et instant du premier contact, en fraction du pas (0 à 1)
+    """
+    a, b = paires_candidates(debut, fin, rayons)
+    # Écart relatif d(s) = d0 + s * dd ; contact si |d(s)|² = R² pour un s de [0, 1]
+    d0 = debut[b] - debut[a]
+    dd = fin[b] - fin[a] - d0
+    somme = rayons[a] + rayons[b]
+    coef_a = np.einsum('ij,ij->i', dd, dd)
+    coef_b = np.einsum('ij,ij->i', d0, dd)
+    coef_c = np.einsum('ij,ij->i', d0, d0) - somme * somme
+    discriminant = coef_b * coef_b - coef_a * coef_c
+    with np.errstate(divide='ignore', invalid='ignore'):
+        instants = (-coef_b - np.sqrt(np.maximum(discriminant, 0.0))) / coef_a
+    deja = coef_c <= 0
+    contact = deja | ((coef_a > 0) & (discriminant >= 0) & (instants >= 0) & (instants <= 1))
+    instants = np.where(deja, 0.0, instants)
+    return a[contact], b[contact], instants[contact]
+
+
+def grouper(a: np.ndarray, b: np.ndarray) -> List[List[int]]:
+    """Regroupe les corps reliés par des contacts, de proche en proche.
+
+    Args:
+        a (np.ndarray): Indices du premier corps de chaque contact
+        b (np.ndarray): Indices du second corps de chaque contact
+
+    Returns:
+        List[List[int]]: Indices des corps de chaque groupe, triés
+    """
+    parents: Dict[int, int] = {}
+
+    def racine(i):
+        while parents.setdefault(i, i) != i:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+
+    for i, j in zip(a.tolist(), b.tolist()):
+        racine_i, racine_j = racine(i), racine(j)
+        if racine_i != racine_j:
+            parents[max(racine_i, racine_j)] = min(racine_i, racine_j)
+    groupes: Dict[int, List[int]] = {}
+    for i in parents:
+        groupes.setdefault(racine(i), []).append(i)
+    return [sorted(groupe) for groupe in groupes.values()]
+
+
+class Collisions:
+    """Détection des collisions et fusion des corps qui se touchent.
+
+    Une simulation sans collisions (attribut collisions à None) ne paie qu'un
+    test par pas. Une fois attachées, les positions de début de pas sont
+    recopiées dans un tampon réutilisé d'un pas à l'autre, et les contacts du
+    pas sont recherchés après le déplacement des corps. Chaque groupe de
+    corps en contact fusionne en son corps le plus massif, qui reçoit la
+    masse totale, le volume total, la position et la vitesse du centre de
+    masse : la quantité de mouvement est conservée. Les autres corps sont
+    retirés du système, dont les tableaux sont compactés sur place.
+    """
+
+    def __init__(self, journal: Optional[str] = None, capacite: int = 10000):
+        """Initialise la détection sans événement.
+
+        Args:
+            journal (Optional[str]): Fichier JSON lines complété à chaque fusion
+            capacite (int): Nombre d'événements conservés en mémoire
+        """
+        self.journal = journal
+        self.evenements = deque(maxlen=capacite)
+        self.nb_fusions = 0
+        self._debut = np.zeros((0, 3))
+
+    def memoriser_debut(self, positions: np.ndarray) -> None:
+        """Recopie les positions de début de pas, avant le déplacement des corps.
+
+        Args:
+            positions (np.ndarray): Positions (N, 3) en mètres
+        """
+        n = len(positions)
+        if len(self._debut) < n:
+            self._debut = np.empty((max(n, 2 * len(self._debut)), 3))
+        self._debut[:n] = positions
+
+    def traiter(self, simulation) -> List[Dict]:
+        """Fusionne les corps qui se sont touchés pendant le dernier pas.
+
+        Args:
+            simulation (Simulation): Simulation dont le système est indexé, après le
+                déplacement des corps et l'avancée du temps
+
+        Returns:
+            List[Dict]: Événements sérialisables du pas, un par fusion (vide si aucune)
+        """
+        systeme = simulation.systeme
+        n = len(systeme.masses)
+        a, b, instants = detecter_contacts(self._debut[:n], systeme.positions, systeme.rayons)
+        if len(a) == 0:
+            return []
+
+        # Instant du premier contact de chaque corps
+        premiers_contacts: Dict[int, float] = {}
+        for i, j, instant in zip(a.tolist(), b.tolist(), instants.tolist()):
+            for k in (i, j):
+                premiers_contacts[k] = min(premiers_contacts.get(k, 1.0), instant)
+
+        corps_liste = systeme.corps_indexes
+        absorbes = []
+        evenements = []
+        for groupe in grouper(a, b):
+            masses = systeme.masses[groupe]
+            masse = float(masses.sum())
+            position = masses @ systeme.positions[groupe] / masse
+            vitesse = masses @ systeme.vitesses[groupe] / masse
+            rayon = float(np.cbrt(np.sum(systeme.rayons[groupe] ** 3)))
+
+            survivant = corps_liste[groupe[int(np.argmax(masses))]]
+            autres = [corps_liste[i] for i in groupe if corps_liste[i] is not survivant]
+            survivant.position = position
+            survivant.vitesse = vitesse
+            survivant.masse = masse
+            survivant.rayon = rayon
+            absorbes.extend(autres)
+
+            instant = min(premiers_contacts[i] for i in groupe)
+            evenements.append({
+                'temps': simulation.temps - (1.0 - instant) * simulation.dt,
+                'survivant': survivant.nom,
+                'absorbes': [corps.nom for corps in autres],
+                'masse': masse,
+                'rayon': rayon,
+                'position': position.tolist(),
+                'vitesse': vitesse.tolist(),
+            })
+        systeme.retirer_corps(absorbes)
+
+        self.nb_fusions += len(evenements)
+        self.evenements.extend(evenements)
+        if self.journal:
+            with open(self.journal, 'a', encoding='utf-8') as f:
+                for evenement in evenements:
+                    f.write(json.dumps(evenement) + "\n")
+        return evenements
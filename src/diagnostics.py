@@ -0,0 +1,206 @@
+import json
+from collections import deque
+from typing import Dict, List, Optional
+import numpy as np
+from src.modele import SystemeSolaire
+
+
+class DeriveExcessive(RuntimeError):
+    """Dérive des quantités conservées au-delà du seuil, lorsque l'arrêt est demandé."""
+
+
+def energie_potentielle(masses: np.ndarray, positions: np.ndarray, G: float = SystemeSolaire.G,
+                        taille_bloc: int = 1 << 18) -> float:
+    """Calcule l'énergie potentielle de gravitation en sommant toutes les paires.
+
+    Les paires sont traitées par blocs de lignes pour borner la mémoire ; les
+    paires plus proches que 1e-10 m sont ignorées, comme par calculer_gravite.
+
+    Args:
+        masses (np.ndarray): Masses (N,) en kg
+        positions (np.ndarray): Positions (N, 3) en mètres
+        G (float): Constante gravitationnelle
+        taille_bloc (int): Nombre maximal de paires calculées à la fois
+
+    Returns:
+        float: Énergie potentielle en J
+    """
+    n = len(masses)
+    nb_lignes = max(1, taille_bloc // max(n, 1))
+    total = 0.0
+    for debut in range(0, n, nb_lignes):
+        fin = min(debut + nb_lignes, n)
+        ecarts = positions[debut:fin, np.newaxis, :] - positions[np.newaxis, debut:, :]
+        distances = np.sqrt(np.einsum('ijk,ijk->ij', ecarts, ecarts))
+        # Chaque paire une seule fois : colonne j > ligne i
+        masque = np.arange(debut, n)[np.newaxis, :] > np.arange(debut, fin)[:, np.newaxis]
+        masque &= distances >= 1e-10
+        produits = masses[debut:fin, np.newaxis] * masses[np.newaxis, debut:]
+        total += np.sum(produits[masque] / distances[masque])
+    return -G * total
+
+
+def calculer_diagnostics(masses: np.ndarray, positions: np.ndarray, vitesses: np.ndarray,
+                         forces: Optional[np.ndarray] = None, G: float = SystemeSolaire.G) -> Dict[str, object]:
+    """Calcule les quantités conservées d'un système.
+
+    Si les forces de gravitation correspondant aux positions sont fournies,
+    l'énergie potentielle en est déduite en O(N) par le théorème du viriel
+    (somme des r_i · F_i, égale à l'énergie potentielle pour une force en 1/r²)
+    au lieu d'être recalculée sur toutes les paires.
+
+    Args:
+        masses (np.ndarray): Masses (N,) en kg
+        positions (np.ndarray): Positions (N, 3) en mètres
+        vitesses (np.ndarray): Vitesses (N, 3) en m/s
+        forces (Optional[np.ndarray]): Forces de gravitation (N, 3) en N, ou None
+        G (float): Constante gravitationnelle
+
+    Returns:
+        Dict[str, object]: Énergies cinétique, potentielle et totale (J), quantité de
+        mouvement (kg·m/s), moment cinétique autour du centre de masse (kg·m²/s),
+        position et vitesse du centre de masse, et somme des m·|v| servant d'échelle
+    """
+    masse_totale = masses.sum()
+    quantite_mouvement = masses @ vitesses
+    centre_masse = masses @ positions / masse_totale
+    vitesse_centre_masse = quantite_mouvement / masse_totale
+
+    # Positions et vitesses relatives au centre de masse : pas de compensation entre grands termes
+    relatives = positions - centre_masse
+    if forces is not None:
+        potentielle = float(np.einsum('ij,ij->', relatives, forces))
+    else:
+        potentielle = energie_potentielle(masses, positions, G)
+    carres = np.einsum('ij,ij->i', vitesses, vitesses)
+    cinetique = float(0.5 * masses @ carres)
+    moment_cinetique = masses @ np.cross(relatives, vitesses - vitesse_centre_masse)
+    return {
+        'energie_cinetique': cinetique,
+        'energie_potentielle': potentielle,
+        'energie_totale': cinetique + potentielle,
+        'quantite_mouvement': quantite_mouvement,
+        'moment_cinetique': moment_cinetique,
+        'centre_masse': centre_masse,
+        'vitesse_centre_masse': vitesse_centre_masse,
+        'echelle_quantite_mouvement': float(masses @ np.sqrt(carres)),
+    }
+
+
+class Diagnostics:
+    """Suivi périodique de la dérive des quantités conservées d'une simulation.
+
+    Une simulation sans diagnostics (attribut diagnostics à None) ne paie qu'un
+    test par pas. Une fois attachés, les diagnostics sont calculés tous les
+    `periode` pas, à partir des forces du pas en cours, et comparés à la
+    première mesure : dérive relative de l'énergie, du moment cinétique et de
+    la quantité de mouvement, et écart du centre de masse à son mouvement
+    rectiligne uniforme.
+    """
+
+    def __init__(self, periode: int = 10, seuil: Optional[float] = None, arreter: bool = False,
+                 journal: Optional[str] = None, capacite: int = 10000):
+        """Initialise des diagnostics sans mesure.
+
+        Args:
+            periode (int): Nombre de pas entre deux mesures
+            seuil (Optional[float]): Dérive relative de l'énergie ou du moment cinétique
+                au-delà de laquelle la simulation est signalée, ou None
+            arreter (bool): Lève DeriveExcessive au lieu de seulement signaler le dépassement
+            journal (Optional[str]): Fichier JSON lines complété à chaque mesure
+            capacite (int): Nombre de mesures conservées en mémoire
+        """
+        self.periode = max(1, periode)
+        self.seuil = seuil
+        self.arreter = arreter
+        self.journal = journal
+        self.mesures = deque(maxlen=capacite)
+        self.reference: Optional[Dict] = None
+        self.derive_excessive = False
+        self._compteur = 0
+
+    def echeance(self) -> bool:
+        """Compte un pas et indique si une mesure est due.
+
+        Returns:
+            bool: True un pas sur `periode`, à commencer par le premier
+        """
+        due = self._compteur % self.periode == 0
+        self._compteur += 1
+        return due
+
+    def mesurer(self, simulation, forces: Optional[np.ndarray] = None) -> Dict:
+        """Mesure les quantités conservées et leur dérive depuis la première mesure.
+
+        Args:
+            simulation (Simulation): Simulation mesurée, dont le système est indexé
+            forces (Optional[np.ndarray]): Forces de gravitation (N, 3) à l'état courant, ou None
+
+        Returns:
+            Dict: Mesure sérialisable (temps en secondes, quantités et dérives)
+
+        Raises:
+            DeriveExcessive: Si la dérive dépasse le seuil et que l'arrêt est demandé
+        """
+        systeme = simulation.systeme
+        valeurs = calculer_diagnostics(systeme.masses, systeme.positions, systeme.vitesses, forces, systeme.G)
+        temps = simulation.temps
+        if self.reference is None:
+            self.reference = dict(valeurs, temps=temps)
+        reference = self.reference
+
+        def relative(valeur, attendu, echelle):
+            ecart = float(np.linalg.norm(np.subtract(valeur, attendu)))
+            return ecart / echelle if echelle > 0 else ecart
+
+        mesure = {
+            'temps': temps,
+            'energie_totale': valeurs['energie_totale'],
+            'energie_cinetique': valeurs['energie_cinetique'],
+            'energie_potentielle': valeurs['energie_potentielle'],
+            'quantite_mouvement': valeurs['quantite_mouvement'].tolist(),
+            'moment_cinetique': valeurs['moment_cinetique'].tolist(),
+            'derive_energie': relative(valeurs['energie_totale'], reference['energie_totale'],
+                                       abs(reference['energie_totale'])),
+            'derive_moment_cinetique': relative(valeurs['moment_cinetique'], reference['moment_cinetique'],
+                                                float(np.linalg.norm(reference['moment_cinetique']))),
+            'derive_quantite_mouvement': relative(valeurs['quantite_mouvement'], reference['quantite_mouvement'],
+                                                  reference['echelle_quantite_mouvement']),
+            # Écart en mètres au mouvement rectiligne uniforme du centre de masse
+            'derive_centre_masse': relative(valeurs['centre_masse'], reference['centre_masse'] +
+                                            reference['vitesse_centre_masse'] * (temps - reference['temps']), 1.0),
+        }
+        self.mesures.append(mesure)
+        if self.journal:
+            with open(self.journal, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(mesure) + "\n")
+
+        derive = max(mesure['derive_energie'], mesure['derive_moment_cinetique'])
+        if self.seuil is not None and derive > self.seuil:
+            if not self.derive_excessive:
+                print(f"Dérive de {derive:.3g} au-delà du seuil {self.seuil:g} "
+                      f"après {temps / (24 * 3600):.1f} jours simulés.")
+            self.derive_excessive = True
+            if self.arreter:
+                raise DeriveExcessive(f"Dérive de {derive:.3g} au-delà du seuil {self.seuil:g}")
+        return mesure
+
+    def derniere(self) -> Optional[Dict]:
+        """Retourne la dernière mesure.
+
+        Returns:
+            Optional[Dict]: Dernière mesure, ou None si aucune mesure n'a été faite
+        """
+        return self.mesures[-1] if self.mesures else None
+
+    def lignes_hud(self) -> List[str]:
+        """Formate la dernière mesure pour l'affichage.
+
+        Returns:
+            List[str]: Lignes de texte, vides si aucune mesure n'a été faite
+        """
+        mesure = self.derniere()
+        if mesure is None:
+            return []
+        return [f"ΔE/E {mesure['derive_energie']:.2e}   ΔL/L {mesure['derive_moment_cinetique']:.2e}",
+                f"ΔP {mesure['derive_quantite_mouvement']:.2e}   ΔCM {mesure['derive_centre_masse']:.3g} m"]
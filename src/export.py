@@ -0,0 +1,365 @@
+import os
+import csv
+import shutil
+import subprocess
+import itertools
+import multiprocessing
+from collections import deque
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple, Iterable, Iterator
+import numpy as np
+from src.modele import SystemeSolaire, CorpsCeleste
+
+
+def capturer_etat(systeme: SystemeSolaire, temps: float) -> Dict[str, Any]:
+    """Capture l'état d'un système sous une forme indépendante des objets du modèle.
+
+    Args:
+        systeme (SystemeSolaire): Système à capturer
+        temps (float): Temps de simulation en jours
+
+    Returns:
+        Dict[str, Any]: État sérialisable (identifiants, noms, masses, rayons,
+        couleurs, positions, nombre d'étoiles et temps)
+    """
+    corps_liste = systeme.synchroniser()
+    return {
+        'temps': temps,
+        'nb_etoiles': len(systeme.etoiles),
+        'ids': [corps.id for corps in corps_liste],
+        'noms': [corps.nom for corps in corps_liste],
+        'masses': systeme.masses.copy(),
+        'rayons': np.array([corps.rayon for corps in corps_liste], dtype=float),
+        'couleurs': [tuple(corps.couleur) for corps in corps_liste],
+        'positions': systeme.positions.copy(),
+    }
+
+
+def generer_etats(simulation, nb_images: int, duree_image: float) -> Iterator[Dict[str, Any]]:
+    """Fait avancer une simulation et produit son état après chaque intervalle.
+
+    Les états sont produits au fur et à mesure, ce qui permet d'exporter une
+    simulation en cours sans conserver tous ses états en mémoire.
+
+    Args:
+        simulation (Simulation): Simulation à faire avancer
+        nb_images (int): Nombre d'états à produire
+        duree_image (float): Durée simulée entre deux images en secondes
+
+    Yields:
+        Dict[str, Any]: État capturé, dans l'ordre chronologique
+    """
+    for _ in range(nb_images):
+        simulation.simuler(duree_image)
+        yield capturer_etat(simulation.systeme, simulation.temps / (24 * 3600))
+
+
+def enregistrer_simulation(simulation, nb_images: int, duree_image: float) -> List[Dict[str, Any]]:
+    """Fait avancer une simulation et capture son état après chaque intervalle.
+
+    Args:
+        simulation (Simulation): Simulation à faire avancer
+        nb_images (int): Nombre d'états à capturer
+        duree_image (float): Durée simulée entre deux images en secondes
+
+    Returns:
+        List[Dict[str, Any]]: États capturés, dans l'ordre chronologique
+    """
+    return list(generer_etats(simulation, nb_images, duree_image))
+
+
+# Visualisation propre à chaque processus de rendu
+_visualisation = None
+
+
+def _initialiser_processus(largeur: int, hauteur: int, duree_trajectoire: float) -> None:
+    """Initialise un processus de rendu hors écran.
+
+    Args:
+        largeur (int): Largeur des images en pixels
+        hauteur (int): Hauteur des images en pixels
+        duree_trajectoire (float): Durée de conservation des trajectoires en jours
+    """
+    global _visualisation
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    # Sans cela, SDL intercepte SIGTERM et le processus survit à Pool.terminate()
+    os.environ['SDL_NO_SIGNAL_HANDLERS'] = '1'
+    from src.visualisation import Visualisation
+    _visualisation = Visualisation(largeur, hauteur, duree_trajectoire)
+    # Rendu reproductible : qualité maximale fixe, sans lissage de la densité,
+    # estompage des trajectoires à chaque image
+    _visualisation.qualite.actif = False
+    _visualisation.qualite.niveau = 0
+    _visualisation.lissage_densite = 0.0
+    _visualisation.periode_estompage = 1
+
+
+def _construire_systeme(etat: Dict[str, Any], corps_par_id: Dict[str, CorpsCeleste]) -> SystemeSolaire:
+    """Reconstruit un système à partir d'un état capturé.
+
+    Les corps déjà rencontrés sont réutilisés afin que leurs trajectoires
+    se prolongent d'une image à l'autre.
+
+    Args:
+        etat (Dict[str, Any]): État capturé
+        corps_par_id (Dict[str, CorpsCeleste]): Corps déjà créés, par identifiant
+
+    Returns:
+        SystemeSolaire: Système dans l'état capturé
+    """
+    corps_liste = []
+    for i, identifiant in enumerate(etat['ids']):
+        corps = corps_par_id.get(identifiant)
+        if corps is None:
+            corps = CorpsCeleste(
+                nom=etat['noms'][i],
+                masse=etat['masses'][i],
+                rayon=etat['rayons'][i],
+                position=etat['positions'][i].copy(),
+                vitesse=np.zeros(3),
+                couleur=etat['couleurs'][i],
+                id=identifiant
+            )
+            corps_par_id[identifiant] = corps
+        else:
+            corps.position = etat['positions'][i].copy()
+        corps_liste.append(corps)
+    nb_etoiles = etat['nb_etoiles']
+    return SystemeSolaire(etoiles=corps_liste[:nb_etoiles], planetes=corps_liste[nb_etoiles:])
+
+
+def _rendre_lot(tache: Tuple) -> List[Any]:
+    """Rend un lot d'images consécutives.
+
+    Les états précédant le lot (dans la limite de la durée des trajectoires)
+    servent uniquement à reconstituer les trajectoires. La couche des
+    trajectoires est retracée une fois au début du lot puis complétée image
+    par image : le résultat ne dépend que de la taille des lots, et non du
+    nombre de processus ni de l'ordre dans lequel ils terminent.
+
+    Args:
+        tache (Tuple): (indice de la première image, états de préchauffage,
+            états à rendre, échelle, date de début, dossier ou None)
+
+    Returns:
+        List[Any]: Chemins des images écrites, ou pixels RGB bruts si dossier est None
+    """
+    import pygame
+    indice_debut, prechauffage, etats, echelle, date_debut, dossier = tache
+    visu = _visualisation
+    visu.trajectoires.clear()
+    visu.couche_trajectoires = None
+    visu.echelle_fixe = echelle
+    visu.date_debut = date_debut
+    visu.en_pause = False
+    visu._densite_lissee = None
+    corps_par_id: Dict[str, CorpsCeleste] = {}
+
+    # Reconstitution des trajectoires sans rendu
+    for etat in prechauffage:
+        systeme = _construire_systeme(etat, corps_par_id)
+        visu.mettre_a_jour_temps(etat['temps'])
+        corps_liste = systeme.obtenir_tous_corps()
+        reduire = True if visu.densite_active(len(corps_liste)) else None
+        for i in np.flatnonzero(visu.selectionner_corps_detailles(systeme, etat['masses'], reduire)).tolist():
+            visu.ajouter_point_trajectoire(corps_liste[i], etat['positions'][i])
+
+    resultats = []
+    for decalage, etat in enumerate(etats):
+        systeme = _construire_systeme(etat, corps_par_id)
+        visu.mettre_a_jour_temps(etat['temps'])
+        visu.afficher(systeme)
+        if dossier is None:
+            resultats.append(pygame.image.tobytes(visu.ecran, 'RGB'))
+        else:
+            chemin = os.path.join(dossier, f"image_{indice_debut + decalage:06d}.png")
+            pygame.image.save(visu.ecran, chemin)
+            resultats.append(chemin)
+    return resultats
+
+
+class ExportateurImages:
+    """Rendu hors écran et en parallèle d'une suite d'états de simulation.
+
+    Chaque processus du pool possède sa propre Visualisation, créée avec le
+    pilote vidéo SDL « dummy ». Les images sont écrites en PNG numérotés ou
+    transmises à un encodeur vidéo (ffmpeg) s'il est disponible.
+
+    Les états peuvent provenir d'une liste enregistrée ou d'un générateur
+    alimenté par une simulation en cours : seuls les états nécessaires aux
+    lots en cours de rendu sont conservés en mémoire.
+    """
+
+    def __init__(self, largeur: int = 800, hauteur: int = 600, duree_trajectoire: float = 365.0,
+                 nb_processus: Optional[int] = None, taille_lot: int = 50,
+                 date_debut: Optional[datetime] = None):
+        """Initialise l'exportateur.
+
+        Args:
+            largeur (int): Largeur des images en pixels
+            hauteur (int): Hauteur des images en pixels
+            duree_trajectoire (float): Durée de conservation des trajectoires en jours
+            nb_processus (Optional[int]): Nombre de processus de rendu (par défaut, un par cœur)
+            taille_lot (int): Nombre d'images consécutives rendues par tâche
+            date_debut (Optional[datetime]): Date affichée au temps 0 (par défaut, le 01/01/2000)
+        """
+        self.largeur = largeur
+        self.hauteur = hauteur
+        self.duree_trajectoire = duree_trajectoire
+        self.nb_processus = nb_processus or os.cpu_count() or 1
+        self.taille_lot = taille_lot
+        self.date_debut = date_debut or datetime(2000, 1, 1)
+
+    def calculer_echelle(self, etats: List[Dict[str, Any]]) -> float:
+        """Calcule une échelle unique permettant d'afficher tous les états.
+
+        Args:
+            etats (List[Dict[str, Any]]): États à rendre
+
+        Returns:
+            float: Échelle en pixels/mètre
+        """
+        distance_max = max((float(np.max(np.linalg.norm(etat['positions'], axis=1)))
+                            for etat in etats if len(etat['positions'])), default=0.0)
+        if distance_max == 0.0:
+            return 1e-10
+        # Même règle que la visualisation interactive, sans dépendre de son historique de zoom
+        from src.visualisation import Visualisation
+        return Visualisation.echelle_pour_distance(distance_max, self.largeur, self.hauteur)
+
+    def preparer_taches(self, etats: Iterable[Dict[str, Any]], echelle: float,
+                        dossier: Optional[str]) -> Iterator[Tuple]:
+        """Découpe les états en lots accompagnés de leurs états de préchauffage.
+
+        Les états sont consommés au fur et à mesure ; seuls ceux couvrant la
+        durée des trajectoires précédant le lot courant sont conservés.
+
+        Args:
+            etats (Iterable[Dict[str, Any]]): États à rendre, dans l'ordre chronologique
+            echelle (float): Échelle en pixels/mètre
+            dossier (Optional[str]): Dossier des images PNG, ou None pour des pixels bruts
+
+        Yields:
+            Tuple: Tâche à transmettre à _rendre_lot
+        """
+        historique: deque = deque()
+        etats = iter(etats)
+        debut = 0
+        while True:
+            lot = list(itertools.islice(etats, self.taille_lot))
+            if not lot:
+                return
+            # Préchauffage : états des duree_trajectoire jours précédant le lot
+            while historique and historique[0]['temps'] < lot[0]['temps'] - self.duree_trajectoire:
+                historique.popleft()
+            yield (debut, list(historique), lot, echelle, self.date_debut, dossier)
+            historique.extend(lot)
+            debut += len(lot)
+
+    def exporter(self, etats: Iterable[Dict[str, Any]], dossier: str, video: Optional[str] = None,
+                 images_par_seconde: int = 30, echelle: Optional[float] = None,
+                 delai_max: Optional[float] = None) -> List[str]:
+        """Rend les états et écrit les images ou la vidéo.
+
+        Un fichier images.csv associe à chaque image son temps de simulation.
+
+        Args:
+            etats (Iterable[Dict[str, Any]]): États à rendre, dans l'ordre chronologique
+            dossier (str): Dossier de sortie
+            video (Optional[str]): Nom du fichier vidéo à produire avec ffmpeg ; si ffmpeg
+                est absent, les images sont écrites en PNG
+            images_par_seconde (int): Cadence de la vidéo
+            echelle (Optional[float]): Échelle en pixels/mètre. Par défaut, elle est calculée
+                sur tous les états d'une liste, ou sur le premier état d'un générateur
+            delai_max (Optional[float]): Durée maximale d'attente d'un lot en secondes
+
+        Returns:
+            List[str]: Chemins des fichiers produits
+
+        Raises:
+            RuntimeError: Si l'encodeur vidéo s'arrête en erreur
+            multiprocessing.TimeoutError: Si un lot n'est pas rendu dans le délai imparti
+        """
+        os.makedirs(dossier, exist_ok=True)
+        if echelle is None:
+            if not isinstance(etats, list):
+                etats = iter(etats)
+                premier = next(etats, None)
+                etats = [] if premier is None else itertools.chain([premier], etats)
+                echelle = self.calculer_echelle([premier] if premier is not None else [])
+            else:
+                echelle = self.calculer_echelle(etats)
+        encodeur = shutil.which('ffmpeg') if video else None
+        if video and encodeur is None:
+            print("ffmpeg introuvable : les images sont écrites en PNG.")
+
+        fichiers: List[str] = []
+        processus = None
+        if encodeur:
+            chemin_video = os.path.join(dossier, video)
+            fichiers.append(chemin_video)
+            processus = subprocess.Popen([
+                encodeur, '-y', '-loglevel', 'error', '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+                '-s', f"{self.largeur}x{self.hauteur}", '-r', str(images_par_seconde), '-i', '-',
+                '-pix_fmt', 'yuv420p', chemin_video
+            ], stdin=subprocess.PIPE)
+
+        taches = self.preparer_taches(etats, echelle, None if encodeur else dossier)
+        args_init = (self.largeur, self.hauteur, self.duree_trajectoire)
+        contexte = multiprocessing.get_context('spawn')
+        try:
+            with open(os.path.join(dossier, 'images.csv'), 'w', newline='', encoding='utf-8') as f, \
+                    contexte.Pool(self.nb_processus, initializer=_initialiser_processus,
+                                  initargs=args_init) as pool:
+                ecrivain = csv.writer(f)
+                ecrivain.writerow(['image', 'temps_jours'])
+                # Lots soumis dans l'ordre et récupérés dans le même ordre, en nombre
+                # limité pour ne pas accumuler les états d'une simulation en cours
+                en_cours: deque = deque()
+                for tache in taches:
+                    for decalage, etat in enumerate(tache[2]):
+                        ecrivain.writerow([tache[0] + decalage, repr(float(etat['temps']))])
+                    en_cours.append(pool.apply_async(_rendre_lot, (tache,)))
+                    if len(en_cours) > 2 * self.nb_processus:
+                        self._recevoir_lot(en_cours.popleft().get(delai_max), processus, fichiers)
+                while en_cours:
+                    self._recevoir_lot(en_cours.popleft().get(delai_max), processus, fichiers)
+                pool.close()
+                pool.join()
+        except BaseException:
+            if processus is not None:
+                processus.kill()
+                processus.wait()
+            raise
+
+        if processus is not None:
+            try:
+                processus.stdin.close()
+            except BrokenPipeError:
+                pass
+            code = processus.wait()
+            if code != 0:
+                raise RuntimeError(f"L'encodage de {video} par ffmpeg a échoué (code {code}).")
+        return fichiers
+
+    @staticmethod
+    def _recevoir_lot(lot: List[Any], processus: Optional[subprocess.Popen], fichiers: List[str]) -> None:
+        """Transmet un lot rendu à l'encodeur vidéo ou enregistre ses chemins.
+
+        Args:
+            lot (List[Any]): Résultat de _rendre_lot
+            processus (Optional[subprocess.Popen]): Encodeur vidéo, ou None pour des images PNG
+            fichiers (List[str]): Liste des fichiers produits, complétée en place
+
+        Raises:
+            RuntimeError: Si l'encodeur s'est arrêté avant la fin
+        """
+        if processus is None:
+            fichiers.extend(lot)
+            return
+        for pixels in lot:
+            try:
+                processus.stdin.write(pixels)
+            except BrokenPipeError:
+                code = processus.wait()
+                raise RuntimeError(f"L'encodeur ffmpeg s'est arrêté prématurément (code {code}).")
@@ -0,0 +1,454 @@
+import time
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from src.modele import SystemeSolaire
+from src.traceur import TRACEUR_NUL
+
+
+# Vitesse de la lumière en m/s
+C = 299792458.0
+
+# Luminosité du Soleil en W
+LUMINOSITE_SOLAIRE = 3.828e26
+
+# Corps visés par un terme : groupe ('tous', 'etoiles', 'planetes'), nom, ou liste de groupes et de noms
+Selection = Union[str, Sequence[str]]
+
+
+def selectionner(systeme: SystemeSolaire, corps: Selection) -> np.ndarray:
+    """Retourne les lignes des corps désignés par des groupes ou par leurs noms.
+
+    Les noms absents du système (par exemple d'un corps absorbé lors d'une
+    collision) ne désignent aucune ligne.
+
+    Args:
+        systeme (SystemeSolaire): Système indexé
+        corps (Selection): Groupes 'tous', 'etoiles' ou 'planetes', et noms de corps
+
+    Returns:
+        np.ndarray: Lignes des corps désignés, triées et sans doublon
+    """
+    if isinstance(corps, str):
+        corps = [corps]
+    corps_liste = systeme.corps_indexes
+    nb_etoiles = len(systeme.etoiles)
+    masque = np.zeros(len(corps_liste), dtype=bool)
+    noms = set()
+    for element in corps:
+        if element == 'tous':
+            masque[:] = True
+        elif element == 'etoiles':
+            masque[:nb_etoiles] = True
+        elif element == 'planetes':
+            masque[nb_etoiles:] = True
+        else:
+            noms.add(element)
+    if noms:
+        masque |= np.fromiter((c.nom in noms for c in corps_liste), dtype=bool, count=len(corps_liste))
+    return np.flatnonzero(masque)
+
+
+class TermeForce:
+    """Terme du modèle de forces, qui ajoute ses accélérations à un tampon commun.
+
+    Les lignes des corps visés sont recherchées une fois, puis de nouveau
+    seulement lorsque les lignes du système changent (version_lignes) ; à
+    chaque pas, le terme ne lit et n'écrit que des tableaux entiers.
+    """
+
+    nom = 'terme'
+
+    def __init__(self, corps: Selection = 'tous'):
+        """Initialise un terme.
+
+        Args:
+            corps (Selection): Corps soumis au terme
+        """
+        self.corps = corps
+        self._lignes = None  # Système et version de ses lignes lors de la dernière recherche
+        self._cibles = np.zeros(0, dtype=np.int64)
+
+    def cibles(self, systeme: SystemeSolaire) -> np.ndarray:
+        """Retourne les lignes des corps soumis au terme.
+
+        Args:
+            systeme (SystemeSolaire): Système indexé
+
+        Returns:
+            np.ndarray: Lignes des corps visés
+        """
+        lignes = (systeme, systeme.version_lignes)
+        if lignes != self._lignes:
+            self._lignes = lignes
+            self.resoudre(systeme)
+        return self._cibles
+
+    def resoudre(self, systeme: SystemeSolaire) -> None:
+        """Recherche les lignes des corps visés après un changement des lignes du système.
+
+        Args:
+            systeme (SystemeSolaire): Système indexé
+        """
+        self._cibles = selectionner(systeme, self.corps)
+
+    def ajouter(self, systeme: SystemeSolaire, acceleration: np.ndarray) -> None:
+        """Ajoute les accélérations du terme à celles des corps.
+
+        Args:
+            systeme (SystemeSolaire): Système indexé
+            acceleration (np.ndarray): Accélérations (N, 3) en m/s², complétées sur place
+        """
+        raise NotImplementedError
+
+
+class GraviteNewton(TermeForce):
+    """Gravitation newtonienne exercée par tous les corps, calculée par blocs de paires."""
+
+    nom = 'gravite'
+
+    def __init__(self, corps: Selection = 'tous', taille_bloc: int = 1 << 18):
+        """Initialise le terme.
+
+        Args:
+            corps (Selection): Corps soumis à la gravitation de tous les autres
+            taille_bloc (int): Nombre maximal de paires calculées à la fois
+        """
+        super().__init__(corps)
+        self.taille_bloc = taille_bloc
+
+    def ajouter(self, systeme: SystemeSolaire, acceleration: np.ndarray) -> None:
+        """Ajoute a_i = Σ G m_j (r_j - r_i) / |r_j - r_i|³, en ignorant les paires plus proches que 1e-10 m.
+
+        Args:
+            systeme (SystemeSolaire): Système indexé
+            acceleration (np.ndarray): Accélérations (N, 3) en m/s², complétées sur place
+        """
+        cibles = self.cibles(systeme)
+        positions = systeme.positions
+        gm = systeme.G * systeme.masses
+        nb_lignes = max(1, self.taille_bloc // max(len(gm), 1))
+        for debut in range(0, len(cibles), nb_lignes):
+            lignes = cibles[debut:debut + nb_lignes]
+            ecarts = positions[np.newaxis, :, :] - positions[lignes, np.newaxis, :]
+            carres = np.einsum('ijk,ijk->ij', ecarts, ecarts)
+            # Le corps lui-même, à distance nulle, n'exerce aucune force
+            inverses = np.zeros_like(carres)
+            np.power(carres, -1.5, out=inverses, where=carres >= 1e-20)
+            acceleration[lignes] += np.einsum('ij,ijk->ik', inverses * gm, ecarts)
+
+
+class TermeCentral(TermeForce):
+    """Terme exercé par un corps central (par défaut l'étoile la plus massive) sur les corps visés."""
+
+    def __init__(self, source: Optional[str] = None, corps: Selection = 'planetes'):
+        """Initialise le terme.
+
+        Args:
+            source (Optional[str]): Nom du corps central, ou None pour l'étoile la plus massive
+            corps (Selection): Corps soumis au terme, hors corps central
+        """
+        super().__init__(corps)
+        self.source = source
+        self._source = -1
+
+    def resoudre(self, systeme: SystemeSolaire) -> None:
+        """Recherche les lignes du corps central et des corps visés.
+
+        Args:
+            systeme (SystemeSolaire): Système indexé
+        """
+        if self.source is not None:
+            lignes = selectionner(systeme, [self.source])
+            self._source = int(lignes[0]) if len(lignes) else -1
+        elif systeme.etoiles:
+            self._source = int(np.argmax(systeme.masses[:len(systeme.etoiles)]))
+        else:
+            self._source = -1
+        cibles = selectionner(systeme, self.corps) if self._source >= 0 else np.zeros(0, dtype=np.int64)
+        self._cibles = cibles[cibles != self._source]
+
+    def relatifs(self, systeme: SystemeSolaire, cibles: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Retourne l'état des corps visés relatif au corps central.
+
+        Args:
+            systeme (SystemeSolaire): Système indexé
+            cibles (np.ndarray): Lignes (K,) des corps visés
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: Positions relatives (K, 3),
+            distances (K,) et vitesses relatives (K, 3)
+        """
+        source = self._source
+        r = systeme.positions[cibles] - systeme.positions[source]
+        distances = np.sqrt(np.einsum('ij,ij->i', r, r))
+        v = systeme.vitesses[cibles] - systeme.vitesses[source]
+        return r, distances, v
+
+
+class RelativiteGenerale(TermeCentral):
+    """Correction post-newtonienne (1PN) du champ d'une masse centrale.
+
+    Approximation d'une particule test dans la métrique de Schwarzschild, en
+    coordonnées harmoniques : a = GM / (c² r³) [(4 GM / r - v²) r + 4 (r · v) v],
+    avec r et v relatifs au corps central. Elle produit l'avance du périhélie
+    de Mercure (43" par siècle) ; la réaction sur le corps central est négligée.
+    """
+
+    nom = 'relativite'
+
+    def ajouter(self, systeme: SystemeSolaire, acceleration: np.ndarray) -> None:
+        """Ajoute la correction aux accélérations des corps visés.
+
+        Args:
+            systeme (SystemeSolaire): Système indexé
+            acceleration (np.ndarray): Accélérations (N, 3) en m/s², complétées sur place
+        """
+        cibles = self.cibles(systeme)
+        if len(cibles) == 0:
+            return
+        r, distances, v = self.relatifs(systeme, cibles)
+        gm = systeme.G * systeme.masses[self._source]
+        carres_vitesses = np.einsum('ij,ij->i', v, v)
+        produits = np.einsum('ij,ij->i', r, v)
+        facteurs = gm / (C * C * distances ** 3)
+        acceleration[cibles] += facteurs[:, np.newaxis] * (
+            (4.0 * gm / distances - carres_vitesses)[:, np.newaxis] * r + 4.0 * produits[:, np.newaxis] * v)
+
+
+class AplatissementJ2(TermeCentral):
+    """Terme J2 du potentiel d'un corps central aplati autour de son axe de rotation.
+
+    a = -3/2 J2 GM R² / r⁵ [(1 - 5 z² / r²) r + 2 z k], où k est l'axe de
+    rotation et z = r · k.
+    """
+
+    nom = 'j2'
+
+    def __init__(self, source: Optional[str] = None, corps: Selection = 'planetes', j2: float = 2.2e-7,
+                 rayon: Optional[float] = None, axe: Sequence[float] = (0.0, 0.0, 1.0)):
+        """Initialise le terme.
+
+        Args:
+            source (Optional[str]): Nom du corps central, ou None pour l'étoile la plus massive
+            corps (Selection): Corps soumis au terme
+            j2 (float): Coefficient J2 du corps central (2.2e-7 pour le Soleil)
+            rayon (Optional[float]): Rayon équatorial de référence en mètres, ou None pour le rayon du corps central
+            axe (Sequence[float]): Direction de l'axe de rotation du corps central
+        """
+        super().__init__(source, corps)
+        self.j2 = j2
+        self.rayon = rayon
+        self.axe = np.asarray(axe, dtype=float) / np.linalg.norm(axe)
+
+    def ajouter(self, systeme: SystemeSolaire, acceleration: np.ndarray) -> None:
+        """Ajoute le terme J2 aux accélérations des corps visés.
+
+        Args:
+            systeme (SystemeSolaire): Système indexé
+            acceleration (np.ndarray): Accélérations (N, 3) en m/s², complétées sur place
+        """
+        cibles = self.cibles(systeme)
+        if len(cibles) == 0:
+            return
+        r, distances, _ = self.relatifs(systeme, cibles)
+        source = self._source
+        rayon = self.rayon if self.rayon is not None else systeme.rayons[source]
+        gm = systeme.G * systeme.masses[source]
+        z = r @ self.axe
+        carres = distances * distances
+        facteurs = -1.5 * self.j2 * gm * rayon * rayon / (carres * carres * distances)
+        acceleration[cibles] += facteurs[:, np.newaxis] * (
+            (1.0 - 5.0 * z * z / carres)[:, np.newaxis] * r + 2.0 * z[:, np.newaxis] * self.axe)
+
+
+class PressionRadiation(TermeCentral):
+    """Pression du rayonnement d'une étoile sur des corps sphériques.
+
+    a = Q L R² / (4 c r² m), dirigée à l'opposé de l'étoile, pour un corps de
+    rayon R et de masse m ; Q vaut 1 pour une absorption totale.
+    """
+
+    nom = 'radiation'
+
+    def __init__(self, source: Optional[str] = None, corps: Selection = 'planetes',
+                 luminosite: float = LUMINOSITE_SOLAIRE, coefficient: float = 1.0):
+        """Initialise le terme.
+
+        Args:
+            source (Optional[str]): Nom de l'étoile, ou None pour l'étoile la plus massive
+            corps (Selection): Corps soumis au rayonnement
+            luminosite (float): Luminosité de l'étoile en W
+            coefficient (float): Coefficient de pression de rayonnement Q
+        """
+        super().__init__(source, corps)
+        self.luminosite = luminosite
+        self.coefficient = coefficient
+
+    def ajouter(self, systeme: SystemeSolaire, acceleration: np.ndarray) -> None:
+        """Ajoute la pression de rayonnement aux accélérations des corps visés.
+
+        Args:
+            systeme (SystemeSolaire): Système indexé
+            acceleration (np.ndarray): Accélérations (N, 3) en m/s², complétées sur place
+        """
+        cibles = self.cibles(systeme)
+        if len(cibles) == 0:
+            return
+        r, distances, _ = self.relatifs(systeme, cibles)
+        rayons = systeme.rayons[cibles]
+        normes = self.coefficient * self.luminosite * rayons * rayons / (4.0 * C * distances ** 2 *
+                                                                          systeme.masses[cibles])
+        acceleration[cibles] += (normes / distances)[:, np.newaxis] * r
+
+
+class Poussee(TermeForce):
+    """Poussée constante d'un moteur, par exemple celle d'une sonde."""
+
+    nom = 'poussee'
+
+    def __init__(self, corps: Selection, force: float, direction: Union[str, Sequence[float]] = 'vitesse'):
+        """Initialise le terme.
+
+        Args:
+            corps (Selection): Corps propulsés
+            force (float): Poussée en N
+            direction (Union[str, Sequence[float]]): 'vitesse' pour pousser dans le sens du
+                mouvement, ou direction fixe
+        """
+        super().__init__(corps)
+        self.force = force
+        self.direction = direction if isinstance(direction, str) else (
+            np.asarray(direction, dtype=float) / np.linalg.norm(direction))
+
+    def ajouter(self, systeme: SystemeSolaire, acceleration: np.ndarray) -> None:
+        """Ajoute F / m dans la direction de poussée aux accélérations des corps visés.
+
+        Args:
+            systeme (SystemeSolaire): Système indexé
+            acceleration (np.ndarray): Accélérations (N, 3) en m/s², complétées sur place
+        """
+        cibles = self.cibles(systeme)
+        if len(cibles) == 0:
+            return
+        if isinstance(self.direction, str):
+            vitesses = systeme.vitesses[cibles]
+            normes = np.sqrt(np.einsum('ij,ij->i', vitesses, vitesses))
+            directions = np.divide(vitesses, normes[:, np.newaxis], out=np.zeros_like(vitesses),
+                                   where=normes[:, np.newaxis] > 0)
+        else:
+            directions = self.direction
+        acceleration[cibles] += (self.force / systeme.masses[cibles])[:, np.newaxis] * directions
+
+
+# Termes disponibles dans la section "forces" d'un scénario JSON
+TERMES = {classe.nom: classe for classe in (GraviteNewton, RelativiteGenerale, AplatissementJ2,
+                                              PressionRadiation, Poussee)}
+
+
+class ModeleForces:
+    """Suite de termes de force évalués sur les tableaux d'état entiers.
+
+    Chaque terme ajoute ses accélérations au même tampon, réutilisé d'un pas à
+    l'autre ; la durée cumulée de chaque terme est mesurée et, si un traceur
+    est fourni, enregistrée comme un intervalle 'forces/<terme>'.
+    """
+
+    def __init__(self, termes: Optional[List[TermeForce]] = None):
+        """Initialise le modèle.
+
+        Args:
+            termes (Optional[List[TermeForce]]): Termes évalués dans l'ordre, ou None pour
+                la seule gravitation newtonienne
+        """
+        self.termes = list(termes) if termes is not None else [GraviteNewton()]
+        # Étiquettes distinctes, numérotées si un terme apparaît plusieurs fois
+        self.etiquettes = []
+        for terme in self.termes:
+            etiquette = terme.nom
+            numero = 2
+            while etiquette in self.etiquettes:
+                etiquette = f"{terme.nom}{numero}"
+                numero += 1
+            self.etiquettes.append(etiquette)
+        self._noms_traces = [f"forces/{etiquette}" for etiquette in self.etiquettes]
+        self.durees: Dict[str, float] = dict.fromkeys(self.etiquettes, 0.0)
+        self.nb_evaluations = 0
+        self._acceleration = np.zeros((0, 3))
+
+    @classmethod
+    def depuis_config(cls, config: Optional[List[Dict]]) -> 'ModeleForces':
+        """Construit un modèle à partir de la section "forces" d'un scénario.
+
+        Chaque entrée nomme son terme sous la clé 'terme' ; ses autres clés sont
+        les paramètres du terme, dont 'corps' (groupe ou liste de noms). La
+        gravitation newtonienne de tous les corps est ajoutée en tête si la
+        configuration ne la mentionne pas.
+
+        Args:
+            config (Optional[List[Dict]]): Entrées de la section, ou None
+
+        Returns:
+            ModeleForces: Modèle configuré
+
+        Raises:
+            ValueError: Si un terme est inconnu ou ses paramètres invalides
+        """
+        termes = []
+        for entree in config or []:
+            parametres = dict(entree)
+            nom = parametres.pop('terme', None)
+            classe = TERMES.get(nom)
+            if classe is None:
+                raise ValueError(f"Terme de force inconnu : {nom} (termes disponibles : {', '.join(TERMES)})")
+            try:
+                termes.append(classe(**parametres))
+            except TypeError as e:
+                raise ValueError(f"Paramètres invalides pour le terme {nom} : {e}") from e
+        if not any(isinstance(terme, GraviteNewton) for terme in termes):
+            termes.insert(0, GraviteNewton())
+        return cls(termes)
+
+    @property
+    def gravitation_seule(self) -> bool:
+        """bool: True si le modèle se réduit à la gravitation newtonienne de tous les corps."""
+        return all(type(terme) is GraviteNewton and terme.corps == 'tous' for terme in self.termes)
+
+    def accelerations(self, systeme: SystemeSolaire, traceur=TRACEUR_NUL) -> np.ndarray:
+        """Calcule les accélérations de tous les corps.
+
+        Args:
+            systeme (SystemeSolaire): Système indexé
+            traceur (Traceur): Traceur recevant un intervalle par terme
+
+        Returns:
+            np.ndarray: Accélérations (N, 3) en m/s², dans un tampon réutilisé au prochain appel
+        """
+        n = len(systeme.masses)
+        acceleration = self._acceleration
+        if len(acceleration) != n:
+            acceleration = self._acceleration = np.zeros((n, 3))
+        else:
+            acceleration.fill(0.0)
+        horloge = time.perf_counter_ns
+        durees = self.durees
+        debut = horloge()
+        for etiquette, nom_trace, terme in zip(self.etiquettes, self._noms_traces, self.termes):
+            terme.ajouter(systeme, acceleration)
+            fin = horloge()
+            durees[etiquette] += (fin - debut) * 1e-9
+            traceur.enregistrer(nom_trace, debut, fin)
+            debut = fin
+        self.nb_evaluations += 1
+        return acceleration
+
+    def lignes_rapport(self) -> List[str]:
+        """Formate la durée moyenne de chaque terme par évaluation.
+
+        Returns:
+            List[str]: Une ligne par terme, vide si aucune évaluation n'a été faite
+        """
+        if not self.nb_evaluations:
+            return []
+        total = sum(self.durees.values()) or 1.0
+        return [f"{etiquette:12s} {duree / self.nb_evaluations * 1e3:10.3f} ms/pas {100 * duree / total:6.1f} %"
+                for etiquette, duree in self.durees.items()]
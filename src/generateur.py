@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Générateur de systèmes synthétiques pour les tests de montée en charge
+
+Chaque scénario est produit directement sous forme de tableaux (un par
+colonne : noms, masses, rayons, positions, vitesses, couleurs), les étoiles
+en premier, dans le référentiel du centre de masse. Un scénario s'écrit au
+format JSON des données ou au format binaire .npz, ou se convertit en
+SystemeSolaire.
+
+    python -m src.generateur disque -n 100000 --graine 1 --sortie data/disque.json
+    python -m src.generateur ceinture -n 1000000 --graine 1 --sortie data/ceinture.npz
+"""
+
+import json
+import argparse
+from typing import Dict, Optional
+import numpy as np
+from src.modele import SystemeSolaire
+from src.catalogue import enregistrer_npz
+from src.orbites import etat_depuis_elements
+
+UA = 1.496e11  # m
+MASSE_SOLEIL = 1.989e30  # kg
+RAYON_SOLEIL = 696340e3  # m
+PARSEC = 3.0857e16  # m
+
+# Lacunes de Kirkwood : demi-grand axe (UA) et demi-largeur (UA) des résonances 4:1, 3:1, 5:2, 7:3 et 2:1 avec Jupiter
+LACUNES_KIRKWOOD = [(2.065, 0.03), (2.502, 0.025), (2.825, 0.02), (2.958, 0.012), (3.279, 0.04)]
+
+
+def creer_scenario(noms: np.ndarray, masses: np.ndarray, rayons: np.ndarray, positions: np.ndarray,
+                   vitesses: np.ndarray, couleurs: np.ndarray, nb_etoiles: int) -> Dict[str, np.ndarray]:
+    """Assemble les colonnes d'un scénario et le ramène au centre de masse.
+
+    Args:
+        noms (np.ndarray): Noms (N,)
+        masses (np.ndarray): Masses (N,) en kg
+        rayons (np.ndarray): Rayons (N,) en m
+        positions (np.ndarray): Positions (N, 3) en m
+        vitesses (np.ndarray): Vitesses (N, 3) en m/s
+        couleurs (np.ndarray): Couleurs (N, 3) RVB
+        nb_etoiles (int): Nombre d'étoiles, placées en tête des colonnes
+
+    Returns:
+        Dict[str, np.ndarray]: Scénario
+    """
+    masses = np.asarray(masses, dtype=float)
+    positions = np.asarray(positions, dtype=float)
+    vitesses = np.asarray(vitesses, dtype=float)
+    masse_totale = masses.sum()
+    return {
+        'noms': np.asarray(noms, dtype=str),
+        'masses': masses,
+        'rayons': np.asarray(rayons, dtype=float),
+        'positions': positions - masses @ positions / masse_totale,
+        'vitesses': vitesses - masses @ vitesses / masse_totale,
+        'couleurs': np.asarray(couleurs, dtype=np.uint8),
+        'nb_etoiles': nb_etoiles,
+    }
+
+
+def _noms(prefixe: str, n: int) -> np.ndarray:
+    """Retourne les noms numérotés « prefixe 0 », « prefixe 1 »...
+
+    Args:
+        prefixe (str): Début des noms
+        n (int): Nombre de noms
+
+    Returns:
+        np.ndarray: Noms (n,)
+    """
+    return np.char.add(prefixe + ' ', np.arange(n).astype(str))
+
+
+def _rayons(masses: np.ndarray, densite: float) -> np.ndarray:
+    """Calcule le rayon de corps sphériques homogènes.
+
+    Args:
+        masses (np.ndarray): Masses en kg
+        densite (float): Masse volumique en kg/m³
+
+    Returns:
+        np.ndarray: Rayons en m
+    """
+    return np.cbrt(3 * masses / (4 * np.pi * densite))
+
+
+def _rayleigh(generateur: np.random.Generator, echelle: float, maximum: float, n: int) -> np.ndarray:
+    """Tire des valeurs selon une loi de Rayleigh tronquée.
+
+    Args:
+        generateur (np.random.Generator): Générateur aléatoire
+        echelle (float): Paramètre de la loi
+        maximum (float): Valeur maximale
+        n (int): Nombre de valeurs
+
+    Returns:
+        np.ndarray: Valeurs (n,)
+    """
+    return np.minimum(generateur.rayleigh(echelle, n), maximum)
+
+
+def _direction_isotrope(generateur: np.random.Generator, n: int) -> np.ndarray:
+    """Tire des vecteurs unitaires uniformément répartis sur la sphère.
+
+    Args:
+        generateur (np.random.Generator): Générateur aléatoire
+        n (int): Nombre de vecteurs
+
+    Returns:
+        np.ndarray: Vecteurs (n, 3)
+    """
+    cos_theta = generateur.uniform(-1.0, 1.0, n)
+    phi = generateur.uniform(0.0, 2 * np.pi, n)
+    sin_theta = np.sqrt(1 - cos_theta ** 2)
+    return np.stack([sin_theta * np.cos(phi), sin_theta * np.sin(phi), cos_theta], axis=1)
+
+
+def disque_kepler(n: int, graine: Optional[int] = None, masse_etoile: float = MASSE_SOLEIL,
+                  r_min: float = 0.5 * UA, r_max: float = 40 * UA, exposant_densite: float = -1.5,
+                  masse_disque: float = 6e24, excentricite: float = 0.02,
+                  inclinaison: float = 0.01) -> Dict[str, np.ndarray]:
+    """Génère un disque de planétésimaux en orbite képlérienne autour d'une étoile.
+
+    La densité surfacique du disque varie comme r^exposant_densite. Les
+    excentricités et inclinaisons suivent des lois de Rayleigh, les autres
+    angles sont uniformes.
+
+    Args:
+        n (int): Nombre de planétésimaux
+        graine (Optional[int]): Graine du générateur aléatoire
+        masse_etoile (float): Masse de l'étoile en kg
+        r_min (float): Rayon intérieur du disque en m
+        r_max (float): Rayon extérieur du disque en m
+        exposant_densite (float): Exposant de la densité surfacique
+        masse_disque (float): Masse totale des planétésimaux en kg
+        excentricite (float): Paramètre de la loi des excentricités
+        inclinaison (float): Paramètre de la loi des inclinaisons, en radians
+
+    Returns:
+        Dict[str, np.ndarray]: Scénario de n + 1 corps
+    """
+    generateur = np.random.default_rng(graine)
+    # Distance tirée par inversion de la fonction de répartition de Σ(r) r dr ∝ r^(p+1) dr
+    q = exposant_densite + 2
+    u = generateur.uniform(0.0, 1.0, n)
+    if abs(q) < 1e-12:
+        a = r_min * (r_max / r_min) ** u
+    else:
+        a = (r_min ** q + u * (r_max ** q - r_min ** q)) ** (1 / q)
+    masses = np.full(n, masse_disque / max(n, 1))
+    positions, vitesses = etat_depuis_elements(
+        a, _rayleigh(generateur, excentricite, 0.5, n), _rayleigh(generateur, inclinaison, 0.5, n),
+        generateur.uniform(0, 2 * np.pi, n), generateur.uniform(0, 2 * np.pi, n), generateur.uniform(0, 2 * np.pi, n),
+        SystemeSolaire.G * (masse_etoile + masses))
+    return creer_scenario(
+        np.concatenate([['Étoile'], _noms('Planétésimal', n)]),
+        np.concatenate([[masse_etoile], masses]),
+        np.concatenate([[RAYON_SOLEIL], _rayons(masses, 2000.0)]),
+        np.concatenate([np.zeros((1, 3)), positions]),
+        np.concatenate([np.zeros((1, 3)), vitesses]),
+        np.concatenate([[(255, 255, 0)], np.tile((170, 170, 170), (n, 1))]),
+        nb_etoiles=1)
+
+
+def ceinture_asteroides(n: int, graine: Optional[int] = None, avec_jupiter: bool = True,
+                        a_min: float = 2.0 * UA, a_max: float = 3.5 * UA) -> Dict[str, np.ndarray]:
+    """Génère une ceinture d'astéroïdes autour du Soleil, avec les lacunes de Kirkwood.
+
+    Les demi-grands axes tombant dans une lacune (résonances de moyen mouvement
+    avec Jupiter) sont tirés de nouveau. Les diamètres suivent une loi de
+    puissance dN/dD ∝ D^-3.5 entre 1 et 100 km.
+
+    Args:
+        n (int): Nombre d'astéroïdes
+        graine (Optional[int]): Graine du générateur aléatoire
+        avec_jupiter (bool): Ajoute Jupiter, responsable des lacunes
+        a_min (float): Demi-grand axe minimal en m
+        a_max (float): Demi-grand axe maximal en m
+
+    Returns:
+        Dict[str, np.ndarray]: Scénario de n + 1 corps (n + 2 avec Jupiter)
+    """
+    generateur = np.random.default_rng(graine)
+    a = generateur.uniform(a_min, a_max, n)
+    while True:
+        dans_lacune = np.zeros(n, dtype=bool)
+        for centre, demi_largeur in LACUNES_KIRKWOOD:
+            dans_lacune |= np.abs(a / UA - centre) < demi_largeur
+        if not dans_lacune.any():
+            break
+        a[dans_lacune] = generateur.uniform(a_min, a_max, int(dans_lacune.sum()))
+
+    # Diamètres par inversion de la loi de puissance tronquée
+    d_min, d_max, alpha = 1e3, 1e5, 2.5
+    u = generateur.uniform(0.0, 1.0, n)
+    diametres = (d_min ** -alpha - u * (d_min ** -alpha - d_max ** -alpha)) ** (-1 / alpha)
+    rayons = diametres / 2
+    masses = 4 / 3 * np.pi * rayons ** 3 * 2500.0
+
+    noms = [np.array(['Soleil']), _noms('Astéroïde', n)]
+    elements = [a, _rayleigh(generateur, 0.08, 0.4, n), _rayleigh(generateur, 0.1, 0.6, n),
+                generateur.uniform(0, 2 * np.pi, n), generateur.uniform(0, 2 * np.pi, n),
+                generateur.uniform(0, 2 * np.pi, n)]
+    masses_planetes = masses
+    couleurs = np.tile((150, 120, 90), (n, 1))
+    if avec_jupiter:
+        noms.insert(1, np.array(['Jupiter']))
+        elements = [np.concatenate([[valeur], colonne]) for valeur, colonne in
+                    zip((5.2044 * UA, 0.0489, 0.0228, 1.7536, 4.7791, generateur.uniform(0, 2 * np.pi)), elements)]
+        masses_planetes = np.concatenate([[1.898e27], masses])
+        rayons = np.concatenate([[69911e3], rayons])
+        couleurs = np.concatenate([[(200, 160, 110)], couleurs])
+    positions, vitesses = etat_depuis_elements(*elements, SystemeSolaire.G * (MASSE_SOLEIL + masses_planetes))
+    return creer_scenario(
+        np.concatenate(noms),
+        np.concatenate([[MASSE_SOLEIL], masses_planetes]),
+        np.concatenate([[RAYON_SOLEIL], rayons]),
+        np.concatenate([np.zeros((1, 3)), positions]),
+        np.concatenate([np.zeros((1, 3)), vitesses]),
+        np.concatenate([[(255, 255, 0)], couleurs]),
+        nb_etoiles=1)
+
+
+def amas_plummer(n: int, graine: Optional[int] = None, masse_totale: float = 1000 * MASSE_SOLEIL,
+                 rayon_plummer: float = PARSEC, rayon_max: float = 10.0) -> Dict[str, np.ndarray]:
+    """Génère un amas d'étoiles de même masse en équilibre selon le modèle de Plummer.
+
+    Les positions sont tirées par inversion de la masse cumulée et les vitesses
+    par rejet sur la fonction de distribution (Aarseth, Hénon et Wielen 1974).
+    Tous les corps sont des étoiles.
+
+    Args:
+        n (int): Nombre d'étoiles
+        graine (Optional[int]): Graine du générateur aléatoire
+        masse_totale (float): Masse de l'amas en kg
+        rayon_plummer (float): Rayon de Plummer en m
+        rayon_max (float): Distance maximale au centre, en rayons de Plummer
+
+    Returns:
+        Dict[str, np.ndarray]: Scénario de n étoiles
+    """
+    generateur = np.random.default_rng(graine)
+    # Distances en rayons de Plummer, tronquées à rayon_max
+    fraction_max = (1 + rayon_max ** -2) ** -1.5
+    x = generateur.uniform(0.0, fraction_max, n)
+    r = 1 / np.sqrt(np.maximum(x, 1e-300) ** (-2 / 3) - 1)
+
+    # Rapport q = v / v_libération tiré par rejet sous g(q) = q² (1 - q²)^3.5, dont le maximum est < 0.1
+    q = np.empty(n)
+    restants = np.arange(n)
+    while len(restants):
+        essais = generateur.uniform(0.0, 1.0, len(restants))
+        acceptes = generateur.uniform(0.0, 0.1, len(restants)) < essais ** 2 * (1 - essais ** 2) ** 3.5
+        q[restants[acceptes]] = essais[acceptes]
+        restants = restants[~acceptes]
+    v = q * np.sqrt(2) * (1 + r ** 2) ** -0.25
+
+    unite_vitesse = np.sqrt(SystemeSolaire.G * masse_totale / rayon_plummer)
+    masses = np.full(n, masse_totale / n)
+    return creer_scenario(
+        _noms('Étoile', n),
+        masses,
+        RAYON_SOLEIL * (masses / MASSE_SOLEIL) ** 0.8,
+        (r * rayon_plummer)[:, None] * _direction_isotrope(generateur, n),
+        (v * unite_vitesse)[:, None] * _direction_isotrope(generateur, n),
+        np.tile((255, 220, 180), (n, 1)),
+        nb_etoiles=n)
+
+
+def binaire_circumbinaire(n: int, graine: Optional[int] = None, masse_a: float = 0.69 * MASSE_SOLEIL,
+                          masse_b: float = 0.20 * MASSE_SOLEIL, separation: float = 0.22 * UA,
+                          r_max: float = 5 * UA) -> Dict[str, np.ndarray]:
+    """Génère une étoile binaire en orbite circulaire entourée de planètes circumbinaires.
+
+    Les valeurs par défaut reprennent le système Kepler-16. Les planètes sont
+    placées au-delà de 2,5 fois la séparation, limite de stabilité des orbites
+    circumbinaires, en orbite quasi circulaire autour du centre de masse.
+
+    Args:
+        n (int): Nombre de planètes
+        graine (Optional[int]): Graine du générateur aléatoire
+        masse_a (float): Masse de l'étoile principale en kg
+        masse_b (float): Masse de l'étoile secondaire en kg
+        separation (float): Distance entre les deux étoiles en m
+        r_max (float): Demi-grand axe maximal des planètes en m
+
+    Returns:
+        Dict[str, np.ndarray]: Scénario de n + 2 corps
+    """
+    generateur = np.random.default_rng(graine)
+    masse_binaire = masse_a + masse_b
+    vitesse_relative = np.sqrt(SystemeSolaire.G * masse_binaire / separation)
+    positions_etoiles = np.array([[-separation * masse_b / masse_binaire, 0.0, 0.0],
+                                  [separation * masse_a / masse_binaire, 0.0, 0.0]])
+    vitesses_etoiles = np.array([[0.0, -vitesse_relative * masse_b / masse_binaire, 0.0],
+                                 [0.0, vitesse_relative * masse_a / masse_binaire, 0.0]])
+
+    a = generateur.uniform(2.5 * separation, r_max, n)
+    masses = 10 ** generateur.uniform(22, 26, n)  # De la Lune à Neptune environ
+    positions, vitesses = etat_depuis_elements(
+        a, _rayleigh(generateur, 0.01, 0.1, n), _rayleigh(generateur, 0.005, 0.05, n),
+        generateur.uniform(0, 2 * np.pi, n), generateur.uniform(0, 2 * np.pi, n), generateur.uniform(0, 2 * np.pi, n),
+        SystemeSolaire.G * (masse_binaire + masses))
+    return creer_scenario(
+        np.concatenate([['Étoile A', 'Étoile B'], _noms('Planète', n)]),
+        np.concatenate([[masse_a, masse_b], masses]),
+        np.concatenate([[0.65 * RAYON_SOLEIL, 0.23 * RAYON_SOLEIL], _rayons(masses, 3000.0)]),
+        np.concatenate([positions_etoiles, positions]),
+        np.concatenate([vitesses_etoiles, vitesses]),
+        np.concatenate([[(255, 200, 100), (255, 120, 80)], np.tile((100, 160, 255), (n, 1))]),
+        nb_etoiles=2)
+
+
+SCENARIOS = {
+    'disque': disque_kepler,
+    'ceinture': ceinture_asteroides,
+    'plummer': amas_plummer,
+    'binaire': binaire_circumbinaire,
+}
+
+
+def vers_systeme(scenario: Dict[str, np.ndarray], randomSpeedRatio: float = 0.1) -> SystemeSolaire:
+    """Crée un système solaire à partir d'un scénario.
+
+    Args:
+        scenario (Dict[str, np.ndarray]): Scénario
+        randomSpeedRatio (float): Variation aléatoire de la vitesse conservée par le système
+
+    Returns:
+        SystemeSolaire: Système contenant un corps par ligne du scénario
+    """
+    systeme = SystemeSolaire(randomSpeedRatio=randomSpeedRatio)
+    systeme.charger_scenario(scenario)
+    return systeme
+
+
+def ecrire_json(scenario: Dict[str, np.ndarray], chemin: str) -> None:
+    """Écrit un scénario au format JSON des données.
+
+    Le fichier indique "aleatoire": false pour que le chargement conserve les
+    positions et vitesses générées. Les corps sont écrits un par un, sans
+    construire le document complet en mémoire.
+
+    Args:
+        scenario (Dict[str, np.ndarray]): Scénario
+        chemin (str): Chemin du fichier JSON
+    """
+    nb_etoiles = int(scenario['nb_etoiles'])
+    colonnes = zip(scenario['noms'].tolist(), scenario['masses'].tolist(), scenario['rayons'].tolist(),
+                   scenario['positions'].tolist(), scenario['vitesses'].tolist(), scenario['couleurs'].tolist())
+    with open(chemin, 'w', encoding='utf-8') as f:
+        f.write('{"aleatoire": false,\n"etoiles": [')
+        for indice, (nom, masse, rayon, position, vitesse, couleur) in enumerate(colonnes):
+            if indice == nb_etoiles:
+                f.write('\n],\n"planetes": [')
+            separateur = '\n' if indice in (0, nb_etoiles) else ',\n'
+            f.write(separateur + json.dumps({'nom': nom, 'masse': masse, 'rayon': rayon, 'position': position,
+                                             'vitesse': vitesse, 'couleur': couleur}, ensure_ascii=False))
+        if len(scenario['masses']) == nb_etoiles:
+            f.write('\n],\n"planetes": [')
+        f.write('\n]}\n')
+
+
+def main():
+    """Point d'entrée du générateur en ligne de commande."""
+    parser = argparse.ArgumentParser(description='Génère un système synthétique')
+    parser.add_argument('scenario', choices=sorted(SCENARIOS), help='Type de système')
+    parser.add_argument('-n', type=int, default=1000, help='Nombre de petits corps (d\'étoiles pour plummer)')
+    parser.add_argument('--graine', type=int, default=None, help='Graine du générateur aléatoire')
+    parser.add_argument('--sortie', type=str, required=True, help='Fichier produit, au format binaire en colonnes si son extension est .npz, JSON sinon')
+    args = parser.parse_args()
+
+    scenario = SCENARIOS[args.scenario](args.n, graine=args.graine)
+    if args.sortie.endswith('.npz'):
+        enregistrer_npz(scenario, args.sortie)
+    else:
+        ecrire_json(scenario, args.sortie)
+    print(f"{len(scenario['masses'])} corps écrits dans {args.sortie}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+from typing import Dict, List, Tuple
+import pygame
+
+
+class GrilleSpatiale:
+    """Table de hachage spatiale de rectangles en coordonnées d'écran.
+
+    L'écran est découpé en cellules carrées ; chaque rectangle est enregistré
+    dans toutes les cellules qu'il recouvre, de sorte que la recherche de
+    chevauchements ne parcourt que les rectangles voisins.
+    """
+
+    def __init__(self, taille_cellule: int = 64):
+        """Initialise une grille vide.
+
+        Args:
+            taille_cellule (int): Côté d'une cellule en pixels
+        """
+        self.taille_cellule = taille_cellule
+        self._cellules: Dict[Tuple[int, int], List[pygame.Rect]] = {}
+
+    def _cellules_couvertes(self, rect: pygame.Rect):
+        """Itère sur les indices des cellules recouvertes par un rectangle.
+
+        Args:
+            rect (pygame.Rect): Rectangle en pixels
+        """
+        c = self.taille_cellule
+        for cx in range(rect.left // c, (rect.right - 1) // c + 1):
+            for cy in range(rect.top // c, (rect.bottom - 1) // c + 1):
+                yield (cx, cy)
+
+    def est_libre(self, rect: pygame.Rect) -> bool:
+        """Vérifie qu'un rectangle ne chevauche aucun rectangle déjà placé.
+
+        Args:
+            rect (pygame.Rect): Rectangle en pixels
+
+        Returns:
+            bool: True si aucun chevauchement n'est trouvé
+        """
+        for cle in self._cellules_couvertes(rect):
+            for autre in self._cellules.get(cle, ()):
+                if rect.colliderect(autre):
+                    return False
+        return True
+
+    def inserer_si_libre(self, rect: pygame.Rect) -> bool:
+        """Place un rectangle s'il ne chevauche aucun rectangle déjà placé.
+
+        Args:
+            rect (pygame.Rect): Rectangle en pixels
+
+        Returns:
+            bool: True si le rectangle a été placé
+        """
+        if not self.est_libre(rect):
+            return False
+        for cle in self._cellules_couvertes(rect):
+            self._cellules.setdefault(cle, []).append(rect)
+        return True
+
+    def vider(self) -> None:
+        """Retire tous les rectangles de la grille."""
+        self._cellules.clear()
@@ -0,0 +1,189 @@
+import os
+import json
+import time
+import bisect
+from typing import Callable, Dict, List, Optional, Sequence
+
+
+# Bornes par défaut des histogrammes de durée, en secondes (1 µs à 10 s)
+BORNES_DUREES = tuple(m * 10.0 ** e for e in range(-6, 1) for m in (1.0, 2.5, 5.0)) + (10.0,)
+
+
+class Histogramme:
+    """Histogramme cumulatif à bornes fixes, au format des histogrammes Prometheus."""
+
+    def __init__(self, bornes: Sequence[float] = BORNES_DUREES):
+        """Initialise un histogramme vide.
+
+        Args:
+            bornes (Sequence[float]): Bornes supérieures croissantes des classes
+        """
+        self.bornes = tuple(bornes)
+        self.comptes = [0] * (len(self.bornes) + 1)  # Dernière classe : au-delà de la dernière borne
+        self.somme = 0.0
+        self.nombre = 0
+
+    def observer(self, valeur: float) -> None:
+        """Ajoute une observation.
+
+        Args:
+            valeur (float): Valeur observée
+        """
+        self.comptes[bisect.bisect_left(self.bornes, valeur)] += 1
+        self.somme += valeur
+        self.nombre += 1
+
+    def comptes_cumules(self) -> List[int]:
+        """Retourne le nombre d'observations inférieures ou égales à chaque borne.
+
+        Returns:
+            List[int]: Comptes cumulés, le dernier correspondant à +Inf
+        """
+        cumules = []
+        total = 0
+        for compte in self.comptes:
+            total += compte
+            cumules.append(total)
+        return cumules
+
+
+class Instrumentation:
+    """Compteurs, histogrammes et rappels d'une simulation.
+
+    Une simulation sans instrumentation (attribut instrumentation à None) ne
+    paie qu'un test par pas. Une fois attachée, chaque pas met à jour les
+    compteurs de pas, d'évaluations de forces et d'interactions entre paires,
+    les histogrammes de durée du pas et du calcul des forces, puis appelle les
+    rappels enregistrés.
+    """
+
+    def __init__(self):
+        """Initialise des compteurs nuls et aucun rappel."""
+        self.compteurs: Dict[str, int] = {'pas': 0, 'evaluations_forces': 0, 'interactions_paires': 0}
+        self.histogrammes: Dict[str, Histogramme] = {'duree_pas': Histogramme(), 'duree_forces': Histogramme()}
+        self.jauges: Dict[str, float] = {'temps_simule': 0.0, 'nb_corps': 0}
+        self.rappels: List[Callable] = []
+
+    def ajouter_rappel(self, rappel: Callable) -> None:
+        """Enregistre une fonction appelée après chaque pas avec la simulation en argument.
+
+        Args:
+            rappel (Callable): Fonction rappel(simulation)
+        """
+        self.rappels.append(rappel)
+
+    def retirer_rappel(self, rappel: Callable) -> None:
+        """Retire un rappel enregistré.
+
+        Args:
+            rappel (Callable): Fonction à retirer
+        """
+        self.rappels.remove(rappel)
+
+    def apres_pas(self, simulation, duree_pas: float, duree_forces: float, nb_corps: int) -> None:
+        """Enregistre un pas de simulation et appelle les rappels.
+
+        Args:
+            simulation (Simulation): Simulation instrumentée
+            duree_pas (float): Durée du pas en secondes
+            duree_forces (float): Durée du calcul des forces en secondes
+            nb_corps (int): Nombre de corps simulés
+        """
+        compteurs = self.compteurs
+        compteurs['pas'] += 1
+        compteurs['evaluations_forces'] += nb_corps
+        compteurs['interactions_paires'] += nb_corps * (nb_corps - 1)
+        self.histogrammes['duree_pas'].observer(duree_pas)
+        self.histogrammes['duree_forces'].observer(duree_forces)
+        self.jauges['temps_simule'] = simulation.temps
+        self.jauges['nb_corps'] = nb_corps
+        for rappel in self.rappels:
+            rappel(simulation)
+
+    def instantane(self) -> Dict:
+        """Retourne l'état courant des métriques sous forme sérialisable.
+
+        Returns:
+            Dict: Compteurs, jauges et histogrammes (bornes, comptes cumulés, somme, nombre)
+        """
+        return {
+            'compteurs': dict(self.compteurs),
+            'jauges': dict(self.jauges),
+            'histogrammes': {
+                nom: {'bornes': list(h.bornes), 'comptes_cumules': h.comptes_cumules(),
+                      'somme': h.somme, 'nombre': h.nombre}
+                for nom, h in self.histogrammes.items()
+            },
+        }
+
+    def format_prometheus(self, prefixe: str = 'gravity') -> str:
+        """Formate les métriques au format texte de Prometheus.
+
+        Args:
+            prefixe (str): Préfixe des noms de métriques
+
+        Returns:
+            str: Contenu du fichier de métriques
+        """
+        lignes = []
+        for nom, valeur in self.compteurs.items():
+            lignes += [f"# TYPE {prefixe}_{nom}_total counter", f"{prefixe}_{nom}_total {valeur}"]
+        for nom, valeur in self.jauges.items():
+            lignes += [f"# TYPE {prefixe}_{nom} gauge", f"{prefixe}_{nom} {float(valeur)!r}"]
+        for nom, h in self.histogrammes.items():
+            metrique = f"{prefixe}_{nom}_secondes"
+            lignes.append(f"# TYPE {metrique} histogram")
+            for borne, compte in zip(list(h.bornes) + ['+Inf'], h.comptes_cumules()):
+                le = borne if borne == '+Inf' else repr(float(borne))
+                lignes.append(f'{metrique}_bucket{{le="{le}"}} {compte}')
+            lignes += [f"{metrique}_sum {h.somme!r}", f"{metrique}_count {h.nombre}"]
+        return "\n".join(lignes) + "\n"
+
+
+class ExportateurMetriques:
+    """Export périodique des métriques d'une instrumentation.
+
+    S'enregistre comme rappel : après chaque pas, il vérifie si la période est
+    écoulée, puis réécrit le fichier Prometheus (remplacement atomique, lisible
+    à tout moment par un collecteur) et ajoute une ligne au flux JSON lines.
+    """
+
+    def __init__(self, instrumentation: Instrumentation, prometheus: Optional[str] = None,
+                 jsonl: Optional[str] = None, periode: float = 10.0):
+        """Initialise l'exportateur et l'enregistre auprès de l'instrumentation.
+
+        Args:
+            instrumentation (Instrumentation): Métriques à exporter
+            prometheus (Optional[str]): Chemin du fichier au format texte Prometheus
+            jsonl (Optional[str]): Chemin du flux JSON lines, complété à chaque export
+            periode (float): Intervalle minimal entre deux exports, en secondes
+        """
+        self.instrumentation = instrumentation
+        self.prometheus = prometheus
+        self.jsonl = jsonl
+        self.periode = periode
+        self._dernier_export = None
+        instrumentation.ajouter_rappel(self)
+
+    def __call__(self, simulation) -> None:
+        """Exporte les métriques si la période est écoulée.
+
+        Args:
+            simulation (Simulation): Simulation instrumentée
+        """
+        maintenant = time.monotonic()
+        if self._dernier_export is None or maintenant - self._dernier_export >= self.periode:
+            self.exporter()
+
+    def exporter(self) -> None:
+        """Exporte immédiatement les métriques."""
+        self._dernier_export = time.monotonic()
+        if self.prometheus:
+            temporaire = self.prometheus + '.tmp'
+            with open(temporaire, 'w', encoding='utf-8') as f:
+                f.write(self.instrumentation.format_prometheus())
+            os.replace(temporaire, self.prometheus)
+        if self.jsonl:
+            ligne = {'horodatage': time.time(), **self.instrumentation.instantane()}
+            with open(self.jsonl, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(ligne) + "\n")
@@ -9,11 +9,36 @@ import os
 import sys
 import time
 import argparse
-import pygame
 import json
 from src.modele import SystemeSolaire
 from src.simulation import Simulation
-from src.visualisation import Visualisation
+from src.diagnostics import Diagnostics, DeriveExcessive
+
+# Classe de la fenêtre, importée à sa première ouverture : les modes sans
+# affichage et l'export ne chargent pas pygame au démarrage
+Visualisation = None
+
+
+def classe_visualisation():
+    """Importe la visualisation au premier appel.
+
+    Returns:
+        type: Classe Visualisation (ou son remplaçant, s'il a été substitué)
+    """
+    global Visualisation
+    if Visualisation is None:
+        from src.visualisation import Visualisation
+    return Visualisation
+
+
+def arreter_profilage(profilage) -> None:
+    """Arrête une session de profilage et indique les fichiers écrits.
+
+    Args:
+        profilage (SessionProfilage): Session à arrêter
+    """
+    for fichier in profilage.arreter():
+        print(f"Profil écrit dans {fichier}")
 
 
 def main():
@@ -22,11 +47,43 @@ def main():
     parser.add_argument('--dt', type=float, default=21600.0, help='Pas de temps en secondes (par défaut 6 heures)')
     parser.add_argument('--fichier', type=str, default="data/planets.json", help='Fichier de données JSON')
     parser.add_argument('--randomSpeedRatio', type=float, default=0.1, help='Variation aléatoire de la vitesse en pourcentage (0.1 = ±10%)')
+    parser.add_argument('--graine', type=int, default=None, help='Graine du tirage aléatoire des orbites au chargement')
+    parser.add_argument('--images-par-pas', type=int, default=1, help="Nombre d'images affichées par pas de simulation, interpolées entre deux pas (par défaut 1)")
+    parser.add_argument('--profil-csv', type=str, metavar='FICHIER', help="Écrit à la fermeture la durée de chaque phase de chaque image dans ce fichier CSV")
+    parser.add_argument('--export', type=str, metavar='DOSSIER', help="Rend les images hors écran dans ce dossier au lieu d'ouvrir la fenêtre")
+    parser.add_argument('--images', type=int, default=300, help="Nombre d'images à exporter (par défaut 300)")
+    parser.add_argument('--jours-par-image', type=float, default=1.0, help='Durée simulée entre deux images exportées, en jours')
+    parser.add_argument('--video', type=str, metavar='FICHIER', help="Nom de la vidéo encodée avec ffmpeg dans le dossier d'export")
+    parser.add_argument('--processus', type=int, default=None, help='Nombre de processus de rendu pour l\'export (par défaut, un par cœur)')
+    parser.add_argument('--sans-affichage', action='store_true', help="Simule sans ouvrir de fenêtre (arrêt après --jours, ou par Ctrl+C)")
+    parser.add_argument('--jours', type=float, default=None, help='Durée simulée en jours en mode sans affichage')
+    parser.add_argument('--metriques-prometheus', type=str, metavar='FICHIER', help="Réécrit périodiquement les métriques de la simulation dans ce fichier au format texte Prometheus")
+    parser.add_argument('--metriques-jsonl', type=str, metavar='FICHIER', help="Ajoute périodiquement les métriques de la simulation à ce fichier JSON lines")
+    parser.add_argument('--periode-metriques', type=float, default=10.0, help='Intervalle entre deux exports de métriques, en secondes (par défaut 10)')
+    parser.add_argument('--profil', action='store_true', help="Profile le temps de calcul (cProfile et piles échantillonnées) puis quitte")
+    parser.add_argument('--profil-memoire', action='store_true', help="Profile les allocations mémoire (tracemalloc) puis quitte")
+    parser.add_argument('--fenetre-profil', type=int, default=300, help="Nombre d'images (de pas sans affichage) profilées (par défaut 300)")
+    parser.add_argument('--fenetre-profil-jours', type=float, default=None, help="Durée simulée profilée en jours, prioritaire sur --fenetre-profil")
+    parser.add_argument('--dossier-profil', type=str, default='profil', help="Dossier des rapports de profilage (par défaut profil)")
+    parser.add_argument('--trace', type=str, metavar='FICHIER', help="Écrit à la fermeture la chronologie des pas et des images au format Chrome trace-event (Perfetto)")
+    parser.add_argument('--capacite-trace', type=int, default=1 << 20, help="Nombre maximal d'intervalles conservés par la trace, les plus anciens étant remplacés (par défaut 1048576)")
+    parser.add_argument('--diagnostics', type=int, metavar='PAS', default=None, help="Mesure l'énergie, la quantité de mouvement et le moment cinétique tous les PAS pas de simulation")
+    parser.add_argument('--seuil-derive', type=float, default=None, help="Dérive relative de l'énergie ou du moment cinétique signalée (active les diagnostics)")
+    parser.add_argument('--arret-derive', action='store_true', help="Arrête la simulation (pause en mode fenêtré) lorsque la dérive dépasse --seuil-derive")
+    parser.add_argument('--journal-diagnostics', type=str, metavar='FICHIER', help="Ajoute chaque mesure des diagnostics à ce fichier JSON lines")
+    parser.add_argument('--collisions', action='store_true', help="Détecte les collisions et fusionne les corps qui se touchent")
+    parser.add_argument('--serveur', type=int, metavar='PORT', help="Diffuse l'état de la simulation aux clients locaux sur ce port TCP (voir src/client.py)")
+    parser.add_argument('--serveur-unix', type=str, metavar='CHEMIN', help="Diffuse l'état de la simulation sur cette socket Unix")
+    parser.add_argument('--hote-serveur', type=str, default='127.0.0.1', help="Adresse d'écoute du serveur (par défaut 127.0.0.1)")
+    parser.add_argument('--journal-collisions', type=str, metavar='FICHIER', help="Ajoute chaque fusion à ce fichier JSON lines (active les collisions)")
     args = parser.parse_args()
 
     # Charge les données
     try:
-        systeme = SystemeSolaire.depuis_json(args.fichier, randomSpeedRatio=args.randomSpeedRatio)
+        if args.fichier.endswith('.npz'):
+            systeme = SystemeSolaire.depuis_npz(args.fichier, randomSpeedRatio=args.randomSpeedRatio, graine=args.graine)
+        else:
+            systeme = SystemeSolaire.depuis_json(args.fichier, randomSpeedRatio=args.randomSpeedRatio, graine=args.graine)
     except FileNotFoundError:
         raise FileNotFoundError(f"Le fichier {args.fichier} n'existe pas.")
     except json.JSONDecodeError:
@@ -38,24 +95,178 @@ def main():
     if not systeme.planetes:
         raise ValueError("Aucune planète trouvée dans le système.")
 
-    # Crée la simulation et la visualisation
+    # Crée la simulation
     simulation = Simulation(systeme, args.dt)
-    visualisation = Visualisation()  # Utilise les dimensions par défaut
+
+    # Métriques de la simulation
+    metriques = None
+    if args.metriques_prometheus or args.metriques_jsonl:
+        from src.instrumentation import Instrumentation, ExportateurMetriques
+        simulation.instrumentation = Instrumentation()
+        metriques = ExportateurMetriques(simulation.instrumentation, prometheus=args.metriques_prometheus,
+                                         jsonl=args.metriques_jsonl, periode=args.periode_metriques)
+
+    # Diagnostics des quantités conservées
+    diagnostics = None
+    if args.diagnostics or args.seuil_derive is not None or args.journal_diagnostics:
+        diagnostics = Diagnostics(periode=args.diagnostics or 10, seuil=args.seuil_derive,
+                                  arreter=args.arret_derive, journal=args.journal_diagnostics)
+        simulation.diagnostics = diagnostics
+
+    # Collisions et fusions des corps
+    collisions = None
+    if args.collisions or args.journal_collisions:
+        from src.collisions import Collisions
+        collisions = Collisions(journal=args.journal_collisions)
+        simulation.collisions = collisions
+
+    # Diffusion de l'état aux clients locaux, qui peuvent aussi piloter la simulation
+    serveur = None
+    if args.serveur is not None or args.serveur_unix:
+        from src.serveur import ServeurInstantanes
+        serveur = ServeurInstantanes(args.hote_serveur, args.serveur or 0, args.serveur_unix)
+        serveur.demarrer()
+        print(f"Serveur d'instantanés en écoute sur {serveur.adresse}")
+
+    # Chronologie des pas de simulation, des images et des événements
+    traceur = None
+    if args.trace:
+        from src.traceur import Traceur
+        traceur = Traceur(args.capacite_trace)
+        simulation.traceur = traceur
+
+    # Profilage d'une fenêtre bornée, après laquelle le programme s'arrête
+    profilage = None
+    if args.profil or args.profil_memoire:
+        from src.profilage import SessionProfilage
+        if args.fenetre_profil_jours is not None:
+            profilage = SessionProfilage(args.dossier_profil, cpu=args.profil, memoire=args.profil_memoire,
+                                         nb_iterations=None, duree=args.fenetre_profil_jours * 24 * 3600)
+        else:
+            profilage = SessionProfilage(args.dossier_profil, cpu=args.profil, memoire=args.profil_memoire,
+                                         nb_iterations=args.fenetre_profil)
+
+    # Simulation sans fenêtre, pour les longues exécutions surveillées
+    if args.sans_affichage:
+        fin = None if args.jours is None else args.jours * 24 * 3600
+        if profilage:
+            profilage.demarrer()
+        try:
+            while fin is None or simulation.temps < fin - 1e-9 * args.dt:
+                if serveur is None:
+                    simulation.simuler(args.dt)
+                else:
+                    serveur.publier(simulation)
+                    if serveur.en_pause:
+                        time.sleep(0.05)
+                        continue
+                    simulation.simuler(serveur.duree_a_simuler(args.dt))
+                if profilage and profilage.avancer(simulation.temps):
+                    break
+        except KeyboardInterrupt:
+            pass
+        except DeriveExcessive as e:
+            print(f"Simulation arrêtée : {e}.")
+        finally:
+            if profilage:
+                arreter_profilage(profilage)
+            if metriques:
+                metriques.exporter()
+            if traceur:
+                traceur.exporter_chrome(args.trace)
+            if serveur:
+                serveur.arreter()
+        print(f"Simulation terminée : {simulation.temps / (24 * 3600):.1f} jours simulés.")
+        if collisions:
+            print(f"{collisions.nb_fusions} fusion(s) de corps en collision.")
+        if systeme.config_forces and simulation.modele_forces.nb_evaluations:
+            print("Durée moyenne des termes de force :")
+            for ligne in simulation.modele_forces.lignes_rapport():
+                print(f"  {ligne}")
+        return
+
+    # Export hors écran : les états sont rendus au fur et à mesure de la simulation
+    if args.export:
+        from src.export import ExportateurImages, generer_etats
+        exportateur = ExportateurImages(nb_processus=args.processus)
+        etats = generer_etats(simulation, args.images, args.jours_par_image * 24 * 3600)
+        try:
+            fichiers = exportateur.exporter(etats, args.export, video=args.video)
+        except DeriveExcessive as e:
+            print(f"Export interrompu : {e}.")
+            return
+        print(f"Export terminé : {len(fichiers)} fichier(s) écrit(s) dans {args.export}.")
+        return
+
+    # Crée la visualisation
+    visualisation = classe_visualisation()()  # Utilise les dimensions par défaut
+    visualisation.diagnostics = diagnostics
+    if traceur:
+        visualisation.activer_trace(traceur)
+
+    # Interpolation de l'affichage entre deux pas de simulation
+    interpolation = args.images_par_pas > 1
+    if interpolation:
+        simulation.activer_interpolation()
+    temps_affiche = simulation.temps
 
     # Boucle principale
+    if profilage:
+        profilage.demarrer()
     en_cours = True
     while en_cours:
+        # Diffusion de l'état et commandes des clients (pause, accélération, sauvegarde)
+        if serveur:
+            serveur.publier(simulation)
+
         # Met à jour la simulation seulement si on n'est pas en pause
-        if not visualisation.en_pause:
-            simulation.simuler(args.dt)  # Utilise le pas de temps spécifié
+        if not visualisation.en_pause and not (serveur and serveur.en_pause):
+            debut_simulation = time.perf_counter()
+            nb_pas = 0
+            try:
+                if interpolation:
+                    # L'affichage avance d'une fraction de pas ; la physique le précède d'au plus un pas
+                    temps_affiche += args.dt / args.images_par_pas * (serveur.acceleration if serveur else 1.0)
+                    while simulation.temps < temps_affiche - 1e-9 * args.dt:
+                        simulation.simuler(args.dt)
+                        nb_pas += 1
+                else:
+                    duree = serveur.duree_a_simuler(args.dt) if serveur else args.dt
+                    simulation.simuler(duree)  # Utilise le pas de temps spécifié
+                    nb_pas = round(duree / args.dt)
+            except DeriveExcessive as e:
+                # La simulation est suspendue, l'état reste affiché
+                print(f"Simulation suspendue : {e}.")
+                visualisation.en_pause = True
+            visualisation.profileur.enregistrer_simulation(time.perf_counter() - debut_simulation, nb_pas)
 
         # Met à jour la visualisation
-        visualisation.mettre_a_jour_temps(simulation.temps / (24 * 3600))  # Conversion en jours
-        visualisation.afficher(systeme)
+        if interpolation:
+            visualisation.mettre_a_jour_temps(temps_affiche / (24 * 3600))  # Conversion en jours
+            visualisation.afficher(systeme, simulation.positions_interpolees(temps_affiche))
+        else:
+            visualisation.mettre_a_jour_temps(simulation.temps / (24 * 3600))  # Conversion en jours
+            visualisation.afficher(systeme)
 
         # Gère les événements
         en_cours = visualisation.gerer_evenements()
 
+        if profilage and profilage.avancer(simulation.temps):
+            en_cours = False
+
+    if profilage:
+        arreter_profilage(profilage)
+
+    # Durées des images pour une comparaison hors ligne
+    if args.profil_csv:
+        visualisation.profileur.exporter_csv(args.profil_csv)
+    if metriques:
+        metriques.exporter()
+    if traceur:
+        traceur.exporter_chrome(args.trace)
+    if serveur:
+        serveur.arreter()
+
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
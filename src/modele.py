@@ -1,29 +1,143 @@
+import gc
 import json
+import operator
 import numpy as np
 import uuid
-from dataclasses import dataclass, field
-from typing import List, Tuple, Dict, Any, Optional
+from typing import Iterable, List, Tuple, Dict, Any, Optional
+from src.catalogue import lire_json, charger_npz, perturber_orbites
 
 
-@dataclass
 class CorpsCeleste:
-    """Classe représentant un corps céleste (étoile ou planète)."""
-    
-    nom: str
-    masse: float
-    rayon: float
-    position: np.ndarray
-    vitesse: np.ndarray
-    couleur: Tuple[int, int, int]
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
-    
-    def __post_init__(self):
-        """Convertit les listes en tableaux numpy si nécessaire."""
-        if isinstance(self.position, list):
-            self.position = np.array(self.position, dtype=float)
-        if isinstance(self.vitesse, list):
-            self.vitesse = np.array(self.vitesse, dtype=float)
-
+    """Classe représentant un corps céleste (étoile ou planète).
+    
+    Un corps rattaché à un SystemeSolaire ne stocke pas lui-même sa position,
+    sa vitesse ni sa masse : il désigne par son indice une ligne des tableaux
+    d'état du système (position et vitesse sont des vues sur ces lignes ;
+    masse et rayon y sont recopiés).
+    L'identifiant UUID, qui ne sert qu'à désigner le corps hors du programme,
+    n'est tiré qu'à sa première lecture ; l'égalité et le hachage des corps
+    qui n'en ont pas encore se réduisent à leur identité.
+    """
+    
+    __slots__ = ('nom', '_rayon', 'couleur', '_masse', '_position', '_vitesse', '_id', 'systeme', 'indice')
+    
+    def __init__(self, nom: str, masse: float, rayon: float, position: np.ndarray, vitesse: np.ndarray,
+                 couleur: Tuple[int, int, int], id: Optional[str] = None):
+        """Initialise un corps céleste indépendant de tout système.
+        
+        Args:
+            nom (str): Nom du corps
+            masse (float): Masse en kg
+            rayon (float): Rayon en mètres
+            position (np.ndarray): Position en mètres (les listes sont converties)
+            vitesse (np.ndarray): Vitesse en m/s (les listes sont converties)
+            couleur (Tuple[int, int, int]): Couleur RVB
+            id (Optional[str]): Identifiant externe, tiré au hasard à la première lecture si absent
+        """
+        self.nom = nom
+        self._rayon = rayon
+        self.couleur = couleur
+        self._masse = masse
+        self._position = np.asarray(position, dtype=float)
+        self._vitesse = np.asarray(vitesse, dtype=float)
+        self._id = id
+        self.systeme = None
+        self.indice = -1
+    
+    @property
+    def position(self) -> np.ndarray:
+        """np.ndarray: Position en mètres (vue sur la ligne du système si le corps y est rattaché)."""
+        position = self._position
+        if position is None:
+            position = self._position = self.systeme.positions[self.indice]
+        return position
+    
+    @position.setter
+    def position(self, valeur: np.ndarray) -> None:
+        if self.systeme is None:
+            self._position = np.asarray(valeur, dtype=float)
+        else:
+            self.position[...] = valeur
+    
+    @property
+    def vitesse(self) -> np.ndarray:
+        """np.ndarray: Vitesse en m/s (vue sur la ligne du système si le corps y est rattaché)."""
+        vitesse = self._vitesse
+        if vitesse is None:
+            vitesse = self._vitesse = self.systeme.vitesses[self.indice]
+        return vitesse
+    
+    @vitesse.setter
+    def vitesse(self, valeur: np.ndarray) -> None:
+        if self.systeme is None:
+            self._vitesse = np.asarray(valeur, dtype=float)
+        else:
+            self.vitesse[...] = valeur
+    
+    @property
+    def masse(self) -> float:
+        """float: Masse en kg, recopiée dans le tableau des masses du système."""
+        return self._masse
+    
+    @masse.setter
+    def masse(self, valeur: float) -> None:
+        self._masse = valeur
+        if self.systeme is not None:
+            self.systeme.masses[self.indice] = valeur
+    
+    @property
+    def rayon(self) -> float:
+        """float: Rayon en mètres, recopié dans le tableau des rayons du système."""
+        return self._rayon
+    
+    @rayon.setter
+    def rayon(self, valeur: float) -> None:
+        self._rayon = valeur
+        if self.systeme is not None:
+            self.systeme.rayons[self.indice] = valeur
+    
+    @property
+    def id(self) -> str:
+        """str: Identifiant externe (UUID version 4), tiré à la première lecture."""
+        if self._id is None:
+            self._id = str(uuid.uuid4())
+        return self._id
+    
+    def rattacher(self, systeme: 'SystemeSolaire', indice: int) -> None:
+        """Fait désigner au corps une ligne des tableaux d'état d'un système.
+        
+        La ligne doit déjà contenir l'état du corps. Le système que le corps
+        quitte, le cas échéant, devra être réindexé.
+        
+        Args:
+            systeme (SystemeSolaire): Système propriétaire des tableaux
+            indice (int): Ligne du corps dans les tableaux
+        """
+        ancien = self.systeme
+        if ancien is not None and ancien is not systeme:
+            ancien.index_valide = False
+        self.systeme = systeme
+        self.indice = indice
+        self._position = None
+        self._vitesse = None
+    
+    def detacher(self) -> None:
+        """Recopie l'état du corps hors des tableaux de son système."""
+        if self.systeme is not None:
+            self._position = self.position.copy()
+            self._vitesse = self.vitesse.copy()
+            self.systeme = None
+            self.indice = -1
+    
+    def __repr__(self) -> str:
+        """Représentation lisible du corps.
+        
+        Returns:
+            str: Nom, masse, position et vitesse du corps
+        """
+        return (f"CorpsCeleste(nom={self.nom!r}, masse={self.masse!r}, rayon={self.rayon!r}, "
+                f"position={self.position!r}, vitesse={self.vitesse!r}, couleur={self.couleur!r})")
+    
     def __eq__(self, autre: object) -> bool:
         """Vérifie si deux corps célestes sont égaux.
         
@@ -33,9 +147,12 @@ class CorpsCeleste:
         Returns:
             bool: True si les corps sont égaux, False sinon
         """
+        if autre is self:
+            return True
         if not isinstance(autre, CorpsCeleste):
             return False
-        return self.id == autre.id
+        # Un identifiant pas encore tiré ne peut être égal à aucun autre
+        return self._id is not None and self._id == autre._id
     
     def __hash__(self) -> int:
         """Calcule le hash du corps céleste.
@@ -59,25 +176,117 @@ class CorpsCeleste:
 
 
 class SystemeSolaire:
-    """Classe représentant le système solaire avec ses étoiles et planètes."""
+    """Classe représentant le système solaire avec ses étoiles et planètes.
+    
+    L'état des corps est rangé dans des tableaux contigus, une ligne par
+    corps dans l'ordre de obtenir_tous_corps() : positions (N, 3), vitesses
+    (N, 3), masses (N,) et rayons (N,). Chaque corps connaît l'indice de sa
+    ligne. Les tableaux sont construits à la demande par synchroniser(), après
+    toute modification des listes etoiles et planetes. En cours de simulation,
+    ajouter_corps() et retirer_corps() les modifient sans réindexation : ce
+    sont des vues sur des tampons dont la capacité double lorsqu'elle est
+    atteinte, et un corps retiré est remplacé par le dernier corps de son
+    groupe. L'attribut version_lignes change à chaque modification des lignes.
+    """
     
     # Constante gravitationnelle en N⋅m²/kg²
     G = 6.67430e-11
     
-    def __init__(self, etoiles: List[CorpsCeleste] = None, planetes: List[CorpsCeleste] = None, randomSpeedRatio: float = 0.1):
+    def __init__(self, etoiles: List[CorpsCeleste] = None, planetes: List[CorpsCeleste] = None, randomSpeedRatio: float = 0.1,
+                 graine: Optional[int] = None):
         """Initialise le système solaire avec des étoiles et des planètes.
         
         Args:
             etoiles (List[CorpsCeleste], optional): Liste des étoiles du système.
             planetes (List[CorpsCeleste], optional): Liste des planètes du système.
             randomSpeedRatio (float, optional): Variation aléatoire de la vitesse en pourcentage (0.1 = ±10%).
+            graine (int, optional): Graine du générateur aléatoire des positions et vitesses chargées.
         """
         self.etoiles = etoiles if etoiles is not None else []
         self.planetes = planetes if planetes is not None else []
         self.randomSpeedRatio = randomSpeedRatio
+        self.generateur = np.random.default_rng(graine)
+        # Section "forces" du dernier scénario qui en contenait une (voir src/forces.py)
+        self.config_forces: Optional[List[Dict[str, Any]]] = None
+        
+        # Tableaux d'état et corps qui y sont rattachés, dans l'ordre des lignes
+        self.positions = np.zeros((0, 3))
+        self.vitesses = np.zeros((0, 3))
+        self.masses = np.zeros(0)
+        self.rayons = np.zeros(0)
+        self.corps_indexes: List[CorpsCeleste] = []
+        self.index_valide = True
+        self.version_lignes = 0
+        # Tableaux complets, dont les attributs d'état sont des vues
+        self._tampons = {'positions': self.positions, 'vitesses': self.vitesses, 'masses': self.masses,
+                         'rayons': self.rayons}
+        self._par_id: Optional[Dict[str, CorpsCeleste]] = None  # Construite à la première recherche
+    
+    def indexer(self, positions: Optional[np.ndarray] = None, vitesses: Optional[np.ndarray] = None,
+                masses: Optional[np.ndarray] = None, rayons: Optional[np.ndarray] = None) -> None:
+        """Range l'état de tous les corps dans de nouveaux tableaux et y rattache les corps.
+        
+        Les corps retirés du système depuis la dernière indexation en sont détachés
+        avec leur état courant.
+        
+        Args:
+            positions (Optional[np.ndarray]): Positions (N, 3) déjà rassemblées, dans l'ordre
+                de obtenir_tous_corps() ; lues sur les corps si absentes
+            vitesses (Optional[np.ndarray]): Vitesses (N, 3), idem
+            masses (Optional[np.ndarray]): Masses (N,), idem
+            rayons (Optional[np.ndarray]): Rayons (N,), idem
+        """
+        corps_liste = self.obtenir_tous_corps()
+        if positions is None:
+            positions = np.array([corps.position for corps in corps_liste], dtype=float).reshape(-1, 3)
+            vitesses = np.array([corps.vitesse for corps in corps_liste], dtype=float).reshape(-1, 3)
+            masses = np.array([corps.masse for corps in corps_liste], dtype=float)
+            rayons = np.array([corps.rayon for corps in corps_liste], dtype=float)
+        
+        if self.corps_indexes:
+            presents = set(map(id, corps_liste))
+            for corps in self.corps_indexes:
+                if corps.systeme is self and id(corps) not in presents:
+                    corps.detacher()
+        
+        self.positions, self.vitesses, self.masses, self.rayons = positions, vitesses, masses, rayons
+        self._tampons = {'positions': positions, 'vitesses': vitesses, 'masses': masses, 'rayons': rayons}
+        rattacher = CorpsCeleste.rattacher
+        for indice, corps in enumerate(corps_liste):
+            rattacher(corps, self, indice)
+        self.corps_indexes = corps_liste
+        self.index_valide = True
+        self.version_lignes += 1
+        self._par_id = None
+    
+    def synchroniser(self) -> List[CorpsCeleste]:
+        """Réindexe le système si ses listes de corps ont été modifiées depuis la dernière indexation.
+        
+        Le contrôle parcourt les corps une fois, sans recopier leur état.
+        
+        Returns:
+            List[CorpsCeleste]: Tous les corps, dans l'ordre des lignes des tableaux
+        """
+        corps_liste = self.obtenir_tous_corps()
+        if not self.est_indexe(corps_liste):
+            self.indexer()
+        return self.corps_indexes
+    
+    def est_indexe(self, corps_liste: List[CorpsCeleste]) -> bool:
+        """Vérifie qu'une liste de corps est exactement celle des lignes des tableaux d'état.
+        
+        Args:
+            corps_liste (List[CorpsCeleste]): Corps dans l'ordre supposé des lignes
+            
+        Returns:
+            bool: True si le i-ème corps de la liste est celui de la ligne i
+        """
+        indexes = self.corps_indexes
+        return (self.index_valide and len(corps_liste) == len(indexes) and
+                all(map(operator.is_, corps_liste, indexes)))
     
     @classmethod
-    def depuis_json(cls, fichier_json: str, randomSpeedRatio: float = 0.1) -> 'SystemeSolaire':
+    def depuis_json(cls, fichier_json: str, randomSpeedRatio: float = 0.1, graine: Optional[int] = None) -> 'SystemeSolaire':
         """Crée un système solaire à partir d'un fichier JSON.
         
         Cette méthode est une factory qui charge les données depuis un fichier JSON
@@ -86,75 +295,43 @@ class SystemeSolaire:
         Args:
             fichier_json (str): Chemin vers le fichier JSON contenant les données.
             randomSpeedRatio (float, optional): Variation aléatoire de la vitesse en pourcentage (0.1 = ±10%).
+            graine (int, optional): Graine du tirage aléatoire des orbites.
             
         Returns:
             SystemeSolaire: Nouvelle instance du système solaire.
         """
-        systeme = cls(randomSpeedRatio=randomSpeedRatio)
+        systeme = cls(randomSpeedRatio=randomSpeedRatio, graine=graine)
         systeme.charger_donnees(fichier_json)
         return systeme
     
+    @classmethod
+    def depuis_npz(cls, fichier_npz: str, randomSpeedRatio: float = 0.1, graine: Optional[int] = None) -> 'SystemeSolaire':
+        """Crée un système solaire à partir d'un fichier binaire en colonnes (.npz).
+        
+        Args:
+            fichier_npz (str): Chemin vers le fichier .npz écrit par catalogue.enregistrer_npz.
+            randomSpeedRatio (float, optional): Variation aléatoire de la vitesse en pourcentage (0.1 = ±10%).
+            graine (int, optional): Graine du tirage aléatoire des orbites.
+            
+        Returns:
+            SystemeSolaire: Nouvelle instance du système solaire.
+        """
+        systeme = cls(randomSpeedRatio=randomSpeedRatio, graine=graine)
+        scenario, aleatoire = charger_npz(fichier_npz)
+        systeme.charger_scenario(scenario, aleatoire)
+        return systeme
+    
     def charger_donnees(self, fichier_json: str) -> None:
         """Charge les données des corps célestes depuis un fichier JSON.
         
+        Le fichier est décodé corps par corps, sans être chargé entièrement en mémoire.
+        
         Args:
             fichier_json (str): Chemin vers le fichier JSON contenant les données.
         """
         try:
-            with open(fichier_json, 'r', encoding='utf-8') as f:
-                donnees = json.load(f)
-            
-            # Charger les étoiles
-            for etoile_data in donnees.get('etoiles', []):
-                etoile = CorpsCeleste(
-                    nom=etoile_data['nom'],
-                    masse=etoile_data['masse'],
-                    rayon=etoile_data['rayon'],
-                    position=etoile_data['position'],
-                    vitesse=etoile_data['vitesse'],
-                    couleur=tuple(etoile_data['couleur'])
-                )
-                self.etoiles.append(etoile)
-            
-            # Charger les planètes avec positions aléatoires
-            for planete_data in donnees.get('planetes', []):
-                # Calcul de la distance au soleil à partir de la position initiale
-                position_initiale = np.array(planete_data['position'], dtype=float)
-                vitesse_initiale = np.array(planete_data['vitesse'], dtype=float)
-                distance_soleil = np.linalg.norm(position_initiale)
-                vitesse_orbitale = np.linalg.norm(vitesse_initiale)
-                
-                # Génération d'un angle aléatoire entre 0 et 2π
-                angle = np.random.uniform(0, 2 * np.pi)
-                
-                # Calcul de la nouvelle position
-                nouvelle_position = np.array([
-                    distance_soleil * np.cos(angle),  # x = r * cos(θ)
-                    distance_soleil * np.sin(angle),  # y = r * sin(θ)
-                    0.0  # z = 0 (plan de l'écliptique)
-                ])
-                
-                # Application d'une variation aléatoire à la vitesse orbitale
-                variation = np.random.uniform(1 - self.randomSpeedRatio, 1 + self.randomSpeedRatio)
-                vitesse_orbitale *= variation
-                
-                # Calcul de la nouvelle vitesse (perpendiculaire à la position)
-                nouvelle_vitesse = np.array([
-                    -vitesse_orbitale * np.sin(angle),  # vx = -v * sin(θ)
-                    vitesse_orbitale * np.cos(angle),   # vy = v * cos(θ)
-                    0.0  # vz = 0
-                ])
-                
-                planete = CorpsCeleste(
-                    nom=planete_data['nom'],
-                    masse=planete_data['masse'],
-                    rayon=planete_data['rayon'],
-                    position=nouvelle_position,
-                    vitesse=nouvelle_vitesse,
-                    couleur=tuple(planete_data['couleur'])
-                )
-                self.planetes.append(planete)
-                
+            scenario, aleatoire = lire_json(fichier_json)
+            self.charger_scenario(scenario, aleatoire)
             print(f"Chargé {len(self.etoiles)} étoiles et {len(self.planetes)} planètes avec succès.")
             
         except FileNotFoundError:
@@ -164,6 +341,241 @@ class SystemeSolaire:
         except Exception as e:
             print(f"Erreur lors du chargement des données: {str(e)}")
     
+    def charger_scenario(self, scenario: Dict[str, np.ndarray], aleatoire: bool = False) -> None:
+        """Ajoute au système les corps d'un scénario en colonnes.
+        
+        Si aleatoire est vrai, chaque planète est placée à un angle aléatoire de
+        son orbite, dans le plan de l'écliptique, et sa vitesse varie d'au plus
+        randomSpeedRatio ; les tirages utilisent le générateur du système.
+        
+        Args:
+            scenario (Dict[str, np.ndarray]): Colonnes noms, masses, rayons, positions,
+                vitesses et couleurs, nombre d'étoiles 'nb_etoiles' placées en tête et,
+                facultativement, section 'forces' conservée dans config_forces
+            aleatoire (bool): Applique le tirage aléatoire aux planètes
+        """
+        nb_etoiles = int(scenario['nb_etoiles'])
+        if scenario.get('forces') is not None:
+            self.config_forces = scenario['forces']
+        positions = np.array(scenario['positions'], dtype=float)
+        vitesses = np.array(scenario['vitesses'], dtype=float)
+        masses = np.array(scenario['masses'], dtype=float)
+        rayons = np.array(scenario['rayons'], dtype=float)
+        if aleatoire:
+            positions[nb_etoiles:], vitesses[nb_etoiles:] = perturber_orbites(
+                positions[nb_etoiles:], vitesses[nb_etoiles:], self.randomSpeedRatio, self.generateur)
+        
+        # Un seul tuple par couleur distincte (RVB codé sur un entier), partagé par les corps de cette couleur
+        couleurs = np.asarray(scenario['couleurs'], dtype=np.int64).reshape(-1, 3)
+        codes, indices_couleurs = np.unique((couleurs[:, 0] << 16) | (couleurs[:, 1] << 8) | couleurs[:, 2],
+                                            return_inverse=True)
+        palette = [(code >> 16, (code >> 8) & 0xFF, code & 0xFF) for code in codes.tolist()]
+        
+        # Le ramasse-miettes cyclique parcourrait à répétition les corps déjà créés
+        ramasse_miettes = gc.isenabled()
+        gc.disable()
+        try:
+            # Les corps sont créés sans état propre : il est recopié en bloc dans les tableaux du système
+            corps = []
+            for nom, masse, rayon, couleur in zip(np.asarray(scenario['noms']).tolist(), masses.tolist(),
+                                                  rayons.tolist(),
+                                                  map(palette.__getitem__, indices_couleurs.ravel().tolist())):
+                nouveau = CorpsCeleste.__new__(CorpsCeleste)
+                nouveau.nom = nom
+                nouveau._rayon = rayon
+                nouveau.couleur = couleur
+                nouveau._masse = masse
+                nouveau._id = None
+                nouveau.systeme = None
+                corps.append(nouveau)
+            
+            # Nouvelles lignes : étoiles après les étoiles existantes, planètes à la fin
+            self.synchroniser()
+            n = len(self.etoiles)
+            
+            def inserer(anciennes, nouvelles):
+                return np.concatenate([anciennes[:n], nouvelles[:nb_etoiles], anciennes[n:], nouvelles[nb_etoiles:]])
+            
+            self.etoiles.extend(corps[:nb_etoiles])
+            self.planetes.extend(corps[nb_etoiles:])
+            self.indexer(inserer(self.positions, positions), inserer(self.vitesses, vitesses),
+                         inserer(self.masses, masses), inserer(self.rayons, rayons))
+        finally:
+            if ramasse_miettes:
+                gc.enable()
+    
+    def ajouter_corps(self, corps: CorpsCeleste, etoile: bool = False) -> None:
+        """Ajoute un corps au système sans le réindexer.
+        
+        L'état du corps est recopié dans une nouvelle ligne des tableaux, dont la
+        capacité double lorsqu'elle est atteinte : le coût moyen d'un ajout ne
+        dépend pas du nombre de corps. Une planète prend la dernière ligne ; une
+        étoile prend la ligne de la première planète, qui passe en dernière
+        position de la liste des planètes.
+        
+        Args:
+            corps (CorpsCeleste): Corps indépendant de tout système
+            etoile (bool): Ajoute le corps aux étoiles plutôt qu'aux planètes
+            
+        Raises:
+            ValueError: Si le corps appartient déjà à un système
+        """
+        if corps.systeme is not None:
+            raise ValueError(f"Le corps {corps.nom} appartient déjà à un système")
+        corps_liste = self._lignes()
+        n = len(corps_liste)
+        self._redimensionner(n + 1)
+        corps_liste.append(corps)
+        ligne = n
+        if etoile and self.planetes:
+            # La première planète libère sa ligne, qui suit celle de la dernière étoile
+            ligne = len(self.etoiles)
+            self._deplacer_ligne(ligne, n)
+            self.planetes.append(self.planetes.pop(0))
+        (self.etoiles if etoile else self.planetes).append(corps)
+        
+        self.positions[ligne] = corps.position
+        self.vitesses[ligne] = corps.vitesse
+        self.masses[ligne] = corps.masse
+        self.rayons[ligne] = corps.rayon
+        corps_liste[ligne] = corps
+        corps.rattacher(self, ligne)
+        self.version_lignes += 1
+        if self._par_id is not None:
+            self._par_id[corps.id] = corps
+    
+    def retirer_corps(self, corps_a_retirer: Iterable[CorpsCeleste]) -> None:
+        """Retire des corps du système sans le réindexer.
+        
+        La ligne d'une planète retirée reçoit la dernière planète ; celle d'une
+        étoile reçoit la dernière étoile, dont la ligne reçoit la dernière
+        planète (qui passe en tête de la liste des planètes). Chaque retrait
+        déplace donc au plus deux lignes, et les tableaux restent des vues sur
+        les mêmes tampons. Les corps retirés sont détachés avec leur état
+        courant ; les corps qui n'appartiennent pas au système sont ignorés.
+        
+        Args:
+            corps_a_retirer (Iterable[CorpsCeleste]): Corps à retirer
+        """
+        corps_liste = self._lignes()
+        retires = {id(corps): corps for corps in corps_a_retirer if corps.systeme is self}
+        if not retires:
+            return
+        for corps in retires.values():
+            ligne = corps.indice
+            corps.detacher()
+            nb_etoiles = len(self.etoiles)
+            derniere = len(corps_liste) - 1
+            if ligne < nb_etoiles:
+                self._deplacer_ligne(nb_etoiles - 1, ligne)
+                self.etoiles[ligne] = self.etoiles[-1]
+                self.etoiles.pop()
+                if derniere >= nb_etoiles:
+                    self._deplacer_ligne(derniere, nb_etoiles - 1)
+                    self.planetes.insert(0, self.planetes.pop())
+            else:
+                self._deplacer_ligne(derniere, ligne)
+                self.planetes[ligne - nb_etoiles] = self.planetes[-1]
+                self.planetes.pop()
+            corps_liste.pop()
+            self._redimensionner(derniere)
+            if self._par_id is not None and corps._id is not None:
+                self._par_id.pop(corps._id, None)
+        self.version_lignes += 1
+    
+    def _lignes(self) -> List[CorpsCeleste]:
+        """Retourne les corps des lignes, en ne réindexant que si leur nombre a changé.
+        
+        Contrairement à synchroniser(), le contrôle ne parcourt pas les corps :
+        ajouts et retraits successifs gardent un coût indépendant du nombre de
+        corps. Une modification directe des listes qui conserve leur longueur
+        doit être suivie d'un appel à synchroniser().
+        
+        Returns:
+            List[CorpsCeleste]: Tous les corps, dans l'ordre des lignes des tableaux
+        """
+        if not self.index_valide or len(self.corps_indexes) != len(self.etoiles) + len(self.planetes):
+            self.indexer()
+        return self.corps_indexes
+    
+    def _redimensionner(self, n: int) -> None:
+        """Fait des tableaux d'état des vues sur les n premières lignes des tampons.
+        
+        Les tampons trop petits sont remplacés par des tampons de capacité au
+        moins double, et les corps rattachés de nouveau pour que leurs vues
+        désignent les nouveaux tampons.
+        
+        Args:
+            n (int): Nombre de lignes
+        """
+        tampons = self._tampons
+        if len(tampons['masses']) < n:
+            capacite = max(n, 2 * len(tampons['masses']), 16)
+            for nom, tampon in tampons.items():
+                agrandi = np.zeros((capacite,) + tampon.shape[1:], dtype=tampon.dtype)
+                lignes = getattr(self, nom)
+                agrandi[:len(lignes)] = lignes
+                tampons[nom] = agrandi
+            for indice, corps in enumerate(self.corps_indexes):
+                if corps.systeme is self:
+                    corps.rattacher(self, indice)
+        for nom, tampon in tampons.items():
+            setattr(self, nom, tampon[:n])
+    
+    def _deplacer_ligne(self, source: int, destination: int) -> None:
+        """Recopie une ligne des tableaux d'état sur une autre, avec le corps qui la désigne.
+        
+        Args:
+            source (int): Ligne du corps déplacé
+            destination (int): Ligne qu'il occupe désormais
+        """
+        if source == destination:
+            return
+        for tampon in self._tampons.values():
+            tampon[destination] = tampon[source]
+        corps = self.corps_indexes[source]
+        self.corps_indexes[destination] = corps
+        corps.rattacher(self, destination)
+    
+    def corps_par_id(self, identifiant: str) -> Optional[CorpsCeleste]:
+        """Retrouve un corps par son identifiant externe.
+        
+        La table des identifiants est construite à la première recherche, puis
+        tenue à jour par ajouter_corps() et retirer_corps() ; la ligne courante
+        du corps trouvé est son attribut indice.
+        
+        Args:
+            identifiant (str): Identifiant du corps
+            
+        Returns:
+            Optional[CorpsCeleste]: Corps du système, ou None s'il n'en fait pas partie
+        """
+        corps_liste = self._lignes()
+        if self._par_id is None:
+            self._par_id = {corps.id: corps for corps in corps_liste}
+        return self._par_id.get(identifiant)
+    
+    def vers_scenario(self) -> Dict[str, np.ndarray]:
+        """Rassemble l'état courant du système en colonnes.
+        
+        Le scénario obtenu peut être enregistré par catalogue.enregistrer_npz puis
+        rechargé par depuis_npz.
+        
+        Returns:
+            Dict[str, np.ndarray]: Colonnes noms, masses, rayons, positions, vitesses et
+            couleurs (copies, les étoiles en premier) et nombre d'étoiles 'nb_etoiles'
+        """
+        corps_liste = self.synchroniser()
+        return {
+            'noms': np.array([corps.nom for corps in corps_liste], dtype=str),
+            'masses': self.masses.copy(),
+            'rayons': self.rayons.copy(),
+            'positions': self.positions.copy(),
+            'vitesses': self.vitesses.copy(),
+            'couleurs': np.array([corps.couleur for corps in corps_liste], dtype=np.uint8).reshape(-1, 3),
+            'nb_etoiles': len(self.etoiles),
+        }
+    
     def obtenir_tous_corps(self) -> List[CorpsCeleste]:
         """Retourne tous les corps célestes (étoiles et planètes).
         
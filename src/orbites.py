@@ -0,0 +1,152 @@
+from typing import Dict, Optional, Tuple
+import numpy as np
+from src.modele import SystemeSolaire
+
+
+def elements_orbitaux(positions: np.ndarray, vitesses: np.ndarray, mu) -> Dict[str, np.ndarray]:
+    """Calcule les éléments orbitaux osculateurs de plusieurs corps à la fois.
+
+    Les positions et vitesses sont relatives au corps central. Les directions
+    de référence (nœud ascendant, périapside) sont remplacées par l'axe x
+    lorsqu'elles ne sont pas définies (orbite équatoriale ou circulaire).
+
+    Args:
+        positions (np.ndarray): Positions relatives (N, 3) en mètres
+        vitesses (np.ndarray): Vitesses relatives (N, 3) en m/s
+        mu (float | np.ndarray): Paramètre gravitationnel G(M + m) en m³/s², scalaire ou (N,)
+
+    Returns:
+        Dict[str, np.ndarray]: Tableaux (N,) 'a' (demi-grand axe en m, négatif pour
+        une orbite hyperbolique), 'e' (excentricité), 'i' (inclinaison), 'Omega'
+        (longitude du nœud ascendant), 'omega' (argument du périapside), 'nu'
+        (anomalie vraie), angles en radians, ainsi que les vecteurs unitaires (N, 3)
+        'P' (vers le périapside) et 'Q' (dans le plan de l'orbite, à 90° de P)
+    """
+    r = np.asarray(positions, dtype=float).reshape(-1, 3)
+    v = np.asarray(vitesses, dtype=float).reshape(-1, 3)
+    mu = np.broadcast_to(np.asarray(mu, dtype=float), (len(r),))
+
+    distance = np.sqrt(np.einsum('ij,ij->i', r, r))
+    v2 = np.einsum('ij,ij->i', v, v)
+    h = np.cross(r, v)
+    norme_h = np.sqrt(np.einsum('ij,ij->i', h, h))
+    h_unitaire = h / norme_h[:, None]
+
+    # Vecteur excentricité et énergie spécifique
+    vecteur_e = np.cross(v, h) / mu[:, None] - r / distance[:, None]
+    e = np.sqrt(np.einsum('ij,ij->i', vecteur_e, vecteur_e))
+    with np.errstate(divide='ignore'):
+        a = -mu / (2 * (v2 / 2 - mu / distance))
+
+    # Ligne des nœuds (k × h), remplacée par l'axe x pour une orbite équatoriale
+    noeud = np.stack([-h[:, 1], h[:, 0], np.zeros(len(r))], axis=1)
+    norme_noeud = np.sqrt(np.einsum('ij,ij->i', noeud, noeud))
+    equatoriale = norme_noeud <= 1e-12 * norme_h
+    n_unitaire = np.where(equatoriale[:, None], [1.0, 0.0, 0.0],
+                          noeud / np.where(equatoriale, 1.0, norme_noeud)[:, None])
+
+    # Direction du périapside, remplacée par la ligne des nœuds pour une orbite circulaire
+    circulaire = e <= 1e-10
+    P = np.where(circulaire[:, None], n_unitaire, vecteur_e / np.where(circulaire, 1.0, e)[:, None])
+    Q = np.cross(h_unitaire, P)
+
+    def angle(depuis, vers):
+        # Angle orienté autour de h entre deux vecteurs du plan de l'orbite
+        return np.arctan2(np.einsum('ij,ij->i', np.cross(depuis, vers), h_unitaire),
+                          np.einsum('ij,ij->i', depuis, vers))
+
+    return {
+        'a': a,
+        'e': e,
+        'i': np.arccos(np.clip(h_unitaire[:, 2], -1.0, 1.0)),
+        'Omega': np.mod(np.arctan2(n_unitaire[:, 1], n_unitaire[:, 0]), 2 * np.pi),
+        'omega': np.mod(angle(n_unitaire, P), 2 * np.pi),
+        'nu': np.mod(angle(P, r), 2 * np.pi),
+        'P': P,
+        'Q': Q,
+    }
+
+
+def etat_depuis_elements(a: np.ndarray, e: np.ndarray, i: np.ndarray, Omega: np.ndarray,
+                         omega: np.ndarray, nu: np.ndarray, mu) -> Tuple[np.ndarray, np.ndarray]:
+    """Calcule les positions et vitesses de plusieurs corps à partir de leurs éléments orbitaux.
+
+    Opération inverse de elements_orbitaux, pour des orbites liées ou non (e ≠ 1).
+
+    Args:
+        a (np.ndarray): Demi-grands axes (N,) en mètres
+        e (np.ndarray): Excentricités (N,)
+        i (np.ndarray): Inclinaisons (N,) en radians
+        Omega (np.ndarray): Longitudes du nœud ascendant (N,) en radians
+        omega (np.ndarray): Arguments du périapside (N,) en radians
+        nu (np.ndarray): Anomalies vraies (N,) en radians
+        mu (float | np.ndarray): Paramètre gravitationnel G(M + m) en m³/s², scalaire ou (N,)
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Positions (N, 3) en mètres et vitesses (N, 3) en m/s,
+        relatives au corps central
+    """
+    a, e, i, Omega, omega, nu = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (a, e, i, Omega, omega, nu)))
+    mu = np.asarray(mu, dtype=float)
+    parametre = a * (1 - e * e)
+    distance = parametre / (1 + e * np.cos(nu))
+    vitesse = np.sqrt(mu / parametre)
+
+    # Vecteurs P (vers le périapside) et Q du plan de l'orbite
+    cos_O, sin_O = np.cos(Omega), np.sin(Omega)
+    cos_w, sin_w = np.cos(omega), np.sin(omega)
+    cos_i, sin_i = np.cos(i), np.sin(i)
+    P = np.stack([cos_O * cos_w - sin_O * sin_w * cos_i, sin_O * cos_w + cos_O * sin_w * cos_i, sin_w * sin_i], axis=-1)
+    Q = np.stack([-cos_O * sin_w - sin_O * cos_w * cos_i, -sin_O * sin_w + cos_O * cos_w * cos_i, cos_w * sin_i], axis=-1)
+
+    positions = (distance * np.cos(nu))[..., None] * P + (distance * np.sin(nu))[..., None] * Q
+    vitesses = (-vitesse * np.sin(nu))[..., None] * P + (vitesse * (e + np.cos(nu)))[..., None] * Q
+    return positions, vitesses
+
+
+def points_orbites(elements: Dict[str, np.ndarray], nb_points: int = 128) -> np.ndarray:
+    """Échantillonne les ellipses décrites par des éléments orbitaux.
+
+    Seules les orbites liées (0 ≤ e < 1) ont une ellipse ; les points des
+    autres orbites valent NaN.
+
+    Args:
+        elements (Dict[str, np.ndarray]): Éléments retournés par elements_orbitaux
+        nb_points (int): Nombre de points par ellipse
+
+    Returns:
+        np.ndarray: Points (N, nb_points, 3) relatifs au corps central, en mètres
+    """
+    a, e = elements['a'], elements['e']
+    liee = (e < 1) & (a > 0)
+    # Anomalie excentrique uniformément répartie : plus de points près du périapside
+    anomalie = np.linspace(0.0, 2 * np.pi, nb_points, endpoint=False)
+    demi_petit_axe = a * np.sqrt(np.clip(1 - e * e, 0.0, None))
+    x = a[:, None] * (np.cos(anomalie)[None, :] - e[:, None])
+    y = demi_petit_axe[:, None] * np.sin(anomalie)[None, :]
+    points = x[:, :, None] * elements['P'][:, None, :] + y[:, :, None] * elements['Q'][:, None, :]
+    points[~liee] = np.nan
+    return points
+
+
+def elements_systeme(systeme: SystemeSolaire, centre: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """Calcule les éléments orbitaux des planètes d'un système autour de son étoile dominante.
+
+    Args:
+        systeme (SystemeSolaire): Système à analyser
+        centre (Optional[int]): Indice de l'étoile centrale dans systeme.etoiles,
+            par défaut l'étoile la plus massive
+
+    Returns:
+        Dict[str, np.ndarray]: Éléments retournés par elements_orbitaux, complétés
+        par 'noms', la liste des noms des planètes
+    """
+    systeme.synchroniser()
+    nb_etoiles = len(systeme.etoiles)
+    if centre is None:
+        centre = int(np.argmax(systeme.masses[:nb_etoiles]))
+    elements = elements_orbitaux(systeme.positions[nb_etoiles:] - systeme.positions[centre],
+                                 systeme.vitesses[nb_etoiles:] - systeme.vitesses[centre],
+                                 SystemeSolaire.G * (systeme.masses[centre] + systeme.masses[nb_etoiles:]))
+    elements['noms'] = [planete.nom for planete in systeme.planetes]
+    return elements
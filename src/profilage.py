@@ -0,0 +1,179 @@
+import os
+import sys
+import pstats
+import cProfile
+import threading
+import tracemalloc
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+
+# Modules du projet distingués dans le rapport des allocations
+MODULES_SUIVIS = ('modele', 'simulation', 'visualisation')
+
+
+class SessionProfilage:
+    """Profilage d'une fenêtre bornée de la boucle principale.
+
+    Le profil CPU combine cProfile (statistiques par fonction, au format pstats)
+    et un échantillonnage périodique de la pile du fil principal, écrit en piles
+    repliées (une ligne « f1;f2;f3 nombre » par pile) pour les outils de flame
+    graph. Le profil mémoire utilise tracemalloc et regroupe les allocations
+    encore vivantes par module du projet.
+
+    La fenêtre est exprimée en itérations de la boucle principale (images, ou
+    pas en mode sans affichage) et/ou en temps simulé : la première limite
+    atteinte termine le profilage.
+    """
+
+    def __init__(self, dossier: str, cpu: bool = True, memoire: bool = False,
+                 nb_iterations: Optional[int] = 300, duree: Optional[float] = None,
+                 periode_echantillonnage: float = 0.005, nb_allocations: int = 20):
+        """Initialise une session de profilage.
+
+        Args:
+            dossier (str): Dossier des fichiers produits
+            cpu (bool): Active cProfile et l'échantillonnage des piles
+            memoire (bool): Active le suivi des allocations avec tracemalloc
+            nb_iterations (Optional[int]): Nombre d'itérations profilées
+            duree (Optional[float]): Temps simulé profilé, en secondes
+            periode_echantillonnage (float): Intervalle entre deux échantillons de pile, en secondes
+            nb_allocations (int): Nombre de lignes d'allocation par module dans le rapport
+        """
+        self.dossier = dossier
+        self.cpu = cpu
+        self.memoire = memoire
+        self.nb_iterations = nb_iterations
+        self.duree = duree
+        self.periode_echantillonnage = periode_echantillonnage
+        self.nb_allocations = nb_allocations
+        self.iterations = 0
+        self.piles: Counter = Counter()
+        self._profil: Optional[cProfile.Profile] = None
+        self._arret_echantillonnage = threading.Event()
+        self._echantillonneur: Optional[threading.Thread] = None
+        self._temps_debut: Optional[float] = None
+
+    def demarrer(self) -> None:
+        """Démarre le profilage dans le fil appelant."""
+        if self.memoire:
+            tracemalloc.start(25)
+        if self.cpu:
+            fil = threading.get_ident()
+            self._echantillonneur = threading.Thread(target=self._echantillonner, args=(fil,), daemon=True)
+            self._echantillonneur.start()
+            self._profil = cProfile.Profile()
+            self._profil.enable()
+
+    def _echantillonner(self, fil: int) -> None:
+        """Relève périodiquement la pile d'un fil jusqu'à l'arrêt.
+
+        Args:
+            fil (int): Identifiant du fil échantillonné
+        """
+        while not self._arret_echantillonnage.wait(self.periode_echantillonnage):
+            cadre = sys._current_frames().get(fil)
+            pile = []
+            while cadre is not None:
+                code = cadre.f_code
+                pile.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                cadre = cadre.f_back
+            if pile:
+                self.piles[';'.join(reversed(pile))] += 1
+
+    def avancer(self, temps: float) -> bool:
+        """Compte une itération de la boucle principale.
+
+        Args:
+            temps (float): Temps simulé courant en secondes
+
+        Returns:
+            bool: True lorsque la fenêtre de profilage est écoulée
+        """
+        if self._temps_debut is None:
+            self._temps_debut = temps
+        self.iterations += 1
+        if self.nb_iterations is not None and self.iterations >= self.nb_iterations:
+            return True
+        return self.duree is not None and temps - self._temps_debut >= self.duree
+
+    def arreter(self) -> List[str]:
+        """Arrête le profilage et écrit les rapports.
+
+        Returns:
+            List[str]: Chemins des fichiers écrits
+        """
+        os.makedirs(self.dossier, exist_ok=True)
+        fichiers = []
+        if self._profil is not None:
+            self._profil.disable()
+            self._arret_echantillonnage.set()
+            self._echantillonneur.join()
+            chemin = os.path.join(self.dossier, 'profil.pstats')
+            self._profil.dump_stats(chemin)
+            fichiers.append(chemin)
+            chemin = os.path.join(self.dossier, 'profil.collapsed')
+            with open(chemin, 'w', encoding='utf-8') as f:
+                for pile, nombre in self.piles.most_common():
+                    f.write(f"{pile} {nombre}\n")
+            fichiers.append(chemin)
+            chemin = os.path.join(self.dossier, 'profil.txt')
+            with open(chemin, 'w', encoding='utf-8') as f:
+                pstats.Stats(self._profil, stream=f).sort_stats('cumulative').print_stats(40)
+            fichiers.append(chemin)
+            self._profil = None
+        if self.memoire and tracemalloc.is_tracing():
+            instantane = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            chemin = os.path.join(self.dossier, 'memoire.txt')
+            with open(chemin, 'w', encoding='utf-8') as f:
+                f.write(self.rapport_memoire(instantane))
+            fichiers.append(chemin)
+        return fichiers
+
+    @staticmethod
+    def attribuer_allocation(traceback: tracemalloc.Traceback) -> Tuple[str, tracemalloc.Frame]:
+        """Retourne le module du projet responsable d'une allocation.
+
+        L'allocation est attribuée au cadre le plus récent appartenant à l'un des
+        modules suivis, ce qui compte dans visualisation une allocation faite par
+        NumPy ou pygame à sa demande.
+
+        Args:
+            traceback (tracemalloc.Traceback): Pile de l'allocation
+
+        Returns:
+            Tuple[str, tracemalloc.Frame]: Nom du module suivi et cadre de l'appel,
+            ou 'autres' et le cadre le plus récent
+        """
+        for cadre in reversed(traceback):
+            module = os.path.splitext(os.path.basename(cadre.filename))[0]
+            if module in MODULES_SUIVIS:
+                return module, cadre
+        return 'autres', traceback[-1]
+
+    def rapport_memoire(self, instantane: tracemalloc.Snapshot) -> str:
+        """Formate les plus grosses allocations vivantes, regroupées par module.
+
+        Args:
+            instantane (tracemalloc.Snapshot): Instantané de tracemalloc
+
+        Returns:
+            str: Rapport texte
+        """
+        instantane = instantane.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+        par_module: Dict[str, List[tuple]] = {module: [] for module in MODULES_SUIVIS + ('autres',)}
+        for statistique in instantane.statistics('traceback'):
+            module, cadre = self.attribuer_allocation(statistique.traceback)
+            par_module[module].append((statistique, cadre))
+
+        lignes = []
+        for module, statistiques in par_module.items():
+            taille = sum(s.size for s, _ in statistiques)
+            nombre = sum(s.count for s, _ in statistiques)
+            lignes.append(f"== {module} : {taille / 1024:.1f} Kio en {nombre} blocs")
+            for statistique, cadre in statistiques[:self.nb_allocations]:
+                lignes.append(f"  {statistique.size / 1024:10.1f} Kio {statistique.count:8d} blocs  "
+                              f"{cadre.filename}:{cadre.lineno}")
+            lignes.append("")
+        return "\n".join(lignes)
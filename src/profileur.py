@@ -0,0 +1,167 @@
+import csv
+import time
+from collections import deque
+from typing import Dict, List, Optional
+import numpy as np
+
+
+class ProfileurImages:
+    """Historique des durées de chaque image et de chacune de ses phases.
+
+    Les durées des phases du rendu proviennent du contrôleur de qualité, celle
+    de la simulation est transmise par la boucle principale. L'intervalle entre
+    deux images donne la cadence réelle, événements et simulation compris.
+    """
+
+    # Ordre d'affichage et d'export des phases connues
+    PHASES = ['simulation', 'echelle', 'grille', 'hud', 'trajectoires', 'orbites',
+              'corps', 'etiquettes', 'flip']
+
+    def __init__(self, taille_historique: int = 10000):
+        """Initialise un historique vide.
+
+        Args:
+            taille_historique (int): Nombre maximal d'images conservées
+        """
+        # Chaque entrée : (horodatage en s, intervalle depuis l'image précédente en s
+        # ou None, nombre de pas simulés, durée de chaque phase en s)
+        self.historique: deque = deque(maxlen=taille_historique)
+        self._origine = time.perf_counter()
+        self._derniere_image: Optional[float] = None
+        self._duree_simulation = 0.0
+        self._pas_simules = 0
+
+    def enregistrer_simulation(self, duree: float, nb_pas: int) -> None:
+        """Ajoute le temps passé à simuler depuis la dernière image.
+
+        Args:
+            duree (float): Durée de la simulation en secondes
+            nb_pas (int): Nombre de pas simulés
+        """
+        self._duree_simulation += duree
+        self._pas_simules += nb_pas
+
+    def enregistrer_image(self, durees_phases: Dict[str, float]) -> None:
+        """Enregistre une image affichée.
+
+        Args:
+            durees_phases (Dict[str, float]): Durée de chaque phase du rendu en secondes
+        """
+        maintenant = time.perf_counter()
+        intervalle = None if self._derniere_image is None else maintenant - self._derniere_image
+        self._derniere_image = maintenant
+        durees = dict(durees_phases)
+        durees['simulation'] = self._duree_simulation
+        self.historique.append((maintenant - self._origine, intervalle, self._pas_simules, durees))
+        self._duree_simulation = 0.0
+        self._pas_simules = 0
+
+    def _fin(self, nb_images: int) -> List[tuple]:
+        """Retourne les dernières entrées de l'historique.
+
+        Args:
+            nb_images (int): Nombre maximal d'images
+
+        Returns:
+            List[tuple]: Entrées de l'historique, de la plus ancienne à la plus récente
+        """
+        # L'accès par indice à la fin d'une deque ne parcourt pas tout l'historique
+        taille = len(self.historique)
+        return [self.historique[i] for i in range(max(taille - nb_images, 0), taille)]
+
+    def _dernieres(self, nb_images: int) -> List[tuple]:
+        """Retourne les dernières images dont l'intervalle est connu.
+
+        Args:
+            nb_images (int): Nombre maximal d'images
+
+        Returns:
+            List[tuple]: Entrées de l'historique, de la plus ancienne à la plus récente
+        """
+        return [entree for entree in self._fin(nb_images) if entree[1] is not None]
+
+    def intervalles(self, nb_images: int = 120) -> np.ndarray:
+        """Retourne les intervalles entre les dernières images.
+
+        Args:
+            nb_images (int): Nombre maximal d'images
+
+        Returns:
+            np.ndarray: Intervalles en secondes, du plus ancien au plus récent
+        """
+        return np.array([entree[1] for entree in self._dernieres(nb_images)], dtype=float)
+
+    def images_par_seconde(self, nb_images: int = 60) -> float:
+        """Retourne la cadence moyenne des dernières images.
+
+        Args:
+            nb_images (int): Nombre d'images de la moyenne
+
+        Returns:
+            float: Images par seconde, 0 si la cadence est inconnue
+        """
+        intervalles = self.intervalles(nb_images)
+        total = intervalles.sum()
+        return len(intervalles) / total if total > 0 else 0.0
+
+    def pas_par_seconde(self, nb_images: int = 60) -> float:
+        """Retourne le nombre moyen de pas simulés par seconde sur les dernières images.
+
+        Args:
+            nb_images (int): Nombre d'images de la moyenne
+
+        Returns:
+            float: Pas simulés par seconde
+        """
+        entrees = self._dernieres(nb_images)
+        total = sum(entree[1] for entree in entrees)
+        return sum(entree[2] for entree in entrees) / total if total > 0 else 0.0
+
+    def durees_moyennes(self, nb_images: int = 60) -> Dict[str, float]:
+        """Retourne la durée moyenne de chaque phase sur les dernières images.
+
+        Args:
+            nb_images (int): Nombre d'images de la moyenne
+
+        Returns:
+            Dict[str, float]: Durée moyenne en secondes, par phase, dans l'ordre de PHASES
+        """
+        entrees = self._fin(nb_images)
+        if not entrees:
+            return {}
+        moyennes = {}
+        for phase in self._phases(entrees):
+            moyennes[phase] = sum(entree[3].get(phase, 0.0) for entree in entrees) / len(entrees)
+        return moyennes
+
+    def _phases(self, entrees) -> List[str]:
+        """Retourne les phases présentes dans des entrées, dans l'ordre de PHASES.
+
+        Args:
+            entrees: Entrées de l'historique
+
+        Returns:
+            List[str]: Noms des phases
+        """
+        presentes = set()
+        for entree in entrees:
+            presentes.update(entree[3])
+        return ([phase for phase in self.PHASES if phase in presentes] +
+                sorted(presentes.difference(self.PHASES)))
+
+    def exporter_csv(self, chemin: str) -> None:
+        """Écrit l'historique dans un fichier CSV, une ligne par image.
+
+        Les durées sont exprimées en millisecondes.
+
+        Args:
+            chemin (str): Chemin du fichier CSV
+        """
+        phases = self._phases(self.historique)
+        with open(chemin, 'w', newline='', encoding='utf-8') as f:
+            ecrivain = csv.writer(f)
+            ecrivain.writerow(['image', 'horodatage_s', 'intervalle_ms', 'pas'] + [f"{phase}_ms" for phase in phases])
+            for indice, (horodatage, intervalle, pas, durees) in enumerate(self.historique):
+                ecrivain.writerow([indice, f"{horodatage:.6f}",
+                                   '' if intervalle is None else f"{intervalle * 1000:.4f}", pas] +
+                                  [f"{durees.get(phase, 0.0) * 1000:.4f}" for phase in phases])
@@ -0,0 +1,115 @@
+import time
+from contextlib import contextmanager
+from typing import Dict, Any
+from src.traceur import TRACEUR_NUL
+
+
+class ControleurQualite:
+    """Contrôleur de la qualité d'affichage selon un budget de temps par image.
+
+    Le temps de rendu de chaque phase est mesuré. Lorsque la durée moyenne
+    d'une image dépasse le budget, la qualité est dégradée d'un niveau ;
+    elle est rétablie lorsqu'il reste de la marge. Deux seuils distincts et
+    un nombre minimal d'images consécutives évitent les oscillations.
+    """
+
+    # Réglages de chaque niveau, du plus détaillé (0) au plus économe
+    NIVEAUX = [
+        {'pas_trajectoire': 1, 'max_etiquettes': None, 'grille': True, 'points': False},
+        {'pas_trajectoire': 2, 'max_etiquettes': None, 'grille': True, 'points': False},
+        {'pas_trajectoire': 2, 'max_etiquettes': 10, 'grille': True, 'points': False},
+        {'pas_trajectoire': 4, 'max_etiquettes': 10, 'grille': False, 'points': False},
+        {'pas_trajectoire': 4, 'max_etiquettes': 5, 'grille': False, 'points': True},
+    ]
+
+    def __init__(self, budget: float = 1 / 30, seuil_degradation: float = 1.0,
+                 seuil_amelioration: float = 0.6, images_degradation: int = 10,
+                 images_amelioration: int = 60, lissage: float = 0.9):
+        """Initialise le contrôleur au niveau de qualité maximal.
+
+        Args:
+            budget (float): Durée cible d'une image en secondes
+            seuil_degradation (float): Fraction du budget au-delà de laquelle la qualité baisse
+            seuil_amelioration (float): Fraction du budget en deçà de laquelle la qualité remonte
+            images_degradation (int): Nombre d'images consécutives hors budget avant de dégrader
+            images_amelioration (int): Nombre d'images consécutives avec marge avant d'améliorer
+            lissage (float): Poids de la moyenne précédente dans la moyenne glissante
+        """
+        self.budget = budget
+        self.seuil_degradation = seuil_degradation
+        self.seuil_amelioration = seuil_amelioration
+        self.images_degradation = images_degradation
+        self.images_amelioration = images_amelioration
+        self.lissage = lissage
+        self.actif = True
+        self.niveau = 0
+        self.duree_moyenne = None  # Durée moyenne d'une image en secondes
+        self.durees_phases: Dict[str, float] = {}  # Durée de chaque phase de la dernière image
+        self.traceur = TRACEUR_NUL  # Reçoit aussi chaque phase mesurée
+        self._images_hors_budget = 0
+        self._images_avec_marge = 0
+
+    @property
+    def niveau_max(self) -> int:
+        """Retourne le niveau de qualité le plus économe."""
+        return len(self.NIVEAUX) - 1
+
+    @property
+    def parametres(self) -> Dict[str, Any]:
+        """Retourne les réglages d'affichage du niveau courant."""
+        return self.NIVEAUX[self.niveau]
+
+    @contextmanager
+    def phase(self, nom: str):
+        """Mesure la durée d'une phase du rendu.
+
+        Args:
+            nom (str): Nom de la phase
+        """
+        debut = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            fin = time.perf_counter_ns()
+            self.durees_phases[nom] = (fin - debut) * 1e-9
+            self.traceur.enregistrer(nom, debut, fin)
+
+    def mettre_a_jour(self, duree_image: float) -> int:
+        """Prend en compte la durée d'une image et ajuste le niveau de qualité.
+
+        Args:
+            duree_image (float): Durée de rendu de l'image en secondes
+
+        Returns:
+            int: Niveau de qualité à utiliser pour l'image suivante
+        """
+        if self.duree_moyenne is None:
+            self.duree_moyenne = duree_image
+        else:
+            self.duree_moyenne = self.lissage * self.duree_moyenne + (1 - self.lissage) * duree_image
+
+        if not self.actif:
+            return self.niveau
+
+        if self.duree_moyenne > self.budget * self.seuil_degradation:
+            self._images_hors_budget += 1
+            self._images_avec_marge = 0
+        elif self.duree_moyenne < self.budget * self.seuil_amelioration:
+            self._images_avec_marge += 1
+            self._images_hors_budget = 0
+        else:
+            # Zone d'hystérésis : le niveau est conservé
+            self._images_hors_budget = 0
+            self._images_avec_marge = 0
+
+        if self._images_hors_budget >= self.images_degradation and self.niveau < self.niveau_max:
+            self.niveau += 1
+            self._images_hors_budget = 0
+            # Repart de la durée mesurée pour juger l'effet du nouveau niveau
+            self.duree_moyenne = None
+        elif self._images_avec_marge >= self.images_amelioration and self.niveau > 0:
+            self.niveau -= 1
+            self._images_avec_marge = 0
+            self.duree_moyenne = None
+
+        return self.niveau
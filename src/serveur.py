@@ -0,0 +1,452 @@
+import json
+import math
+import queue
+import socket
+import struct
+import asyncio
+import threading
+import time
+from typing import Dict, Optional, Tuple
+import numpy as np
+from src.catalogue import enregistrer_npz
+
+# En-tête de chaque message : longueur de la charge en octets, puis type du message
+ENTETE = struct.Struct('!IB')
+COMMANDE, REPONSE, CATALOGUE, ETAT = 1, 2, 3, 4
+# En-tête d'un état : temps (s), version du catalogue, nombre de corps, octets par coordonnée
+ENTETE_ETAT = struct.Struct('<dIIB')
+# Taille maximale d'une commande reçue
+TAILLE_MAX_COMMANDE = 1 << 16
+
+
+def encoder_message(type_message: int, charge: bytes) -> bytes:
+    """Préfixe une charge de sa longueur et de son type.
+
+    Args:
+        type_message (int): COMMANDE, REPONSE, CATALOGUE ou ETAT
+        charge (bytes): Contenu du message
+
+    Returns:
+        bytes: Message prêt à être écrit sur le flux
+    """
+    return ENTETE.pack(len(charge), type_message) + charge
+
+
+def encoder_json(type_message: int, donnees: Dict) -> bytes:
+    """Encode un message dont la charge est un objet JSON.
+
+    Args:
+        type_message (int): Type du message
+        donnees (Dict): Objet sérialisable
+
+    Returns:
+        bytes: Message prêt à être écrit sur le flux
+    """
+    return encoder_message(type_message, json.dumps(donnees).encode('utf-8'))
+
+
+def encoder_etat(temps: float, version: int, positions: np.ndarray, vitesses: np.ndarray,
+                 octets: int = 4) -> bytes:
+    """Encode un instantané binaire des positions et vitesses.
+
+    Args:
+        temps (float): Temps simulé en secondes
+        version (int): Version du catalogue décrivant les lignes
+        positions (np.ndarray): Positions (N, 3) en mètres
+        vitesses (np.ndarray): Vitesses (N, 3) en m/s
+        octets (int): 4 (simple précision) ou 8 (double précision) par coordonnée
+
+    Returns:
+        bytes: Message ETAT
+    """
+    type_flottant = '<f4' if octets == 4 else '<f8'
+    return encoder_message(ETAT, ENTETE_ETAT.pack(temps, version, len(positions), octets) +
+                           positions.astype(type_flottant).tobytes() + vitesses.astype(type_flottant).tobytes())
+
+
+def decoder_etat(charge: bytes) -> Tuple[float, int, np.ndarray, np.ndarray]:
+    """Décode la charge d'un message ETAT.
+
+    Args:
+        charge (bytes): Charge du message, sans son en-tête de longueur et de type
+
+    Returns:
+        Tuple[float, int, np.ndarray, np.ndarray]: Temps en secondes, version du
+        catalogue, positions (N, 3) et vitesses (N, 3) en double précision
+    """
+    temps, version, n, octets = ENTETE_ETAT.unpack_from(charge)
+    valeurs = np.frombuffer(charge, dtype='<f4' if octets == 4 else '<f8', count=6 * n,
+                            offset=ENTETE_ETAT.size).astype(float)
+    return temps, version, valeurs[:3 * n].reshape(n, 3), valeurs[3 * n:].reshape(n, 3)
+
+
+class _Connexion:
+    """État d'un client du serveur, manipulé uniquement depuis la boucle asyncio."""
+
+    def __init__(self, ecrivain: asyncio.StreamWriter):
+        """Initialise une connexion non abonnée.
+
+        Args:
+            ecrivain (asyncio.StreamWriter): Flux d'écriture vers le client
+        """
+        self.ecrivain = ecrivain
+        self.periode: Optional[float] = None  # Intervalle entre deux envois, None si non abonné
+        self.octets = 4
+        self.dernier = None  # Dernier instantané (état, catalogue) pas encore envoyé
+        self.nouveau = asyncio.Event()
+        self.version_envoyee = -1
+        self.envoyes = 0
+        self.remplaces = 0  # Instantanés remplacés par un plus récent avant d'être envoyés
+
+
+class ServeurInstantanes:
+    """Serveur local diffusant l'état d'une simulation à plusieurs clients.
+
+    Le serveur écoute en TCP (localhost par défaut) ou sur une socket Unix,
+    dans une boucle asyncio exécutée par un fil dédié. Chaque message est
+    préfixé de sa longueur et de son type (ENTETE). Un client s'abonne par la
+    commande {"commande": "abonner", "frequence": 30, "precision": 32} ; il
+    reçoit alors le catalogue des corps (noms, masses, rayons, couleurs, en
+    JSON) à chaque changement de l'ensemble des corps, et des instantanés
+    binaires des positions et vitesses (encoder_etat) à la fréquence choisie.
+
+    La simulation appelle publier() entre deux pas : l'état n'y est recopié
+    que si un abonné l'attend, puis confié à la boucle du serveur sans
+    attente. Chaque abonné ne garde que le dernier instantané non envoyé :
+    un client lent perd des images, sans jamais ralentir la simulation.
+
+    Les commandes pause, reprendre, acceleration (facteur du temps simulé
+    par pas de la boucle principale) et sauvegarde (état courant écrit au
+    format .npz) sont exécutées par publier(), dans le fil de la simulation.
+    """
+
+    def __init__(self, hote: str = '127.0.0.1', port: int = 8765, chemin_unix: Optional[str] = None):
+        """Initialise un serveur arrêté.
+
+        Args:
+            hote (str): Adresse d'écoute TCP
+            port (int): Port d'écoute TCP (0 : choisi par le système)
+            chemin_unix (Optional[str]): Chemin d'une socket Unix, utilisée à la place de TCP
+        """
+        self.hote = hote
+        self.port = port
+        self.chemin_unix = chemin_unix
+        self.adresse = None  # Adresse effective d'écoute, connue après demarrer()
+
+        # État piloté par les commandes des clients
+        self.en_pause = False
+        self.acceleration = 1.0
+        self._reste = 0.0  # Fraction de pas due, reportée d'une itération à l'autre
+
+        self._boucle: Optional[asyncio.AbstractEventLoop] = None
+        self._fil: Optional[threading.Thread] = None
+        self._connexions = set()
+        self._commandes = queue.Queue()
+        self._intervalle_min: Optional[float] = None  # Plus petite période des abonnés, None sans abonné
+        self._derniere_capture = -math.inf
+        self._lignes_catalogue = None  # Système et version de ses lignes décrits par le dernier catalogue
+        self._version = 0
+        self._catalogue = b''
+
+    def demarrer(self) -> None:
+        """Ouvre la socket d'écoute et lance la boucle du serveur dans un fil.
+
+        Raises:
+            OSError: Si l'adresse ne peut pas être ouverte
+        """
+        pret = threading.Event()
+        erreurs = []
+
+        def executer():
+            boucle = asyncio.new_event_loop()
+            asyncio.set_event_loop(boucle)
+            try:
+                if self.chemin_unix:
+                    serveur = boucle.run_until_complete(asyncio.start_unix_server(self._servir, path=self.chemin_unix))
+                    self.adresse = self.chemin_unix
+                else:
+                    serveur = boucle.run_until_complete(asyncio.start_server(self._servir, self.hote, self.port))
+                    self.adresse = serveur.sockets[0].getsockname()[:2]
+            except OSError as e:
+                erreurs.append(e)
+                boucle.close()
+                pret.set()
+                return
+            self._boucle = boucle
+            pret.set()
+            try:
+                boucle.run_forever()
+            finally:
+                serveur.close()
+                for connexion in list(self._connexions):
+                    connexion.ecrivain.close()
+                taches = asyncio.all_tasks(boucle)
+                for tache in taches:
+                    tache.cancel()
+                boucle.run_until_complete(asyncio.gather(*taches, return_exceptions=True))
+                boucle.close()
+
+        self._fil = threading.Thread(target=executer, name='serveur-instantanes', daemon=True)
+        self._fil.start()
+        pret.wait()
+        if erreurs:
+            self._fil = None
+            raise erreurs[0]
+
+    def arreter(self) -> None:
+        """Ferme les connexions et arrête la boucle du serveur."""
+        if self._fil is None:
+            return
+        boucle, self._boucle = self._boucle, None
+        boucle.call_soon_threadsafe(boucle.stop)
+        self._fil.join()
+        self._fil = None
+
+    def duree_a_simuler(self, dt: float) -> float:
+        """Retourne la durée à simuler par une itération de la boucle principale.
+
+        La durée est un nombre entier de pas, proportionnel en moyenne à
+        l'accélération demandée : avec une accélération de 0.5, un pas est
+        simulé une itération sur deux.
+
+        Args:
+            dt (float): Pas de temps en secondes
+
+        Returns:
+            float: Durée en secondes, multiple de dt
+        """
+        self._reste += self.acceleration
+        nb_pas = int(self._reste + 1e-9)
+        self._reste -= nb_pas
+        return nb_pas * dt
+
+    def statistiques(self) -> Dict[str, int]:
+        """Compte les abonnés et les instantanés envoyés ou remplacés avant envoi.
+
+        Returns:
+            Dict[str, int]: Nombre d'abonnés, d'instantanés envoyés et remplacés
+        """
+        abonnes = [connexion for connexion in list(self._connexions) if connexion.periode is not None]
+        return {'abonnes': len(abonnes), 'envoyes': sum(connexion.envoyes for connexion in abonnes),
+                'remplaces': sum(connexion.remplaces for connexion in abonnes)}
+
+    def publier(self, simulation) -> None:
+        """Exécute les commandes reçues et diffuse l'état courant si un abonné l'attend.
+
+        Appelée par la boucle de simulation entre deux pas ; elle ne bloque jamais
+        sur l'envoi aux clients.
+
+        Args:
+            simulation (Simulation): Simulation diffusée
+        """
+        self._executer_commandes(simulation)
+        boucle = self._boucle
+        intervalle = self._intervalle_min
+        if boucle is None or intervalle is None:
+            return
+        maintenant = time.monotonic()
+        if maintenant - self._derniere_capture < intervalle:
+            return
+        self._derniere_capture = maintenant
+
+        systeme = simulation.systeme
+        systeme.synchroniser()
+        lignes = (systeme, systeme.version_lignes)
+        if lignes != self._lignes_catalogue:
+            # Nouvel ensemble de corps : nouveau catalogue, envoyé avant le prochain état de chaque abonné
+            self._lignes_catalogue = lignes
+            self._version += 1
+            scenario = systeme.vers_scenario()
+            self._catalogue = encoder_json(CATALOGUE, {
+                'version': self._version,
+                'nb_etoiles': scenario['nb_etoiles'],
+                'noms': scenario['noms'].tolist(),
+                'masses': scenario['masses'].tolist(),
+                'rayons': scenario['rayons'].tolist(),
+                'couleurs': scenario['couleurs'].tolist(),
+            })
+        etat = (simulation.temps, self._version, systeme.positions.copy(), systeme.vitesses.copy())
+        try:
+            boucle.call_soon_threadsafe(self._diffuser, etat, self._catalogue)
+        except RuntimeError:
+            pass  # Boucle arrêtée entre-temps
+
+    def _executer_commandes(self, simulation) -> None:
+        """Exécute les commandes en attente dans le fil de la simulation.
+
+        Args:
+            simulation (Simulation): Simulation pilotée
+        """
+        while True:
+            try:
+                connexion, commande = self._commandes.get_nowait()
+            except queue.Empty:
+                return
+            nom = commande['commande']
+            reponse = {'ok': True, 'commande': nom}
+            if nom == 'pause':
+                self.en_pause = True
+            elif nom == 'reprendre':
+                self.en_pause = False
+            elif nom == 'acceleration':
+                self.acceleration = commande['facteur']
+            elif nom == 'sauvegarde':
+                try:
+                    enregistrer_npz(simulation.systeme.vers_scenario(), commande['chemin'])
+                except OSError as e:
+                    reponse = {'ok': False, 'commande': nom, 'erreur': str(e)}
+            reponse['temps'] = simulation.temps
+            boucle = self._boucle
+            if boucle is not None:
+                boucle.call_soon_threadsafe(self._repondre, connexion, reponse)
+
+    def _mettre_a_jour_intervalle(self) -> None:
+        """Recalcule la plus petite période d'envoi des abonnés."""
+        periodes = [connexion.periode for connexion in self._connexions if connexion.periode is not None]
+        self._intervalle_min = min(periodes) if periodes else None
+
+    def _repondre(self, connexion: _Connexion, reponse: Dict) -> None:
+        """Envoie une réponse à une commande, sans attendre le client.
+
+        Args:
+            connexion (_Connexion): Client destinataire
+            reponse (Dict): Réponse sérialisable
+        """
+        if not connexion.ecrivain.is_closing():
+            connexion.ecrivain.write(encoder_json(REPONSE, reponse))
+
+    def _diffuser(self, etat: Tuple, catalogue: bytes) -> None:
+        """Remplace le dernier instantané en attente de chaque abonné.
+
+        Args:
+            etat (Tuple): Temps, version du catalogue, positions et vitesses
+            catalogue (bytes): Message CATALOGUE correspondant
+        """
+        for connexion in self._connexions:
+            if connexion.periode is None:
+                continue
+            if connexion.dernier is not None:
+                connexion.remplaces += 1
+            connexion.dernier = (etat, catalogue)
+            connexion.nouveau.set()
+
+    def _recevoir(self, connexion: _Connexion, commande: Dict) -> None:
+        """Traite une commande reçue : abonnement immédiat, commandes de pilotage différées.
+
+        Args:
+            connexion (_Connexion): Client émetteur
+            commande (Dict): Commande décodée
+        """
+        nom = commande.get('commande') if isinstance(commande, dict) else None
+        try:
+            if nom == 'abonner':
+                frequence = float(commande.get('frequence', 30.0))
+                precision = int(commande.get('precision', 32))
+                if not frequence > 0 or precision not in (32, 64):
+                    raise ValueError("fréquence positive et précision 32 ou 64 attendues")
+                connexion.periode = 1.0 / frequence
+                connexion.octets = precision // 8
+                connexion.version_envoyee = -1
+                self._mettre_a_jour_intervalle()
+                self._repondre(connexion, {'ok': True, 'commande': nom})
+            elif nom == 'desabonner':
+                connexion.periode = None
+                connexion.dernier = None
+                self._mettre_a_jour_intervalle()
+                self._repondre(connexion, {'ok': True, 'commande': nom})
+            elif nom in ('pause', 'reprendre'):
+                self._commandes.put((connexion, {'commande': nom}))
+            elif nom == 'acceleration':
+                facteur = float(commande['facteur'])
+                if not facteur >= 0:
+                    raise ValueError("facteur positif attendu")
+                self._commandes.put((connexion, {'commande': nom, 'facteur': facteur}))
+            elif nom == 'sauvegarde':
+                self._commandes.put((connexion, {'commande': nom, 'chemin': str(commande['chemin'])}))
+            else:
+                raise ValueError(f"commande inconnue : {nom!r}")
+        except (KeyError, TypeError, ValueError) as e:
+            self._repondre(connexion, {'ok': False, 'commande': nom, 'erreur': str(e)})
+
+    async def _servir(self, lecteur: asyncio.StreamReader, ecrivain: asyncio.StreamWriter) -> None:
+        """Lit les commandes d'un client jusqu'à sa déconnexion.
+
+        Args:
+            lecteur (asyncio.StreamReader): Flux de lecture du client
+            ecrivain (asyncio.StreamWriter): Flux d'écriture vers le client
+        """
+        connexion = _Connexion(ecrivain)
+        self._connexions.add(connexion)
+        envoi = asyncio.ensure_future(self._envoyer(connexion))
+        try:
+            while True:
+                longueur, type_message = ENTETE.unpack(await lecteur.readexactly(ENTETE.size))
+                if longueur > TAILLE_MAX_COMMANDE:
+                    break
+                charge = await lecteur.readexactly(longueur)
+                if type_message != COMMANDE:
+                    continue
+                try:
+                    commande = json.loads(charge)
+                except ValueError:
+                    self._repondre(connexion, {'ok': False, 'erreur': "JSON invalide"})
+                    continue
+                self._recevoir(connexion, commande)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._connexions.discard(connexion)
+            self._mettre_a_jour_intervalle()
+            envoi.cancel()
+            ecrivain.close()
+
+    async def _envoyer(self, connexion: _Connexion) -> None:
+        """Envoie à un abonné le dernier instantané disponible, au plus à sa fréquence.
+
+        Args:
+            connexion (_Connexion): Client destinataire
+        """
+        boucle = asyncio.get_running_loop()
+        ecrivain = connexion.ecrivain
+        try:
+            while True:
+                await connexion.nouveau.wait()
+                connexion.nouveau.clear()
+                if connexion.dernier is None or connexion.periode is None:
+                    continue
+                (temps, version, positions, vitesses), catalogue = connexion.dernier
+                connexion.dernier = None
+                debut = boucle.time()
+                if version != connexion.version_envoyee:
+                    ecrivain.write(catalogue)
+                    connexion.version_envoyee = version
+                ecrivain.write(encoder_etat(temps, version, positions, vitesses, connexion.octets))
+                connexion.envoyes += 1
+                # Un client lent suspend ses propres envois ; les instantanés suivants remplacent le dernier
+                await ecrivain.drain()
+                await asyncio.sleep(max(0.0, connexion.periode - (boucle.time() - debut)))
+        except ConnectionError:
+            pass
+
+
+def ouvrir_socket(hote: str = '127.0.0.1', port: int = 8765, chemin_unix: Optional[str] = None,
+                  delai: Optional[float] = 5.0) -> socket.socket:
+    """Ouvre une connexion vers un serveur d'instantanés.
+
+    Args:
+        hote (str): Adresse TCP du serveur
+        port (int): Port TCP du serveur
+        chemin_unix (Optional[str]): Chemin de la socket Unix, utilisée à la place de TCP
+        delai (Optional[float]): Délai de connexion en secondes
+
+    Returns:
+        socket.socket: Socket connectée, en mode bloquant
+    """
+    if chemin_unix:
+        connexion = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connexion.settimeout(delai)
+        connexion.connect(chemin_unix)
+    else:
+        connexion = socket.create_connection((hote, port), timeout=delai)
+    connexion.settimeout(None)
+    return connexion
@@ -1,6 +1,36 @@
-from typing import List
+import time
+from typing import List, Optional
 import numpy as np
 from src.modele import SystemeSolaire, CorpsCeleste
+from src.forces import ModeleForces
+from src.traceur import TRACEUR_NUL
+
+
+def interpoler_hermite(p0: np.ndarray, v0: np.ndarray, p1: np.ndarray, v1: np.ndarray,
+                       h: float, s: float) -> np.ndarray:
+    """Interpole des positions entre deux états par une cubique d'Hermite.
+    
+    La courbe passe par p0 et p1 avec les vitesses v0 et v1, ce qui donne un
+    mouvement continu en position et en vitesse d'un pas de physique à l'autre.
+    
+    Args:
+        p0 (np.ndarray): Positions (N, 3) au début de l'intervalle en mètres
+        v0 (np.ndarray): Vitesses (N, 3) au début de l'intervalle en m/s
+        p1 (np.ndarray): Positions (N, 3) à la fin de l'intervalle en mètres
+        v1 (np.ndarray): Vitesses (N, 3) à la fin de l'intervalle en m/s
+        h (float): Durée de l'intervalle en secondes
+        s (float): Fraction de l'intervalle écoulée (0 à 1)
+        
+    Returns:
+        np.ndarray: Positions (N, 3) interpolées en mètres
+    """
+    s2 = s * s
+    s3 = s2 * s
+    h00 = 2 * s3 - 3 * s2 + 1
+    h10 = s3 - 2 * s2 + s
+    h01 = -2 * s3 + 3 * s2
+    h11 = s3 - s2
+    return h00 * p0 + (h10 * h) * v0 + h01 * p1 + (h11 * h) * v1
 
 
 class Simulation:
@@ -16,6 +46,28 @@ class Simulation:
         self.systeme = systeme
         self.dt = dt
         self.temps = 0.0  # Temps écoulé en secondes
+        
+        # Termes de force vectorisés, configurés par la section "forces" du scénario ;
+        # à None, la gravitation est calculée paire par paire par calculer_forces
+        self.modele_forces = ModeleForces.depuis_config(systeme.config_forces)
+        
+        # Deux derniers états (temps, positions, vitesses), conservés pour
+        # l'interpolation de l'affichage lorsqu'elle est activée
+        self.conserver_etats = False
+        self.etat_precedent = None
+        self.etat_courant = None
+        
+        # Instrumentation optionnelle (compteurs, histogrammes, rappels après chaque pas)
+        self.instrumentation = None
+        
+        # Traceur des phases de chaque pas (forces, kick, drift), inactif par défaut
+        self.traceur = TRACEUR_NUL
+        
+        # Diagnostics optionnels des quantités conservées, mesurées tous les n pas
+        self.diagnostics = None
+        
+        # Détection optionnelle des collisions, suivies de la fusion des corps en contact
+        self.collisions = None
     
     def calculer_forces(self, corps: CorpsCeleste) -> np.ndarray:
         """Calcule la force totale exercée sur un corps par tous les autres corps.
@@ -28,9 +80,9 @@ class Simulation:
         """
         force_totale = np.zeros(3)
         
-        # Calcul de la force exercée par chaque autre corps
+        # Calcul de la force exercée par chaque autre corps (comparaison par identité)
         for autre_corps in self.systeme.obtenir_tous_corps():
-            if autre_corps != corps:
+            if autre_corps is not corps:
                 force = self.systeme.calculer_gravite(corps, autre_corps)
                 force_totale += force
         
@@ -42,25 +94,118 @@ class Simulation:
         Args:
             duree (float): Durée en secondes sur laquelle faire avancer la simulation
         """
-        nombre_iterations = int(duree / self.dt)
+        # Une durée calculée comme n * dt peut être arrondie juste en dessous de n pas
+        nombre_iterations = int(duree / self.dt + 1e-9)
+        instrumentation = self.instrumentation
+        modele_forces = self.modele_forces
+        diagnostics = self.diagnostics
+        collisions = self.collisions
+        traceur = self.traceur
+        horloge = time.perf_counter_ns
+        debut_simulation = horloge()
+        
+        # L'état des corps est lu et écrit dans les tableaux du système, une ligne par corps
+        systeme = self.systeme
+        corps_liste = systeme.synchroniser()
+        forces = np.zeros((len(corps_liste), 3))
         
         for _ in range(nombre_iterations):
-            # Calcul des forces sur tous les corps
-            forces = {}
-            for corps in self.systeme.obtenir_tous_corps():
-                forces[corps] = self.calculer_forces(corps)
+            debut_pas = horloge()
+            
+            # Accélérations de tous les corps, rangées à l'indice de chaque corps
+            if modele_forces is not None:
+                accelerations = modele_forces.accelerations(systeme, traceur)
+            else:
+                for indice, corps in enumerate(corps_liste):
+                    forces[indice] = self.calculer_forces(corps)
+                accelerations = forces / systeme.masses[:, np.newaxis]
+            
+            fin_forces = horloge()
+            traceur.enregistrer('forces', debut_pas, fin_forces)
+            
+            # Quantités conservées de l'état courant ; le viriel n'est valable que pour
+            # les forces de gravitation seules, sinon l'énergie potentielle est recalculée
+            debut_kick = fin_forces
+            if diagnostics is not None and diagnostics.echeance():
+                if modele_forces is None:
+                    gravitation = forces
+                elif modele_forces.gravitation_seule:
+                    gravitation = accelerations * systeme.masses[:, np.newaxis]
+                else:
+                    gravitation = None
+                diagnostics.mesurer(self, gravitation)
+                debut_kick = horloge()
+                traceur.enregistrer('diagnostics', fin_forces, debut_kick)
             
-            # Mise à jour des vitesses
-            for corps, force in forces.items():
-                delta_vitesse = self.systeme.calculer_acceleration(corps, force, self.dt)
-                corps.vitesse += delta_vitesse
+            # Mise à jour des vitesses (Δv = a * dt)
+            systeme.vitesses += accelerations * self.dt
             
-            # Mise à jour des positions
-            for corps in self.systeme.obtenir_tous_corps():
-                self.systeme.mettre_a_jour_position(corps, self.dt)
+            fin_kick = horloge()
+            traceur.enregistrer('kick', debut_kick, fin_kick)
+            
+            # Mise à jour des positions (r(t+dt) = r(t) + v(t) * dt)
+            if collisions is not None:
+                collisions.memoriser_debut(systeme.positions)
+            systeme.positions += systeme.vitesses * self.dt
+            
+            fin_drift = horloge()
+            traceur.enregistrer('drift', fin_kick, fin_drift)
             
             # Mise à jour du temps
             self.temps += self.dt
+            
+            # Fusion des corps qui se sont touchés pendant le pas : les lignes restantes sont compactées
+            if collisions is not None:
+                if collisions.traiter(self):
+                    corps_liste = systeme.corps_indexes
+                    forces = forces[:len(corps_liste)]
+                traceur.enregistrer('collisions', fin_drift, horloge())
+            
+            if self.conserver_etats:
+                self.memoriser_etat()
+            
+            if instrumentation is not None:
+                instrumentation.apres_pas(self, (horloge() - debut_pas) * 1e-9,
+                                          (fin_forces - debut_pas) * 1e-9, len(corps_liste))
+        
+        traceur.enregistrer('simuler', debut_simulation, horloge())
+    
+    def activer_interpolation(self) -> None:
+        """Conserve les deux derniers états pour l'interpolation de l'affichage."""
+        self.conserver_etats = True
+        self.etat_precedent = None
+        self.memoriser_etat()
+    
+    def memoriser_etat(self) -> None:
+        """Enregistre l'état courant et décale l'état précédent."""
+        self.systeme.synchroniser()
+        self.etat_precedent = self.etat_courant
+        self.etat_courant = (self.temps, self.systeme.positions.copy(), self.systeme.vitesses.copy(),
+                             self.systeme.version_lignes)
+    
+    def positions_interpolees(self, temps: float) -> Optional[np.ndarray]:
+        """Retourne les positions des corps à un instant situé entre les deux derniers états.
+        
+        L'instant est ramené dans l'intervalle des deux derniers états. Si un seul
+        état est connu, ou si des corps ont été ajoutés, retirés ou ont changé de
+        ligne entre les deux états, les positions du dernier état sont retournées.
+        
+        Args:
+            temps (float): Instant en secondes
+            
+        Returns:
+            Optional[np.ndarray]: Positions (N, 3) dans l'ordre de obtenir_tous_corps(),
+            ou None si aucun état n'a été mémorisé
+        """
+        if self.etat_courant is None:
+            return None
+        t1, p1, v1, version = self.etat_courant
+        if self.etat_precedent is None or self.etat_precedent[3] != version or temps >= t1:
+            return p1.copy()
+        t0, p0, v0, _ = self.etat_precedent
+        h = t1 - t0
+        s = min(max((temps - t0) / h, 0.0), 1.0)
+        return interpoler_hermite(p0, v0, p1, v1, h, s)
     
     def obtenir_temps(self) -> float:
         """Retourne le temps écoulé depuis le début de la simulation.
@@ -0,0 +1,133 @@
+import json
+import time
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List
+import numpy as np
+
+
+class Traceur:
+    """Enregistreur d'intervalles nommés exportables au format Chrome trace-event.
+
+    Les intervalles sont écrits dans des tableaux préalloués utilisés comme un
+    tampon circulaire : l'enregistrement n'alloue pas de mémoire et, lorsque le
+    tampon est plein, les intervalles les plus anciens sont remplacés. Les
+    horodatages proviennent de time.perf_counter_ns.
+    """
+
+    actif = True
+
+    def __init__(self, capacite: int = 1 << 20):
+        """Initialise un tampon vide.
+
+        Args:
+            capacite (int): Nombre maximal d'intervalles conservés
+        """
+        self.capacite = capacite
+        self.debuts = np.zeros(capacite, dtype=np.int64)  # ns
+        self.durees = np.zeros(capacite, dtype=np.int64)  # ns
+        self.noms = np.zeros(capacite, dtype=np.int32)  # Indices dans _noms
+        self.fils = np.zeros(capacite, dtype=np.int64)  # Identifiants système des fils
+        self.nb_enregistres = 0  # Nombre total d'intervalles enregistrés, perdus compris
+        self._identifiants: Dict[str, int] = {}
+        self._noms: List[str] = []
+        self._origine = time.perf_counter_ns()
+
+    @property
+    def nb_perdus(self) -> int:
+        """Retourne le nombre d'intervalles remplacés faute de place."""
+        return max(self.nb_enregistres - self.capacite, 0)
+
+    def enregistrer(self, nom: str, debut: int, fin: int) -> None:
+        """Enregistre un intervalle terminé dans le fil appelant.
+
+        Args:
+            nom (str): Nom de l'intervalle
+            debut (int): Début, en ns de time.perf_counter_ns
+            fin (int): Fin, en ns de time.perf_counter_ns
+        """
+        identifiant = self._identifiants.get(nom)
+        if identifiant is None:
+            identifiant = self._identifiants[nom] = len(self._noms)
+            self._noms.append(nom)
+        i = self.nb_enregistres % self.capacite
+        self.debuts[i] = debut
+        self.durees[i] = fin - debut
+        self.noms[i] = identifiant
+        self.fils[i] = threading.get_native_id()
+        self.nb_enregistres += 1
+
+    @contextmanager
+    def span(self, nom: str):
+        """Enregistre la durée d'un bloc.
+
+        Args:
+            nom (str): Nom de l'intervalle
+        """
+        debut = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.enregistrer(nom, debut, time.perf_counter_ns())
+
+    def evenements(self) -> List[tuple]:
+        """Retourne les intervalles conservés, dans l'ordre d'enregistrement.
+
+        Returns:
+            List[tuple]: Tuples (nom, début en ns, durée en ns, fil)
+        """
+        nombre = min(self.nb_enregistres, self.capacite)
+        ordre = (np.arange(nombre) + self.nb_enregistres - nombre) % self.capacite
+        return [(self._noms[n], d, t, f) for n, d, t, f in zip(self.noms[ordre].tolist(), self.debuts[ordre].tolist(),
+                                                               self.durees[ordre].tolist(), self.fils[ordre].tolist())]
+
+    def exporter_chrome(self, chemin: str) -> None:
+        """Écrit les intervalles au format JSON Chrome trace-event.
+
+        Le fichier s'ouvre dans Perfetto (ui.perfetto.dev) ou chrome://tracing.
+        Les horodatages sont relatifs à la création du traceur.
+
+        Args:
+            chemin (str): Chemin du fichier JSON
+        """
+        noms_fils = {fil.native_id: fil.name for fil in threading.enumerate()}
+        evenements = self.evenements()
+        with open(chemin, 'w', encoding='utf-8') as f:
+            f.write('{"displayTimeUnit": "ns", "otherData": ')
+            json.dump({'perdus': self.nb_perdus}, f)
+            f.write(', "traceEvents": [\n')
+            lignes = [json.dumps({'ph': 'M', 'name': 'thread_name', 'pid': 1, 'tid': fil,
+                                  'args': {'name': noms_fils.get(fil, str(fil))}})
+                      for fil in sorted({e[3] for e in evenements})]
+            # Horodatages et durées en microsecondes, avec la précision de la nanoseconde
+            lignes += [f'{{"ph": "X", "name": {json.dumps(nom)}, "pid": 1, "tid": {fil}, '
+                       f'"ts": {(debut - self._origine) / 1000:.3f}, "dur": {duree / 1000:.3f}}}'
+                       for nom, debut, duree, fil in evenements]
+            f.write(',\n'.join(lignes))
+            f.write('\n]}\n')
+
+
+class TraceurNul:
+    """Traceur inactif, utilisé par défaut : aucun intervalle n'est enregistré."""
+
+    actif = False
+
+    def enregistrer(self, nom: str, debut: int, fin: int) -> None:
+        """Ignore un intervalle.
+
+        Args:
+            nom (str): Nom de l'intervalle
+            debut (int): Début en ns
+            fin (int): Fin en ns
+        """
+
+    def span(self, nom: str):
+        """Retourne un contexte sans effet.
+
+        Args:
+            nom (str): Nom de l'intervalle
+        """
+        return nullcontext()
+
+
+TRACEUR_NUL = TraceurNul()
@@ -1,22 +1,37 @@
+import time
+import operator
 import pygame
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Tuple, Dict, List
+from typing import Tuple, Dict, List, Union
 from src.modele import SystemeSolaire, CorpsCeleste
+from src.cache_rendu import CacheRendu
+from src.grille_spatiale import GrilleSpatiale
+from src.qualite import ControleurQualite
+from src.orbites import elements_orbitaux, points_orbites
+from src.profileur import ProfileurImages
+from src.traceur import TRACEUR_NUL
 
 
 class Visualisation:
     """Classe gérant l'affichage 2D du système solaire."""
     
-    def __init__(self, largeur: int = 800, hauteur: int = 600, duree_trajectoire: float = 365.0):
+    def __init__(self, largeur: int = 800, hauteur: int = 600, duree_trajectoire: float = 365.0,
+                 seuil_points: int = 2000, seuil_densite: int = 100000):
         """Initialise la visualisation.
         
         Args:
             largeur (int): Largeur de la fenêtre en pixels
             hauteur (int): Hauteur de la fenêtre en pixels
             duree_trajectoire (float): Durée de conservation des trajectoires en jours
+            seuil_points (int): Nombre de corps au-delà duquel les petits corps sont
+                affichés comme des points écrits directement dans les pixels de l'écran
+            seuil_densite (int): Nombre de corps à partir duquel les petits corps sont
+                affichés sous forme de carte de densité
         """
-        pygame.init()
+        # Seuls l'affichage et les polices servent : ni son ni manettes
+        pygame.display.init()
+        pygame.font.init()
         self.ecran = pygame.display.set_mode((largeur, hauteur), pygame.RESIZABLE)
         pygame.display.set_caption("Simulation du Système Solaire")
         self.largeur = largeur
@@ -28,14 +43,73 @@ class Visualisation:
         self.date_debut = datetime.now()  # Date de début de la simulation (date actuelle)
         self.en_pause = False  # État de pause de la simulation
         self.echelle_courante = None  # Échelle actuelle pour l'affichage
+        self.echelle_fixe = None  # Échelle imposée, remplaçant le calcul automatique si définie
         self._dernier_systeme = None  # Dernier système affiché
-        self.police = pygame.font.Font(None, 36)
+        self.cache_rendu = CacheRendu()  # Polices et textes rendus réutilisés d'une image à l'autre
+        self._texte_date = None  # Couple (chaîne, surface) de la date affichée
+        self._cache_attributs = None  # Rayons, masses et couleurs de la dernière liste de corps
+        self.grille_etiquettes = GrilleSpatiale()  # Évite le chevauchement des noms
+        self.seuil_points = seuil_points
+        self.masse_min_detail = 1e23  # Masse (kg) à partir de laquelle une planète reste détaillée
+        
+        # Carte de densité des petits corps
+        self.seuil_densite = seuil_densite
+        self.mode_densite = None  # None : automatique selon seuil_densite, sinon forcé
+        self.lissage_densite = 0.5  # Part de la carte précédente conservée (0 : aucun lissage)
+        self._densite_lissee = None
+        self._echelle_densite = None
+        self._couche_densite = None
+        self._palette_densite_pixels = None  # Palette convertie au format des pixels de l'écran
+        self._nb_corps_affiches = 0
+        self.palette_densite = self.creer_palette_densite()
+        
+        # Dégradation automatique de la qualité selon le budget de temps par image
+        self.qualite = ControleurQualite()
+        
+        # Profileur des images et son panneau d'affichage
+        self.profileur = ProfileurImages()
+        self.afficher_profileur = False
+        self.periode_profileur = 15  # Nombre d'images entre deux mises à jour des textes du panneau
+        self._textes_profileur: List[Tuple[pygame.Surface, pygame.Surface]] = []
+        self._fond_profileur = None
+        
+        # Traceur de l'affichage, de ses phases et des événements, inactif par défaut
+        self.traceur = TRACEUR_NUL
+        
+        # Diagnostics des quantités conservées affichés en bas de l'écran, s'ils sont suivis
+        self.diagnostics = None
+        
+        # Couche persistante des trajectoires : seuls les nouveaux segments y sont tracés
+        self.couche_trajectoires = None
+        self._echelle_couche = None  # Échelle avec laquelle la couche a été tracée
+        self._temps_dernier_estompage = None  # Temps (jours) du dernier estompage
+        self._reste_estompage = 0.0  # Fraction d'alpha non encore retirée
+        self.periode_estompage = 10  # Nombre d'images entre deux passes d'estompage
+        self._compteur_images = 0
+        
+        # Ellipses des orbites, tracées à partir des éléments osculateurs
+        self.afficher_orbites = False
+        self.periode_orbites = 10  # Nombre d'images entre deux calculs des éléments
+        self.seuil_orbites = 1e-3  # Variation relative des éléments entraînant le recalcul d'une ellipse
+        self.nb_points_orbite = 128
+        self._orbites: Dict[CorpsCeleste, Tuple[np.ndarray, np.ndarray]] = {}  # Éléments et points par corps
+        self._centre_orbites = None  # Indice de l'étoile autour de laquelle les orbites sont tracées
+        self._etoile_orbites = None  # Étoile de cet indice lors du dernier calcul
+        
+        # Grille pré-rendue, régénérée seulement si l'échelle ou la taille change
+        self._couche_grille = None
+        self._cle_grille = None
         
         # Couleurs
         self.NOIR = (0, 0, 0)
         self.BLANC = (255, 255, 255)
         self.GRIS = (80, 80, 80)
     
+    @property
+    def police(self) -> pygame.font.Font:
+        """pygame.font.Font: Police de la date, chargée à sa première utilisation."""
+        return self.cache_rendu.police(36)
+    
     def couleur_pastel(self, couleur: Tuple[int, int, int]) -> Tuple[int, int, int]:
         """Convertit une couleur en sa version pastel.
         
@@ -54,11 +128,147 @@ class Visualisation:
             int((b + 255) / 2)
         )
     
-    def calculer_echelle(self, systeme: SystemeSolaire) -> float:
+    def extraire_etat(self, corps_liste: List[CorpsCeleste]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Rassemble les positions, rayons et masses des corps dans des tableaux contigus.
+        
+        Seules les positions sont relues à chaque image. Les rayons, masses et
+        couleurs sont conservés tant que la liste contient les mêmes objets.
+        La collecte des positions reste un parcours des objets CorpsCeleste,
+        de l'ordre de 35 ms pour 10^5 corps : c'est elle qui limite la cadence
+        des très grands essaims.
+        
+        Args:
+            corps_liste (List[CorpsCeleste]): Corps à afficher
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: Positions (N, 3) en mètres,
+            rayons (N,) en mètres et masses (N,) en kg
+        """
+        if not corps_liste:
+            return np.zeros((0, 3)), np.zeros(0), np.zeros(0)
+        _, rayons, masses, _ = self._attributs_corps(corps_liste)
+        return self.extraire_positions(corps_liste), rayons, masses
+    
+    @staticmethod
+    def lignes_etat(corps_liste: List[CorpsCeleste]):
+        """Retrouve les lignes des corps dans les tableaux d'état de leur système.
+        
+        Args:
+            corps_liste (List[CorpsCeleste]): Corps à afficher
+            
+        Returns:
+            Tuple[SystemeSolaire, Union[slice, List[int]]] ou None: Système et indices des
+            corps (tranche complète s'ils sont exactement les lignes des tableaux), ou
+            None si les corps ne sont pas tous rattachés au même système
+        """
+        systeme = getattr(corps_liste[0], 'systeme', None) if corps_liste else None
+        if not isinstance(systeme, SystemeSolaire):
+            return None
+        if systeme.est_indexe(corps_liste):
+            return systeme, slice(None)
+        indices = [corps.indice for corps in corps_liste if corps.systeme is systeme]
+        return (systeme, indices) if len(indices) == len(corps_liste) else None
+    
+    def extraire_positions(self, corps_liste: List[CorpsCeleste]) -> np.ndarray:
+        """Rassemble les positions des corps dans un tableau contigu.
+        
+        Les positions de corps rattachés à un système sont lues en une seule
+        opération dans son tableau des positions.
+        
+        Args:
+            corps_liste (List[CorpsCeleste]): Corps à afficher
+            
+        Returns:
+            np.ndarray: Positions (N, 3) en mètres
+        """
+        if not corps_liste:
+            return np.zeros((0, 3))
+        lignes = self.lignes_etat(corps_liste)
+        if lignes is not None:
+            systeme, indices = lignes
+            return np.array(systeme.positions[indices])
+        return np.concatenate([corps.position for corps in corps_liste]).astype(float).reshape(-1, 3)
+    
+    def extraire_couleurs(self, corps_liste: List[CorpsCeleste]) -> np.ndarray:
+        """Retourne les couleurs des corps sous forme de tableau.
+        
+        Args:
+            corps_liste (List[CorpsCeleste]): Corps à afficher
+            
+        Returns:
+            np.ndarray: Couleurs RGB (N, 3)
+        """
+        return self._attributs_corps(corps_liste)[3]
+    
+    def _attributs_corps(self, corps_liste: List[CorpsCeleste]) -> Tuple:
+        """Retourne les attributs constants des corps, rassemblés en une seule passe.
+        
+        Lorsque la liste des corps change, les trajectoires et les orbites des
+        corps qui n'en font plus partie sont oubliées.
+        
+        Args:
+            corps_liste (List[CorpsCeleste]): Corps à afficher
+            
+        Returns:
+            Tuple: (corps, rayons (N,), masses (N,), couleurs (N, 3))
+        """
+        cache = self._cache_attributs
+        if (cache is not None and len(cache[0]) == len(corps_liste) and
+                all(map(operator.is_, cache[0], corps_liste))):
+            return cache
+        self.oublier_corps_absents(corps_liste)
+        attributs = [(corps.rayon, corps.masse) + tuple(corps.couleur) for corps in corps_liste]
+        tableau = np.array(attributs, dtype=float).reshape(-1, 5)
+        self._cache_attributs = (list(corps_liste), tableau[:, 0].copy(), tableau[:, 1].copy(),
+                                 tableau[:, 2:].astype(np.uint8))
+        return self._cache_attributs
+    
+    def oublier_corps_absents(self, corps_liste: List[CorpsCeleste]) -> None:
+        """Oublie les trajectoires et les orbites des corps retirés du système.
+        
+        Trajectoires et orbites sont associées aux corps et non à leurs lignes :
+        celles des corps restants les suivent lorsqu'ils changent de ligne.
+        
+        Args:
+            corps_liste (List[CorpsCeleste]): Corps affichés
+        """
+        presents = set(map(id, corps_liste))
+        for cache in (self.trajectoires, self._orbites):
+            for corps in [corps for corps in cache if id(corps) not in presents]:
+                del cache[corps]
+    
+    @staticmethod
+    def echelle_pour_distance(distance_max: float, largeur: int, hauteur: int) -> float:
+        """Calcule l'échelle permettant d'afficher une distance au centre donnée.
+        
+        Args:
+            distance_max (float): Distance maximale au centre en mètres
+            largeur (int): Largeur de la fenêtre en pixels
+            hauteur (int): Hauteur de la fenêtre en pixels
+            
+        Returns:
+            float: Échelle en pixels/mètre
+        """
+        # Calcule l'échelle pour que le système tienne dans la fenêtre
+        # avec une marge de 20%
+        marge = 0.2
+        echelle = (min(largeur, hauteur) * (1 - 2 * marge)) / (2 * distance_max)
+        
+        # Ajuste l'échelle pour qu'elle soit dans une plage raisonnable
+        echelle_min = 1e-12
+        echelle_max = 1e-8
+        return max(min(echelle, echelle_max), echelle_min)
+    
+    def calculer_echelle(self, systeme: SystemeSolaire, positions: np.ndarray = None) -> float:
         """Calcule l'échelle appropriée pour afficher tous les corps.
         
+        Les distances et les tests de visibilité sont calculés en une seule
+        opération sur le tableau des positions.
+        
         Args:
             systeme (SystemeSolaire): Système solaire à afficher
+            positions (np.ndarray, optional): Positions (N, 3) des corps, extraites
+                du système si non fournies
             
         Returns:
             float: Échelle en pixels/mètre
@@ -68,29 +278,25 @@ class Visualisation:
             self._dernier_systeme = systeme
             self.echelle_courante = None
         
+        # Échelle imposée (export d'images)
+        if self.echelle_fixe is not None:
+            return self.echelle_fixe
+        
         # Si le système est vide, retourne une échelle par défaut
         if not systeme.etoiles and not systeme.planetes:
             return 1e-10
         
+        if positions is None:
+            positions = self.extraire_positions(systeme.obtenir_tous_corps())
+        
         # Trouve la distance maximale entre les corps
-        distance_max = 0.0
-        for corps in systeme.obtenir_tous_corps():
-            distance = np.linalg.norm(corps.position)
-            distance_max = max(distance_max, distance)
+        distance_max = float(np.sqrt(np.max(np.einsum('ij,ij->i', positions, positions))))
         
         # Si aucune distance n'est trouvée, retourne une échelle par défaut
         if distance_max == 0.0:
             return 1e-10
         
-        # Calcule l'échelle pour que le système tienne dans la fenêtre
-        # avec une marge de 20%
-        marge = 0.2
-        echelle = (min(self.largeur, self.hauteur) * (1 - 2 * marge)) / (2 * distance_max)
-        
-        # Ajuste l'échelle pour qu'elle soit dans une plage raisonnable
-        echelle_min = 1e-12
-        echelle_max = 1e-8
-        nouvelle_echelle = max(min(echelle, echelle_max), echelle_min)
+        nouvelle_echelle = self.echelle_pour_distance(distance_max, self.largeur, self.hauteur)
         
         # Si c'est la première fois qu'on calcule l'échelle
         if self.echelle_courante is None:
@@ -100,31 +306,20 @@ class Visualisation:
         # Si la nouvelle échelle est plus petite (zoom out nécessaire)
         if nouvelle_echelle < self.echelle_courante:
             # Vérifie si un corps sort de la zone d'affichage avec l'échelle courante
-            corps_visible = True
-            for corps in systeme.obtenir_tous_corps():
-                x = corps.position[0] * self.echelle_courante + self.largeur / 2
-                y = corps.position[1] * self.echelle_courante + self.hauteur / 2
-                if (x < self.marge or x > self.largeur - self.marge or 
-                    y < self.marge or y > self.hauteur - self.marge):
-                    corps_visible = False
-                    break
+            x = positions[:, 0] * self.echelle_courante + self.largeur / 2
+            y = positions[:, 1] * self.echelle_courante + self.hauteur / 2
+            hors_zone = ((x < self.marge) | (x > self.largeur - self.marge) |
+                         (y < self.marge) | (y > self.hauteur - self.marge))
             
             # Si un corps n'est plus visible, on applique la nouvelle échelle
-            if not corps_visible:
+            if hors_zone.any():
                 self.echelle_courante = nouvelle_echelle
         
         # Si la nouvelle échelle est plus grande (zoom in possible)
         elif nouvelle_echelle > self.echelle_courante * 2:
             # Vérifie si tous les corps sont dans la moitié centrale de la zone d'affichage
-            tous_proches = True
             zone_centrale = min(self.largeur, self.hauteur) * 0.25  # 25% de la plus petite dimension
-            
-            for corps in systeme.obtenir_tous_corps():
-                x = corps.position[0] * self.echelle_courante
-                y = corps.position[1] * self.echelle_courante
-                if (abs(x) > zone_centrale or abs(y) > zone_centrale):
-                    tous_proches = False
-                    break
+            tous_proches = np.all(np.abs(positions[:, :2]) * self.echelle_courante <= zone_centrale)
             
             # Si tous les corps sont proches, on augmente progressivement l'échelle
             if tous_proches:
@@ -146,9 +341,48 @@ class Visualisation:
         y = int(position[1] * echelle + self.hauteur / 2)
         return (x, y)
     
+    def projeter(self, positions: np.ndarray, echelle: float) -> np.ndarray:
+        """Convertit un tableau de positions en coordonnées d'écran.
+        
+        Équivalent vectorisé de convertir_coordonnees.
+        
+        Args:
+            positions (np.ndarray): Positions (N, 3) en mètres
+            echelle (float): Échelle en pixels/mètre
+            
+        Returns:
+            np.ndarray: Coordonnées (N, 2) en pixels (entiers)
+        """
+        centre = np.array([self.largeur / 2, self.hauteur / 2])
+        return (positions[:, :2] * echelle + centre).astype(int)
+    
+    def calculer_tailles(self, rayons: np.ndarray, echelle: float) -> np.ndarray:
+        """Calcule la taille affichée des corps à partir de leurs rayons.
+        
+        Args:
+            rayons (np.ndarray): Rayons (N,) en mètres
+            echelle (float): Échelle des positions en pixels/mètre
+            
+        Returns:
+            np.ndarray: Rayons (N,) en pixels (entiers)
+        """
+        # Échelle pour la taille des corps (logarithmique)
+        # On utilise une échelle plus petite et on applique une fonction logarithmique
+        echelle_taille = echelle * 100  # Facteur de base plus petit
+        facteur_log = 5.0  # Facteur pour la fonction logarithmique (augmenté de 2.0 à 5.0)
+        tailles = np.log1p(rayons * echelle_taille) * facteur_log
+        
+        # Taille minimale pour la visibilité (2 pixels) et maximale pour éviter
+        # que le soleil n'occupe toute la fenêtre (20% de la plus petite dimension)
+        taille_min = 2
+        taille_max = min(self.largeur, self.hauteur) * 0.2
+        return np.minimum(np.maximum(tailles, taille_min), taille_max).astype(int)
+    
     def ajouter_point_trajectoire(self, corps: CorpsCeleste, position: np.ndarray) -> None:
         """Ajoute un point à la trajectoire d'un corps.
         
+        Si la couche des trajectoires est à jour, seul le nouveau segment y est tracé.
+        
         Args:
             corps (CorpsCeleste): Corps dont on ajoute un point
             position (np.ndarray): Position du point
@@ -156,23 +390,99 @@ class Visualisation:
         if corps not in self.trajectoires:
             self.trajectoires[corps] = []
         
-        self.trajectoires[corps].append((position.copy(), self.temps_actuel))
+        points = self.trajectoires[corps]
+        points.append((position.copy(), self.temps_actuel))
+        
+        # Tracé incrémental du segment ajouté
+        if self.couche_trajectoires is not None and len(points) > 1:
+            self._tracer_segment(corps, points[-2][0], points[-1][0], 255)
+        
         self.nettoyer_trajectoire(corps)
     
     def nettoyer_trajectoire(self, corps: CorpsCeleste) -> None:
         """Nettoie les points de trajectoire plus vieux que duree_trajectoire jours.
         
+        Les points étant ajoutés dans l'ordre chronologique, seuls les points
+        en tête de liste sont examinés.
+        
         Args:
             corps (CorpsCeleste): Corps dont on nettoie la trajectoire
         """
         if corps not in self.trajectoires:
             return
-            
+        
         # Supprime les points plus anciens que duree_trajectoire jours
-        self.trajectoires[corps] = [
-            (pos, temps) for pos, temps in self.trajectoires[corps]
-            if self.temps_actuel - temps <= self.duree_trajectoire
-        ]
+        points = self.trajectoires[corps]
+        nb_expires = 0
+        while (nb_expires < len(points) and
+               self.temps_actuel - points[nb_expires][1] > self.duree_trajectoire):
+            nb_expires += 1
+        if nb_expires:
+            del points[:nb_expires]
+    
+    def _tracer_segment(self, corps: CorpsCeleste, pos1: np.ndarray, pos2: np.ndarray, alpha: int) -> None:
+        """Trace un segment de trajectoire sur la couche des trajectoires.
+        
+        Args:
+            corps (CorpsCeleste): Corps auquel appartient le segment
+            pos1 (np.ndarray): Position de départ en mètres
+            pos2 (np.ndarray): Position d'arrivée en mètres
+            alpha (int): Opacité du segment (0-255)
+        """
+        debut = self.convertir_coordonnees(pos1, self._echelle_couche)
+        fin = self.convertir_coordonnees(pos2, self._echelle_couche)
+        
+        # Élimine les segments entièrement hors de la couche
+        largeur, hauteur = self.couche_trajectoires.get_size()
+        if ((debut[0] < 0 and fin[0] < 0) or (debut[0] >= largeur and fin[0] >= largeur) or
+                (debut[1] < 0 and fin[1] < 0) or (debut[1] >= hauteur and fin[1] >= hauteur)):
+            return
+        
+        couleur = self.couleur_pastel(corps.couleur) + (alpha,)
+        pygame.draw.line(self.couche_trajectoires, couleur, debut, fin, 1)
+    
+    def reconstruire_couche_trajectoires(self, echelle: float) -> None:
+        """Retrace entièrement la couche des trajectoires.
+        
+        Appelée uniquement lorsque l'échelle ou la taille de la fenêtre change.
+        L'opacité de chaque segment est calculée à partir de son âge.
+        
+        Args:
+            echelle (float): Échelle en pixels/mètre
+        """
+        self.couche_trajectoires = pygame.Surface((self.largeur, self.hauteur), pygame.SRCALPHA)
+        self._echelle_couche = echelle
+        self._temps_dernier_estompage = self.temps_actuel
+        self._reste_estompage = 0.0
+        
+        for corps, points in self.trajectoires.items():
+            for i in range(len(points) - 1):
+                age = self.temps_actuel - points[i + 1][1]
+                alpha = int(255 * (1 - age / self.duree_trajectoire))
+                if alpha > 0:
+                    self._tracer_segment(corps, points[i][0], points[i + 1][0], min(alpha, 255))
+    
+    def estomper_couche_trajectoires(self) -> None:
+        """Diminue l'opacité de la couche des trajectoires selon le temps écoulé.
+        
+        Un segment tracé à pleine opacité devient totalement transparent au bout
+        de duree_trajectoire jours, ce qui fait disparaître les segments expirés.
+        """
+        if self.couche_trajectoires is None:
+            return
+        
+        ecoule = self.temps_actuel - self._temps_dernier_estompage
+        self._temps_dernier_estompage = self.temps_actuel
+        if ecoule <= 0:
+            return
+        
+        # Décroissance linéaire de l'alpha, en conservant la partie fractionnaire
+        retrait = 255 * ecoule / self.duree_trajectoire + self._reste_estompage
+        retrait_entier = int(retrait)
+        self._reste_estompage = retrait - retrait_entier
+        if retrait_entier > 0:
+            self.couche_trajectoires.fill((0, 0, 0, min(retrait_entier, 255)),
+                                          special_flags=pygame.BLEND_RGBA_SUB)
     
     def mettre_a_jour_temps(self, temps: float) -> None:
         """Met à jour le temps actuel.
@@ -182,70 +492,267 @@ class Visualisation:
         """
         self.temps_actuel = temps
     
-    def dessiner_grille(self, echelle: float) -> None:
-        """Dessine une grille de cercles concentriques pour aider à la lisibilité.
+    @staticmethod
+    def calculer_pas_grille(ua_en_pixels: float, rayon_max: float, nb_anneaux: int = 6) -> float:
+        """Calcule l'espacement des cercles de la grille adapté à l'échelle.
+        
+        Le pas est arrondi à une valeur « ronde » (1, 2 ou 5 × 10^k UA) de sorte
+        qu'environ nb_anneaux cercles couvrent la zone visible, quelle que soit
+        la taille du système.
+        
+        Args:
+            ua_en_pixels (float): Taille d'une UA en pixels
+            rayon_max (float): Rayon de la zone à couvrir en pixels
+            nb_anneaux (int): Nombre de cercles souhaité
+            
+        Returns:
+            float: Espacement des cercles en UA
+        """
+        pas_brut = rayon_max / ua_en_pixels / nb_anneaux
+        puissance = 10.0 ** np.floor(np.log10(pas_brut))
+        for facteur in (1.0, 2.0, 5.0, 10.0):
+            if facteur * puissance >= pas_brut:
+                return facteur * puissance
+        return 10.0 * puissance
+    
+    def generer_grille(self, echelle: float) -> pygame.Surface:
+        """Génère la surface de la grille de cercles concentriques.
         
         Args:
             echelle (float): Échelle en pixels/mètre
+            
+        Returns:
+            pygame.Surface: Surface opaque (fond noir) contenant la grille
         """
         # Couleur de la grille (gris plus foncé)
         GRIS = (40, 40, 40)
         
+        surface = pygame.Surface((self.largeur, self.hauteur))
+        surface.fill(self.NOIR)
+        
         # Centre de l'écran
         centre_x = self.largeur // 2
         centre_y = self.hauteur // 2
         
-        # Rayon de la plus grande orbite visible (Mars : 1.524 UA)
-        max_rayon = 2.0  # UA
-        
-        # Nombre de cercles à dessiner
-        nb_cercles = int(max_rayon * 3)  # 1 cercle par 1/3 d'UA
+        # Rayon de la zone visible (distance du centre à un coin)
+        rayon_max = np.hypot(self.largeur, self.hauteur) / 2
         
         # Conversion UA en pixels
         ua_en_pixels = 149597870700 * echelle  # 1 UA = 149597870700 mètres
         
-        # Police pour les légendes
-        font = pygame.font.Font(None, 20)
-        
         # Dessine les cercles concentriques et les légendes
-        for i in range(1, nb_cercles + 1):
-            rayon = (i / 3) * ua_en_pixels  # Rayon en pixels
-            pygame.draw.circle(self.ecran, GRIS, (centre_x, centre_y), int(rayon), 1)
-            
-            # Affichage de la légende sur l'axe Y
-            distance_ua = i / 3  # Distance en UA
-            texte = font.render(f"{distance_ua:.1f} UA", True, GRIS)
-            # Position du texte à droite du cercle sur l'axe Y
-            self.ecran.blit(texte, (centre_x + int(rayon) + 5, centre_y - 10))
+        rayon_grille = 0.0
+        if ua_en_pixels > 0:
+            pas_ua = self.calculer_pas_grille(ua_en_pixels, rayon_max)
+            i = 1
+            while i * pas_ua * ua_en_pixels <= rayon_max:
+                rayon_grille = i * pas_ua * ua_en_pixels  # Rayon en pixels
+                pygame.draw.circle(surface, GRIS, (centre_x, centre_y), int(rayon_grille), 1)
+                
+                # Affichage de la légende sur l'axe Y
+                texte = self.cache_rendu.texte(f"{i * pas_ua:.3g} UA", GRIS, 20)
+                # Position du texte à droite du cercle sur l'axe Y
+                surface.blit(texte, (centre_x + int(rayon_grille) + 5, centre_y - 10))
+                i += 1
         
-        # Dessine les lignes radiales
+        # Dessine les lignes radiales jusqu'au dernier cercle
         for angle in range(0, 360, 45):  # Lignes tous les 45 degrés
             rad = np.radians(angle)
-            x = centre_x + int(max_rayon * ua_en_pixels * np.cos(rad))
-            y = centre_y + int(max_rayon * ua_en_pixels * np.sin(rad))
-            pygame.draw.line(self.ecran, GRIS, (centre_x, centre_y), (x, y), 1)
+            x = centre_x + int(rayon_grille * np.cos(rad))
+            y = centre_y + int(rayon_grille * np.sin(rad))
+            pygame.draw.line(surface, GRIS, (centre_x, centre_y), (x, y), 1)
+        
+        return surface
     
-    def afficher(self, systeme: SystemeSolaire) -> None:
+    def dessiner_grille(self, echelle: float) -> None:
+        """Dessine une grille de cercles concentriques pour aider à la lisibilité.
+        
+        La grille est générée une seule fois pour une échelle et une taille de
+        fenêtre données, puis recopiée à chaque image. Sa surface étant opaque,
+        elle remplace le fond de l'écran.
+        
+        Args:
+            echelle (float): Échelle en pixels/mètre
+        """
+        cle = (echelle, self.largeur, self.hauteur)
+        if self._couche_grille is None or self._cle_grille != cle:
+            self._couche_grille = self.generer_grille(echelle)
+            self._cle_grille = cle
+        self.ecran.blit(self._couche_grille, (0, 0))
+    
+    def afficher(self, systeme: SystemeSolaire, positions: np.ndarray = None) -> None:
         """Affiche le système solaire.
         
+        La durée de chaque phase du rendu est mesurée par le contrôleur de
+        qualité, qui réduit le niveau de détail si le budget par image est dépassé.
+        
         Args:
             systeme (SystemeSolaire): Système solaire à afficher
+            positions (np.ndarray, optional): Positions (N, 3) à afficher à la place des
+                positions courantes des corps, par exemple interpolées entre deux pas
         """
-        # Calcul de l'échelle pour les positions
-        echelle_position = self.calculer_echelle(systeme)
+        debut_image = time.perf_counter_ns()
+        qualite = self.qualite.parametres
+        self.qualite.durees_phases.clear()
         
-        # Échelle pour la taille des corps (logarithmique)
-        # On utilise une échelle plus petite et on applique une fonction logarithmique
-        echelle_taille = echelle_position * 100  # Facteur de base plus petit
-        facteur_log = 5.0  # Facteur pour la fonction logarithmique (augmenté de 2.0 à 5.0)
+        with self.qualite.phase('echelle'):
+            # Récupération des corps et de leur état sous forme de tableaux
+            corps_liste = systeme.obtenir_tous_corps()
+            if positions is None:
+                positions, rayons, masses = self.extraire_etat(corps_liste)
+            else:
+                _, rayons, masses, _ = self._attributs_corps(corps_liste)
+            
+            # Calcul de l'échelle pour les positions
+            echelle_position = self.calculer_echelle(systeme, positions)
+            
+            # Projection et tailles de tous les corps en une seule opération
+            coordonnees = self.projeter(positions, echelle_position)
+            tailles = self.calculer_tailles(rayons, echelle_position)
         
-        # Efface l'écran
-        self.ecran.fill(self.NOIR)
+        with self.qualite.phase('grille'):
+            # Dessine la grille (qui remplace le fond) seulement si le système n'est pas vide
+            # et si le niveau de qualité le permet, sinon efface l'écran
+            if corps_liste and qualite['grille']:
+                self.dessiner_grille(echelle_position)
+            else:
+                self.ecran.fill(self.NOIR)
         
-        # Dessine la grille seulement si le système n'est pas vide
-        if systeme.obtenir_tous_corps():
-            self.dessiner_grille(echelle_position)
+        with self.qualite.phase('hud'):
+            self.afficher_hud()
         
+        # Séparation des corps détaillés et des corps affichés comme des points
+        self._nb_corps_affiches = len(corps_liste)
+        densite = self.densite_active(len(corps_liste))
+        if qualite['points']:
+            # Qualité minimale : seules les étoiles restent détaillées
+            detailles = np.zeros(len(corps_liste), dtype=bool)
+            detailles[:len(systeme.etoiles)] = True
+        else:
+            detailles = self.selectionner_corps_detailles(systeme, masses, True if densite else None)
+        indices_detailles = np.flatnonzero(detailles)
+        
+        with self.qualite.phase('trajectoires'):
+            # Reconstruction de la couche des trajectoires si l'échelle ou la taille a changé
+            if (self.couche_trajectoires is None or echelle_position != self._echelle_couche or
+                    self.couche_trajectoires.get_size() != (self.largeur, self.hauteur)):
+                self.reconstruire_couche_trajectoires(echelle_position)
+            
+            # Ajout des nouveaux points (seuls les nouveaux segments sont tracés) ;
+            # les ellipses des orbites remplacent les trajectoires lorsqu'elles sont affichées
+            self._compteur_images += 1
+            if not self.afficher_orbites and self._compteur_images % qualite['pas_trajectoire'] == 0:
+                for i in indices_detailles.tolist():
+                    self.ajouter_point_trajectoire(corps_liste[i], positions[i])
+            
+            # Estompage périodique des segments anciens
+            if self._compteur_images % self.periode_estompage == 0:
+                self.estomper_couche_trajectoires()
+            
+            # Affichage des trajectoires
+            self.ecran.blit(self.couche_trajectoires, (0, 0))
+        
+        if self.afficher_orbites:
+            with self.qualite.phase('orbites'):
+                # Recalcul périodique, ou immédiat si l'étoile centrale a changé de ligne
+                centre = self._centre_orbites
+                if (not self._orbites or self._compteur_images % self.periode_orbites == 0 or
+                        centre >= len(corps_liste) or corps_liste[centre] is not self._etoile_orbites):
+                    self.mettre_a_jour_orbites(systeme, corps_liste, positions, masses, indices_detailles)
+                self.dessiner_orbites(positions, echelle_position)
+        
+        with self.qualite.phase('corps'):
+            # Affichage des petits corps sous forme de carte de densité ou de points
+            if len(indices_detailles) < len(corps_liste):
+                indices_points = np.flatnonzero(~detailles)
+                if densite:
+                    self.dessiner_densite(positions[indices_points], echelle_position)
+                else:
+                    couleurs = self.extraire_couleurs(corps_liste)[indices_points]
+                    self.dessiner_points(coordonnees[indices_points], couleurs)
+            
+            # Élimination des corps détaillés entièrement hors de la fenêtre
+            x, y = coordonnees[indices_detailles, 0], coordonnees[indices_detailles, 1]
+            t = tailles[indices_detailles]
+            visibles = indices_detailles[(x + t >= 0) & (x - t < self.largeur) &
+                                         (y + t >= 0) & (y - t < self.hauteur)]
+            
+            # Affichage des corps célestes visibles
+            for i in visibles.tolist():
+                pygame.draw.circle(self.ecran, corps_liste[i].couleur, coordonnees[i].tolist(), int(tailles[i]))
+        
+        with self.qualite.phase('etiquettes'):
+            # Affichage des noms des corps visibles, par masse décroissante
+            ordre = visibles[np.argsort(-masses[visibles], kind='stable')]
+            if qualite['max_etiquettes'] is not None:
+                ordre = ordre[:qualite['max_etiquettes']]
+            self.afficher_etiquettes(corps_liste, coordonnees, tailles, ordre)
+        
+        if self.afficher_profileur:
+            with self.qualite.phase('profileur'):
+                self.dessiner_profileur()
+        
+        with self.qualite.phase('flip'):
+            # Mise à jour de l'affichage
+            pygame.display.flip()
+        
+        fin_image = time.perf_counter_ns()
+        self.traceur.enregistrer('afficher', debut_image, fin_image)
+        self.qualite.mettre_a_jour((fin_image - debut_image) * 1e-9)
+        self.profileur.enregistrer_image(self.qualite.durees_phases)
+    
+    def activer_trace(self, traceur) -> None:
+        """Enregistre l'affichage, chacune de ses phases et le traitement des événements.
+        
+        Args:
+            traceur (Traceur): Traceur recevant les intervalles
+        """
+        self.traceur = traceur
+        self.qualite.traceur = traceur
+    
+    def dessiner_profileur(self) -> None:
+        """Affiche le panneau du profileur : cadence, pas simulés et durée de chaque phase.
+        
+        Le graphique des intervalles entre images est retracé à chaque image ; les
+        textes ne sont rendus que toutes les periode_profileur images.
+        """
+        largeur, hauteur_graphe, interligne = 240, 60, 16
+        if not self._textes_profileur or self._compteur_images % self.periode_profileur == 0:
+            police = self.cache_rendu.police(18)
+            lignes = [(f"{self.profileur.images_par_seconde():.1f} images/s",
+                       f"{self.profileur.pas_par_seconde():.0f} pas/s")]
+            lignes += [(phase, f"{duree * 1000:.2f} ms")
+                       for phase, duree in self.profileur.durees_moyennes().items()]
+            self._textes_profileur = [(police.render(gauche, True, self.BLANC), police.render(droite, True, self.BLANC))
+                                      for gauche, droite in lignes]
+        
+        hauteur = hauteur_graphe + 15 + interligne * len(self._textes_profileur)
+        if self._fond_profileur is None or self._fond_profileur.get_size() != (largeur, hauteur):
+            self._fond_profileur = pygame.Surface((largeur, hauteur), pygame.SRCALPHA)
+            self._fond_profileur.fill((0, 0, 0, 180))
+        x0, y0 = self.largeur - largeur - 10, 50
+        self.ecran.blit(self._fond_profileur, (x0, y0))
+        
+        # Graphique glissant des intervalles entre images (haut du graphique : deux budgets)
+        nb_images = 120
+        duree_max = 2 * self.qualite.budget
+        y_budget = y0 + 5 + hauteur_graphe // 2
+        pygame.draw.line(self.ecran, self.GRIS, (x0 + 5, y_budget), (x0 + largeur - 5, y_budget), 1)
+        intervalles = self.profileur.intervalles(nb_images)
+        if len(intervalles) > 1:
+            x = x0 + 5 + np.arange(len(intervalles)) * ((largeur - 10) / (nb_images - 1))
+            y = y0 + 5 + hauteur_graphe * (1 - np.minimum(intervalles / duree_max, 1.0))
+            pygame.draw.lines(self.ecran, (120, 220, 120), False, np.column_stack([x, y]).tolist(), 1)
+        
+        # Textes : cadence et pas simulés, puis durée moyenne de chaque phase
+        y = y0 + hauteur_graphe + 10
+        for gauche, droite in self._textes_profileur:
+            self.ecran.blit(gauche, (x0 + 5, y))
+            self.ecran.blit(droite, (x0 + largeur - 5 - droite.get_width(), y))
+            y += interligne
+    
+    def afficher_hud(self) -> None:
+        """Affiche la date, l'état de pause, la dérive des quantités conservées et le niveau de qualité."""
         # Calcul de la date actuelle
         jours_entiers = int(self.temps_actuel)
         fraction_jour = self.temps_actuel - jours_entiers
@@ -257,70 +764,283 @@ class Visualisation:
         date_actuelle = self.date_debut + timedelta(days=jours_entiers)
         date_str = date_actuelle.strftime("%d/%m/%Y") + f" {heures:02d}:{minutes:02d}:{secondes:02d}"
         
-        # Affichage de la date
-        texte_date = self.police.render(date_str, True, self.BLANC)
-        self.ecran.blit(texte_date, (10, 10))
+        # Affichage de la date (rendue uniquement lorsqu'elle change)
+        if self._texte_date is None or self._texte_date[0] != date_str:
+            self._texte_date = (date_str, self.police.render(date_str, True, self.BLANC))
+        self.ecran.blit(self._texte_date[1], (10, 10))
         
         # Affichage de l'état de pause
         if self.en_pause:
-            texte_pause = self.police.render("PAUSE", True, self.BLANC)
+            texte_pause = self.cache_rendu.texte("PAUSE", self.BLANC, 36)
             self.ecran.blit(texte_pause, (self.largeur - 100, 10))
         
-        # Affichage des trajectoires
-        for corps, points in self.trajectoires.items():
-            if len(points) > 1:
-                # Dessine les lignes de la trajectoire avec la couleur pastel
-                couleur_trajectoire = self.couleur_pastel(corps.couleur)
-                for i in range(len(points) - 1):
-                    pos1 = self.convertir_coordonnees(points[i][0], echelle_position)
-                    pos2 = self.convertir_coordonnees(points[i + 1][0], echelle_position)
-                    pygame.draw.line(self.ecran, couleur_trajectoire, pos1, pos2, 1)
-        
-        # Affichage des corps célestes
-        for corps in systeme.obtenir_tous_corps():
-            # Conversion des coordonnées avec l'échelle de position
-            pos = self.convertir_coordonnees(corps.position, echelle_position)
-            
-            # Calcul de la taille à l'échelle (en pixels)
-            # On utilise une fonction logarithmique pour la taille
-            taille_reelle = np.log1p(corps.rayon * echelle_taille) * facteur_log
-            
-            # Taille minimale pour la visibilité (2 pixels)
-            taille_min = 2
-            taille = max(taille_reelle, taille_min)
-            
-            # Taille maximale pour éviter que le soleil n'occupe toute la fenêtre
-            taille_max = min(self.largeur, self.hauteur) * 0.2  # 20% de la plus petite dimension
-            taille = min(taille, taille_max)
-            
-            # Dessin du corps
-            pygame.draw.circle(self.ecran, corps.couleur, pos, int(taille))
+        # Dérive des quantités conservées, en rouge au-delà du seuil
+        if self.diagnostics is not None:
+            couleur = (255, 80, 80) if self.diagnostics.derive_excessive else self.GRIS
+            lignes = self.diagnostics.lignes_hud()
+            for k, ligne in enumerate(lignes):
+                texte = self.cache_rendu.texte(ligne, couleur, 20)
+                self.ecran.blit(texte, (10, self.hauteur - 20 * (len(lignes) - k + 1)))
+        
+        # Affichage du niveau de qualité (0 : qualité maximale), si le contrôle est actif
+        if not self.qualite.actif:
+            return
+        texte_qualite = self.cache_rendu.texte(
+            f"Qualité {self.qualite.niveau}/{self.qualite.niveau_max}", self.GRIS, 20)
+        self.ecran.blit(texte_qualite, (10, self.hauteur - 20))
+    
+    def selectionner_corps_detailles(self, systeme: SystemeSolaire, masses: np.ndarray,
+                                     reduire: bool = None) -> np.ndarray:
+        """Sélectionne les corps qui conservent l'affichage détaillé.
+        
+        En dessous de seuil_points corps, tous les corps sont détaillés. Au-delà,
+        seuls les étoiles et les planètes d'au moins masse_min_detail kg le sont,
+        les autres étant affichés comme des points ou une carte de densité.
+        
+        Args:
+            systeme (SystemeSolaire): Système affiché
+            masses (np.ndarray): Masses (N,) des corps, étoiles en premier
+            reduire (bool, optional): Force (True) ou empêche (False) la réduction
+                aux seuls corps massifs, déterminée par seuil_points si None
             
-            # Affichage du nom
-            font = pygame.font.Font(None, 24)
-            texte = font.render(corps.nom, True, self.BLANC)
+        Returns:
+            np.ndarray: Masque booléen (N,) des corps détaillés
+        """
+        if reduire is None:
+            reduire = len(masses) > self.seuil_points
+        if not reduire:
+            return np.ones(len(masses), dtype=bool)
+        detailles = masses >= self.masse_min_detail
+        detailles[:len(systeme.etoiles)] = True
+        return detailles
+    
+    def mettre_a_jour_orbites(self, systeme: SystemeSolaire, corps_liste: List[CorpsCeleste],
+                              positions: np.ndarray, masses: np.ndarray, indices: np.ndarray) -> None:
+        """Recalcule les éléments orbitaux des planètes détaillées autour de l'étoile dominante.
+        
+        Les éléments de toutes les planètes sont calculés en une seule opération ;
+        seules les ellipses dont les éléments ont varié au-delà de seuil_orbites
+        sont rééchantillonnées.
+        
+        Args:
+            systeme (SystemeSolaire): Système affiché
+            corps_liste (List[CorpsCeleste]): Corps affichés, étoiles en premier
+            positions (np.ndarray): Positions (N, 3) affichées en mètres
+            masses (np.ndarray): Masses (N,) en kg
+            indices (np.ndarray): Indices des corps détaillés
+        """
+        nb_etoiles = len(systeme.etoiles)
+        planetes = indices[indices >= nb_etoiles]
+        if nb_etoiles == 0 or len(planetes) == 0:
+            self._orbites = {}
+            return
+        centre = int(np.argmax(masses[:nb_etoiles]))
+        lignes = self.lignes_etat([corps_liste[i] for i in [centre] + planetes.tolist()])
+        if lignes is not None:
+            vitesses = lignes[0].vitesses[lignes[1]]
+        else:
+            vitesses = np.concatenate([corps_liste[i].vitesse for i in [centre] + planetes.tolist()]).astype(float).reshape(-1, 3)
+        elements = elements_orbitaux(positions[planetes] - positions[centre],
+                                     vitesses[1:] - vitesses[0],
+                                     SystemeSolaire.G * (masses[centre] + masses[planetes]))
+        # Résumé comparable d'une mise à jour à l'autre : a, e et direction du périapside
+        resumes = np.column_stack([elements['a'], elements['e'], elements['P']])
+        
+        anciennes = self._orbites if corps_liste[centre] is self._etoile_orbites else {}
+        orbites = {}
+        a_recalculer = []
+        for k, i in enumerate(planetes.tolist()):
+            corps = corps_liste[i]
+            ancienne = anciennes.get(corps)
+            if ancienne is None:
+                a_recalculer.append(k)
+                continue
+            ecart = np.abs(resumes[k] - ancienne[0])
+            ecart[0] /= abs(ancienne[0][0])
+            if ecart.max() > self.seuil_orbites:
+                a_recalculer.append(k)
+            else:
+                orbites[corps] = ancienne
+        
+        if a_recalculer:
+            selection = {cle: valeur[a_recalculer] for cle, valeur in elements.items()}
+            points = points_orbites(selection, self.nb_points_orbite)
+            for j, k in enumerate(a_recalculer):
+                orbites[corps_liste[planetes[k]]] = (resumes[k], points[j])
+        self._orbites = orbites
+        self._centre_orbites = centre
+        self._etoile_orbites = corps_liste[centre]
+    
+    def dessiner_orbites(self, positions: np.ndarray, echelle: float) -> None:
+        """Dessine les ellipses des orbites autour de la position affichée de l'étoile centrale.
+        
+        Args:
+            positions (np.ndarray): Positions (N, 3) affichées en mètres
+            echelle (float): Échelle en pixels/mètre
+        """
+        if self._centre_orbites is None or self._centre_orbites >= len(positions):
+            return
+        centre = positions[self._centre_orbites]
+        for corps, (_, points) in self._orbites.items():
+            if np.isnan(points[0, 0]):
+                continue  # Orbite non liée
+            # Coordonnées bornées pour rester dans la plage acceptée par pygame.draw
+            coordonnees = np.clip(self.projeter(points + centre, echelle), -1e6, 1e6)
+            # Élimine les ellipses entièrement hors de l'écran
+            minimum, maximum = coordonnees.min(axis=0), coordonnees.max(axis=0)
+            if (maximum[0] < 0 or minimum[0] >= self.largeur or
+                    maximum[1] < 0 or minimum[1] >= self.hauteur):
+                continue
+            pygame.draw.lines(self.ecran, self.couleur_pastel(corps.couleur), True, coordonnees.tolist(), 1)
+    
+    def dessiner_points(self, coordonnees: np.ndarray, couleurs: np.ndarray) -> None:
+        """Dessine des corps sous forme de points d'un pixel.
+        
+        Les couleurs sont écrites directement dans le tableau de pixels de
+        l'écran en une seule affectation vectorisée.
+        
+        Args:
+            coordonnees (np.ndarray): Coordonnées (N, 2) en pixels
+            couleurs (np.ndarray): Couleurs RGB (N, 3)
+        """
+        if len(coordonnees) == 0:
+            return
+        x, y = coordonnees[:, 0], coordonnees[:, 1]
+        dans_ecran = (x >= 0) & (x < self.largeur) & (y >= 0) & (y < self.hauteur)
+        pixels = pygame.surfarray.pixels3d(self.ecran)
+        try:
+            pixels[x[dans_ecran], y[dans_ecran]] = couleurs[dans_ecran]
+        finally:
+            # Libère le verrou posé sur la surface
+            del pixels
+    
+    @staticmethod
+    def creer_palette_densite() -> np.ndarray:
+        """Crée la palette de couleurs de la carte de densité.
+        
+        Returns:
+            np.ndarray: Table (256, 3) allant du noir au blanc en passant par
+            le violet, le rouge et le jaune
+        """
+        reperes = np.array([0.0, 0.25, 0.5, 0.75, 1.0])
+        couleurs = np.array([
+            [0, 0, 0],
+            [80, 20, 120],
+            [200, 50, 60],
+            [250, 180, 40],
+            [255, 255, 230]
+        ], dtype=float)
+        t = np.linspace(0.0, 1.0, 256)
+        return np.stack([np.interp(t, reperes, couleurs[:, c]) for c in range(3)], axis=1).astype(np.uint8)
+    
+    def calculer_densite(self, positions: np.ndarray, echelle: float) -> np.ndarray:
+        """Compte le nombre de corps projetés sur chaque pixel de l'écran.
+        
+        La projection est faite axe par axe pour éviter de construire le tableau
+        (N, 2) des coordonnées, puis les pixels sont comptés avec np.bincount.
+        
+        Args:
+            positions (np.ndarray): Positions (N, 3) en mètres
+            echelle (float): Échelle en pixels/mètre
             
-            # Position du texte
+        Returns:
+            np.ndarray: Histogramme (largeur, hauteur) du nombre de corps par pixel
+        """
+        x = positions[:, 0] * echelle
+        x += self.largeur / 2
+        y = positions[:, 1] * echelle
+        y += self.hauteur / 2
+        # Test sur les coordonnées flottantes : la conversion en entiers déborde
+        # pour les corps très éloignés
+        dans_ecran = (x >= 0) & (x < self.largeur) & (y >= 0) & (y < self.hauteur)
+        
+        # Indice linéaire du pixel, dans l'ordre (x, y) de pygame.surfarray
+        indices = x[dans_ecran].astype(np.int32)
+        indices *= self.hauteur
+        indices += y[dans_ecran].astype(np.int32)
+        comptes = np.bincount(indices, minlength=self.largeur * self.hauteur)
+        return comptes.reshape(self.largeur, self.hauteur)
+    
+    def dessiner_densite(self, positions: np.ndarray, echelle: float) -> None:
+        """Dessine les corps sous forme de carte de densité en échelle logarithmique.
+        
+        La carte est lissée dans le temps tant que l'échelle et la taille de la
+        fenêtre ne changent pas, puis ajoutée à l'écran en une seule copie.
+        
+        Args:
+            positions (np.ndarray): Positions (N, 3) en mètres
+            echelle (float): Échelle en pixels/mètre
+        """
+        densite = self.calculer_densite(positions, echelle).astype(np.float32)
+        
+        # Lissage temporel avec la carte précédente
+        if (self.lissage_densite > 0 and self._densite_lissee is not None and
+                self._densite_lissee.shape == densite.shape and self._echelle_densite == echelle):
+            densite *= 1 - self.lissage_densite
+            densite += self.lissage_densite * self._densite_lissee
+        self._densite_lissee = densite
+        self._echelle_densite = echelle
+        
+        # Niveaux logarithmiques normalisés sur le pixel le plus dense
+        maximum = densite.max()
+        if maximum <= 0:
+            return
+        niveaux = np.log1p(densite)
+        niveaux *= 255 / np.log1p(maximum)
+        
+        if self._couche_densite is None or self._couche_densite.get_size() != (self.largeur, self.hauteur):
+            self._couche_densite = pygame.Surface((self.largeur, self.hauteur)).convert(self.ecran)
+            self._palette_densite_pixels = np.array(
+                [self._couche_densite.map_rgb(tuple(c)) for c in self.palette_densite.tolist()], dtype=np.uint32)
+        pygame.surfarray.blit_array(self._couche_densite,
+                                    self._palette_densite_pixels.take(niveaux.astype(np.uint8)))
+        self.ecran.blit(self._couche_densite, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
+    
+    def afficher_etiquettes(self, corps_liste: List[CorpsCeleste], coordonnees: np.ndarray,
+                            tailles: np.ndarray, ordre: np.ndarray) -> None:
+        """Affiche les noms des corps sans qu'ils se chevauchent.
+        
+        Les étiquettes sont placées dans l'ordre de priorité donné ; une étiquette
+        qui chevaucherait une étiquette déjà placée n'est pas affichée.
+        
+        Args:
+            corps_liste (List[CorpsCeleste]): Corps affichés
+            coordonnees (np.ndarray): Coordonnées (N, 2) des corps en pixels
+            tailles (np.ndarray): Rayons (N,) des corps en pixels
+            ordre (np.ndarray): Indices des corps à étiqueter, par priorité décroissante
+        """
+        ecran = pygame.Rect(0, 0, self.largeur, self.hauteur)
+        self.grille_etiquettes.vider()
+        for i in ordre.tolist():
+            corps = corps_liste[i]
+            x, y = coordonnees[i].tolist()
             if corps.nom == "Soleil":
-                # Pour le soleil, on place le texte plus loin et on ajoute un contour noir
-                texte_x = pos[0] + int(taille) + 15  # Plus loin du soleil
-                texte_y = pos[1] - 10
-                # Dessine le contour noir
-                texte_contour = font.render(corps.nom, True, self.NOIR)
-                for dx, dy in [(-1, -1), (-1, 1), (1, -1), (1, 1)]:
-                    self.ecran.blit(texte_contour, (texte_x + dx, texte_y + dy))
+                # Pour le soleil, on place le texte plus loin avec un contour noir
+                texte = self.cache_rendu.texte(corps.nom, self.BLANC, 24, self.NOIR)
+                texte_x = x + int(tailles[i]) + 15 - 1  # Le contour décale la surface d'un pixel
+                texte_y = y - 10 - 1
             else:
-                # Pour les autres corps, on garde le positionnement actuel
-                texte_x = pos[0] + 10
-                texte_y = pos[1] - 10
-            
-            self.ecran.blit(texte, (texte_x, texte_y))
+                # Pour les autres corps, on garde le positionnement habituel
+                texte = self.cache_rendu.texte(corps.nom, self.BLANC, 24)
+                texte_x = x + 10
+                texte_y = y - 10
             
-            # Ajout du point à la trajectoire
-            self.ajouter_point_trajectoire(corps, corps.position)
+            rect = texte.get_rect(topleft=(texte_x, texte_y))
+            if rect.colliderect(ecran) and self.grille_etiquettes.inserer_si_libre(rect):
+                self.ecran.blit(texte, rect)
+    
+    def densite_active(self, nb_corps: int) -> bool:
+        """Indique si la carte de densité est utilisée pour un nombre de corps donné.
         
-        # Mise à jour de l'affichage
-        pygame.display.flip()
+        Args:
+            nb_corps (int): Nombre de corps affichés
+            
+        Returns:
+            bool: True si la carte de densité est active
+        """
+        if self.mode_densite is not None:
+            return self.mode_densite
+        return nb_corps >= self.seuil_densite
     
     def gerer_evenements(self) -> bool:
         """Gère les événements Pygame.
@@ -328,20 +1048,34 @@ class Visualisation:
         Returns:
             bool: True si le programme doit continuer, False sinon
         """
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
+        with self.traceur.span('gerer_evenements'):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
                     return False
-                elif event.key == pygame.K_SPACE:
-                    self.en_pause = not self.en_pause
-            elif event.type == pygame.VIDEORESIZE:
-                # Mise à jour de la taille de la fenêtre
-                self.ecran = pygame.display.set_mode((event.size[0], event.size[1]), pygame.RESIZABLE)
-                self.largeur = event.size[0]
-                self.hauteur = event.size[1]
-        return True
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE:
+                        return False
+                    elif event.key == pygame.K_SPACE:
+                        self.en_pause = not self.en_pause
+                    elif event.key == pygame.K_p:
+                        # Affiche ou masque le panneau du profileur
+                        self.afficher_profileur = not self.afficher_profileur
+                    elif event.key == pygame.K_o:
+                        # Bascule entre les ellipses des orbites et les trajectoires
+                        self.afficher_orbites = not self.afficher_orbites
+                        self._orbites = {}
+                        self.trajectoires.clear()
+                        self.couche_trajectoires = None
+                    elif event.key == pygame.K_d:
+                        # Bascule entre la carte de densité et l'affichage par points
+                        self.mode_densite = not self.densite_active(self._nb_corps_affiches)
+                elif event.type == pygame.VIDEORESIZE:
+                    # Mise à jour de la taille de la fenêtre
+                    self.ecran = pygame.display.set_mode((event.size[0], event.size[1]), pygame.RESIZABLE)
+                    self.largeur = event.size[0]
+                    self.hauteur = event.size[1]
+                    self._couche_grille = None
+            return True
     
     def fermer(self) -> None:
         """Ferme la fenêtre Pygame."""
@@ -0,0 +1,63 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import numpy as np
+from benchmarks import bench_performances
+from benchmarks.bench_performances import comparer, creer_systeme, energie_totale, main
+
+
+class TestBenchmarks(unittest.TestCase):
+    """Tests des mesures de performance et de leur comparaison à la référence."""
+
+    def setUp(self):
+        """Initialisation des tests."""
+        self.resultats = {
+            'simulation/paires/euler_symplectique/N=10': {'valeur': 1000.0, 'unite': 'pas/s', 'sens': 'haut'},
+            'affichage/N=100': {'valeur': 0.010, 'unite': 's/image', 'sens': 'bas'},
+        }
+
+    def test_comparer(self):
+        """Test de la détection des régressions selon le sens de chaque mesure."""
+        self.assertEqual(comparer(self.resultats, self.resultats), [])
+        reference = {
+            'simulation/paires/euler_symplectique/N=10': {'valeur': 1300.0, 'unite': 'pas/s', 'sens': 'haut'},
+            'affichage/N=100': {'valeur': 0.009, 'unite': 's/image', 'sens': 'bas'},
+        }
+        regressions = comparer(self.resultats, reference, seuil=0.2)
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith('simulation/paires/euler_symplectique/N=10'))
+        self.assertEqual(len(comparer(self.resultats, reference, seuil=0.1)), 2)
+
+    def test_comparer_mesure_nouvelle(self):
+        """Test d'une mesure absente de la référence, qui n'est pas une régression."""
+        self.assertEqual(comparer(self.resultats, {}), [])
+
+    def test_energie_totale(self):
+        """Test de l'énergie d'un système lié, négative et conservée par un pas court."""
+        systeme = creer_systeme(5)
+        energie = energie_totale(systeme)
+        self.assertLess(energie, 0)
+        corps = systeme.planetes[0]
+        cinetique = 0.5 * corps.masse * np.dot(corps.vitesse, corps.vitesse)
+        corps.vitesse = corps.vitesse * 2
+        self.assertAlmostEqual(energie_totale(systeme) - energie, 3 * cinetique, delta=abs(energie) * 1e-9)
+
+    def test_main(self):
+        """Test de l'enregistrement de la référence puis du code de sortie en cas de régression."""
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin = os.path.join(dossier, 'reference.json')
+            with patch.object(bench_performances, 'executer', return_value=self.resultats):
+                self.assertEqual(main(['--reference', chemin, '--enregistrer']), 0)
+                self.assertEqual(main(['--reference', chemin]), 0)
+            with open(chemin, encoding='utf-8') as f:
+                self.assertEqual(json.load(f)['resultats'], self.resultats)
+
+            plus_lent = dict(self.resultats, **{'affichage/N=100': dict(self.resultats['affichage/N=100'], valeur=0.02)})
+            with patch.object(bench_performances, 'executer', return_value=plus_lent):
+                self.assertEqual(main(['--reference', chemin]), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import pygame
+from src.cache_rendu import CacheRendu
+
+
+class TestCacheRendu(unittest.TestCase):
+    """Tests pour la classe CacheRendu."""
+    
+    def setUp(self):
+        """Initialisation des tests."""
+        pygame.font.init()
+        self.cache = CacheRendu(taille_max=2)
+    
+    def test_police_creee_une_fois(self):
+        """Test que la police n'est créée qu'une fois par taille."""
+        police = self.cache.police(24)
+        self.assertIs(self.cache.police(24), police)
+        self.assertIsNot(self.cache.police(20), police)
+    
+    def test_texte_en_cache(self):
+        """Test que le texte n'est rendu qu'une fois."""
+        surface = self.cache.texte("Terre", (255, 255, 255), 24)
+        self.assertIs(self.cache.texte("Terre", (255, 255, 255), 24), surface)
+        self.assertEqual(self.cache.echecs, 1)
+        self.assertEqual(self.cache.succes, 1)
+        
+        # Une couleur différente donne une autre surface
+        self.assertIsNot(self.cache.texte("Terre", (0, 0, 0), 24), surface)
+    
+    def test_eviction_lru(self):
+        """Test de l'éviction du texte le moins récemment utilisé."""
+        blanc = (255, 255, 255)
+        terre = self.cache.texte("Terre", blanc, 24)
+        self.cache.texte("Mars", blanc, 24)
+        self.cache.texte("Terre", blanc, 24)  # Terre devient la plus récente
+        self.cache.texte("Venus", blanc, 24)  # Évince Mars
+        
+        self.assertEqual(len(self.cache), 2)
+        self.assertIs(self.cache.texte("Terre", blanc, 24), terre)
+        echecs = self.cache.echecs
+        self.cache.texte("Mars", blanc, 24)
+        self.assertEqual(self.cache.echecs, echecs + 1, "Mars aurait dû être évincé")
+    
+    def test_texte_avec_contour(self):
+        """Test du rendu d'un texte avec contour."""
+        simple = self.cache.texte("Soleil", (255, 255, 255), 24)
+        avec_contour = self.cache.texte("Soleil", (255, 255, 255), 24, (0, 0, 0))
+        largeur, hauteur = simple.get_size()
+        self.assertEqual(avec_contour.get_size(), (largeur + 2, hauteur + 2))
+    
+    def test_vider(self):
+        """Test du vidage du cache."""
+        self.cache.texte("Terre", (255, 255, 255), 24)
+        self.cache.vider()
+        self.assertEqual(len(self.cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
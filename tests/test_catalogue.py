@@ -0,0 +1,107 @@
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.catalogue import parcourir_json, lire_json, enregistrer_npz, charger_npz, perturber_orbites
+from src.generateur import disque_kepler, ecrire_json
+from src.modele import SystemeSolaire
+
+
+class TestCatalogue(unittest.TestCase):
+    """Tests des formats de fichiers et du chargement vectorisé."""
+
+    def setUp(self):
+        """Initialisation des tests."""
+        self.dossier = tempfile.TemporaryDirectory()
+        self.scenario = disque_kepler(50, graine=1)
+
+    def tearDown(self):
+        """Nettoie après chaque test."""
+        self.dossier.cleanup()
+
+    def chemin(self, nom):
+        """Retourne un chemin dans le dossier temporaire."""
+        return os.path.join(self.dossier.name, nom)
+
+    def test_parcourir_json(self):
+        """Test du décodage progressif, y compris avec des blocs coupant les nombres et les objets."""
+        donnees = {'aleatoire': False, 'etoiles': [{'nom': 'Soleil', 'masse': 1.989e30}],
+                   'vide': [], 'planetes': [{'nom': f'P{i}', 'masse': 123456.789 * i} for i in range(20)],
+                   'version': 3}
+        with open(self.chemin('donnees.json'), 'w', encoding='utf-8') as f:
+            json.dump(donnees, f, indent=1)
+
+        for taille_bloc in (1, 7, 1 << 20):
+            elements = list(parcourir_json(self.chemin('donnees.json'), taille_bloc=taille_bloc))
+            self.assertEqual(elements[0], ('aleatoire', False))
+            self.assertEqual([valeur for cle, valeur in elements if cle == 'planetes'], donnees['planetes'])
+            self.assertEqual(elements[-1], ('version', 3))
+            self.assertNotIn('vide', [cle for cle, _ in elements])
+
+    def test_json_invalide(self):
+        """Test d'un fichier invalide, qui lève une erreur de décodage."""
+        for contenu in ('{"etoiles": [{"nom": 1}, }', '[1, 2]', '{"etoiles": [1 2]}'):
+            with open(self.chemin('invalide.json'), 'w', encoding='utf-8') as f:
+                f.write(contenu)
+            with self.assertRaises(json.JSONDecodeError):
+                list(parcourir_json(self.chemin('invalide.json'), taille_bloc=4))
+
+    def test_lire_json(self):
+        """Test de la lecture en colonnes d'un fichier au format des données."""
+        ecrire_json(self.scenario, self.chemin('disque.json'))
+        scenario, aleatoire = lire_json(self.chemin('disque.json'))
+        self.assertFalse(aleatoire)
+        self.assertEqual(scenario['nb_etoiles'], 1)
+        for colonne in ('noms', 'masses', 'positions', 'couleurs'):
+            np.testing.assert_array_equal(scenario[colonne], self.scenario[colonne])
+
+    def test_npz(self):
+        """Test du format binaire en colonnes, projeté en mémoire ou compressé."""
+        enregistrer_npz(self.scenario, self.chemin('disque.npz'))
+        scenario, aleatoire = charger_npz(self.chemin('disque.npz'))
+        self.assertFalse(aleatoire)
+        self.assertIsInstance(scenario['positions'], np.memmap)
+        self.assertEqual(scenario['nb_etoiles'], 1)
+        for colonne in ('noms', 'masses', 'rayons', 'positions', 'vitesses', 'couleurs'):
+            np.testing.assert_array_equal(scenario[colonne], self.scenario[colonne])
+
+        np.savez_compressed(self.chemin('compresse.npz'), nb_etoiles=1, aleatoire=True,
+                            **{nom: self.scenario[nom] for nom in ('noms', 'masses', 'rayons', 'positions',
+                                                                   'vitesses', 'couleurs')})
+        scenario, aleatoire = charger_npz(self.chemin('compresse.npz'))
+        self.assertTrue(aleatoire)
+        np.testing.assert_array_equal(scenario['vitesses'], self.scenario['vitesses'])
+
+    def test_perturber_orbites(self):
+        """Test du tirage vectorisé : distances conservées, vitesses perpendiculaires et graine reproductible."""
+        positions, vitesses = self.scenario['positions'][1:], self.scenario['vitesses'][1:]
+        nouvelles_positions, nouvelles_vitesses = perturber_orbites(positions, vitesses, 0.1, np.random.default_rng(4))
+        np.testing.assert_allclose(np.linalg.norm(nouvelles_positions, axis=1), np.linalg.norm(positions, axis=1))
+        rapport = np.linalg.norm(nouvelles_vitesses, axis=1) / np.linalg.norm(vitesses, axis=1)
+        self.assertTrue(np.all((rapport >= 0.9) & (rapport <= 1.1)))
+        produits = np.einsum('ij,ij->i', nouvelles_positions, nouvelles_vitesses)
+        echelles = np.linalg.norm(nouvelles_positions, axis=1) * np.linalg.norm(nouvelles_vitesses, axis=1)
+        self.assertTrue(np.all(np.abs(produits) < 1e-12 * echelles))
+        np.testing.assert_array_equal(nouvelles_positions[:, 2], 0)
+        autres, _ = perturber_orbites(positions, vitesses, 0.1, np.random.default_rng(4))
+        np.testing.assert_array_equal(autres, nouvelles_positions)
+
+    def test_systeme_depuis_fichiers(self):
+        """Test du chargement d'un système depuis les deux formats, avec une graine."""
+        enregistrer_npz(self.scenario, self.chemin('disque.npz'), aleatoire=True)
+        premier = SystemeSolaire.depuis_npz(self.chemin('disque.npz'), graine=2)
+        second = SystemeSolaire.depuis_npz(self.chemin('disque.npz'), graine=2)
+        self.assertEqual((len(premier.etoiles), len(premier.planetes)), (1, 50))
+        np.testing.assert_array_equal(premier.planetes[3].position, second.planetes[3].position)
+        self.assertNotEqual(premier.planetes[3].id, second.planetes[3].id)
+        # Les corps sont modifiables, indépendamment du fichier projeté en mémoire
+        premier.etoiles[0].position += 1.0
+
+        ecrire_json(self.scenario, self.chemin('disque.json'))
+        systeme = SystemeSolaire.depuis_json(self.chemin('disque.json'), graine=2)
+        np.testing.assert_array_equal(systeme.planetes[3].position, self.scenario['positions'][4])
+
+
+if __name__ == '__main__':
+    unittest.main()
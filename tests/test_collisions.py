@@ -0,0 +1,96 @@
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.collisions import paires_candidates, detecter_contacts, grouper, Collisions
+from src.modele import CorpsCeleste, SystemeSolaire
+from src.simulation import Simulation
+
+
+class TestCollisions(unittest.TestCase):
+    """Tests de la détection des collisions et de la fusion des corps."""
+
+    def test_detecter_contacts(self):
+        """Test de la détection par balayage, comparée au test de toutes les paires."""
+        generateur = np.random.default_rng(3)
+        n = 1000
+        debut = generateur.uniform(-1.0, 1.0, (n, 3))
+        fin = debut + generateur.normal(0.0, 0.05, (n, 3))
+        rayons = generateur.uniform(0.0, 0.05, n)
+
+        # Distance minimale de chaque paire sur le pas, par force brute
+        i, j = np.triu_indices(n, 1)
+        d0 = debut[j] - debut[i]
+        dd = fin[j] - fin[i] - d0
+        carres = np.maximum(np.einsum('ij,ij->i', dd, dd), 1e-300)
+        s = np.clip(-np.einsum('ij,ij->i', d0, dd) / carres, 0.0, 1.0)
+        minimums = np.linalg.norm(d0 + s[:, np.newaxis] * dd, axis=1)
+        attendus = set(zip(i[minimums <= rayons[i] + rayons[j]].tolist(),
+                           j[minimums <= rayons[i] + rayons[j]].tolist()))
+        self.assertTrue(attendus)
+
+        a, b, instants = detecter_contacts(debut, fin, rayons)
+        self.assertEqual({(min(x, y), max(x, y)) for x, y in zip(a.tolist(), b.tolist())}, attendus)
+        self.assertTrue(np.all((instants >= 0) & (instants <= 1)))
+        # Le balayage n'examine qu'une petite partie des paires
+        self.assertLess(len(paires_candidates(debut, fin, rayons)[0]), len(i) // 20)
+
+    def test_traversee(self):
+        """Test d'un corps rapide qui traverse un autre corps pendant un seul pas."""
+        debut = np.array([[0.0, 0.0, 0.0], [-10.0, 0.5, 0.0]])
+        fin = np.array([[0.0, 0.0, 0.0], [10.0, 0.5, 0.0]])
+        a, b, instants = detecter_contacts(debut, fin, np.array([1.0, 0.1]))
+        self.assertEqual(len(a), 1)
+        # Contact lorsque l'écart en x vaut sqrt(1.1² - 0.5²)
+        self.assertAlmostEqual(instants[0], (10.0 - np.sqrt(1.1 ** 2 - 0.5 ** 2)) / 20.0)
+        # Corps qui s'éloignent, ou qui ne se rejoignent pas pendant le pas
+        self.assertEqual(len(detecter_contacts(fin, debut + [[0, 0, 0], [30, 0, 0]], np.array([1.0, 0.1]))[0]), 0)
+
+    def test_grouper(self):
+        """Test du regroupement des contacts de proche en proche."""
+        groupes = grouper(np.array([4, 1, 7]), np.array([2, 4, 8]))
+        self.assertEqual(sorted(groupes), [[1, 2, 4], [7, 8]])
+
+    def test_fusion(self):
+        """Test de la fusion dans une simulation : masse, volume, quantité de mouvement et journal."""
+        etoile = CorpsCeleste("Soleil", 1e30, 1e6, [1e12, 0, 0], [0, 0, 0], (255, 255, 0))
+        impacteur = CorpsCeleste("Impacteur", 2e20, 2e3, [0, 0, 0], [0, 0, 0], (255, 0, 0))
+        cible = CorpsCeleste("Cible", 6e20, 3e3, [4e5, 1e3, 0], [-4e5 / 3600, 0, 0], (0, 0, 255))
+        temoin = CorpsCeleste("Témoin", 1e20, 1e3, [0, 1e9, 0], [0, 0, 0], (0, 255, 0))
+        systeme = SystemeSolaire([etoile], [impacteur, cible, temoin])
+        systeme.synchroniser()
+        tampon = systeme.positions
+        quantite_mouvement = systeme.masses @ systeme.vitesses
+
+        with tempfile.TemporaryDirectory() as dossier:
+            journal = os.path.join(dossier, 'collisions.jsonl')
+            simulation = Simulation(systeme, dt=3600.0)
+            simulation.collisions = Collisions(journal=journal)
+            simulation.simuler(2 * 3600.0)
+            with open(journal, encoding='utf-8') as f:
+                evenements = [json.loads(ligne) for ligne in f]
+
+        # Le dernier corps a pris la ligne du corps absorbé
+        self.assertEqual(systeme.planetes, [temoin, cible])
+        self.assertEqual(systeme.obtenir_tous_corps(), systeme.corps_indexes)
+        self.assertEqual([corps.indice for corps in systeme.corps_indexes], [0, 1, 2])
+        self.assertAlmostEqual(cible.masse, 8e20)
+        self.assertAlmostEqual(cible.rayon, (2e3 ** 3 + 3e3 ** 3) ** (1 / 3))
+        self.assertEqual(systeme.masses[2], cible.masse)
+        np.testing.assert_allclose(systeme.masses @ systeme.vitesses, quantite_mouvement,
+                                   atol=1e-12 * np.linalg.norm(quantite_mouvement))
+        # Tableaux compactés sur place, corps retiré détaché avec son état
+        self.assertTrue(np.shares_memory(systeme.positions, tampon))
+        self.assertEqual(systeme.positions.shape, (3, 3))
+        np.testing.assert_array_equal(temoin.position, systeme.positions[1])
+        self.assertIsNone(impacteur.systeme)
+
+        self.assertEqual(len(evenements), 1)
+        self.assertEqual((evenements[0]['survivant'], evenements[0]['absorbes']), ("Cible", ["Impacteur"]))
+        self.assertLess(evenements[0]['temps'], 3600.0)
+        self.assertEqual(simulation.collisions.nb_fusions, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
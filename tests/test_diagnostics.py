@@ -0,0 +1,88 @@
+import os
+import json
+import tempfile
+import unittest
+import numpy as np
+from src.diagnostics import Diagnostics, DeriveExcessive, calculer_diagnostics, energie_potentielle
+from src.generateur import disque_kepler, vers_systeme
+from src.modele import SystemeSolaire, CorpsCeleste
+from src.simulation import Simulation
+
+
+class TestDiagnostics(unittest.TestCase):
+    """Tests des diagnostics des quantités conservées."""
+
+    def setUp(self):
+        """Initialisation des tests : une planète en orbite circulaire."""
+        self.soleil = CorpsCeleste("Soleil", 1.989e30, 6.96e8, [0.0, 0.0, 0.0], [0.0, 0.0, 0.0], (255, 255, 0))
+        v = np.sqrt(SystemeSolaire.G * 1.989e30 / 1.496e11)
+        self.terre = CorpsCeleste("Terre", 5.97e24, 6.37e6, [1.496e11, 0.0, 0.0], [0.0, v, 0.0], (0, 0, 255))
+        self.systeme = SystemeSolaire(etoiles=[self.soleil], planetes=[self.terre])
+        self.simulation = Simulation(self.systeme, dt=3600.0)
+
+    def test_valeurs(self):
+        """Test des quantités d'un système à deux corps."""
+        self.systeme.synchroniser()
+        valeurs = calculer_diagnostics(self.systeme.masses, self.systeme.positions, self.systeme.vitesses)
+        m1, m2 = 1.989e30, 5.97e24
+        potentielle = -SystemeSolaire.G * m1 * m2 / 1.496e11
+        self.assertAlmostEqual(valeurs['energie_potentielle'] / potentielle, 1.0, places=12)
+        # Orbite circulaire : énergie cinétique égale à -Ep / 2
+        self.assertAlmostEqual(valeurs['energie_cinetique'] / (-0.5 * potentielle), 1.0, places=12)
+        np.testing.assert_allclose(valeurs['quantite_mouvement'], [0.0, m2 * self.terre.vitesse[1], 0.0])
+        # Moment cinétique autour du centre de masse : μ r v selon z
+        mu = m1 * m2 / (m1 + m2)
+        self.assertAlmostEqual(valeurs['moment_cinetique'][2] / (mu * 1.496e11 * self.terre.vitesse[1]), 1.0, places=12)
+        np.testing.assert_allclose(valeurs['centre_masse'], [m2 * 1.496e11 / (m1 + m2), 0.0, 0.0])
+
+    def test_viriel(self):
+        """Test de l'énergie potentielle déduite des forces, égale à la somme sur les paires."""
+        systeme = vers_systeme(disque_kepler(60, graine=3))
+        simulation = Simulation(systeme)
+        corps_liste = systeme.synchroniser()
+        forces = np.array([simulation.calculer_forces(corps) for corps in corps_liste])
+        directe = energie_potentielle(systeme.masses, systeme.positions)
+        par_blocs = energie_potentielle(systeme.masses, systeme.positions, taille_bloc=100)
+        viriel = calculer_diagnostics(systeme.masses, systeme.positions, systeme.vitesses, forces)
+        self.assertAlmostEqual(par_blocs / directe, 1.0, places=12)
+        self.assertAlmostEqual(viriel['energie_potentielle'] / directe, 1.0, places=9)
+
+    def test_cadence(self):
+        """Test des mesures tous les n pas, sans effet sur le résultat de la simulation."""
+        temoin = Simulation(SystemeSolaire(etoiles=[CorpsCeleste("Soleil", 1.989e30, 6.96e8, self.soleil.position.copy(),
+                                                                 self.soleil.vitesse.copy(), (255, 255, 0))],
+                                           planetes=[CorpsCeleste("Terre", 5.97e24, 6.37e6, self.terre.position.copy(),
+                                                                  self.terre.vitesse.copy(), (0, 0, 255))]), dt=3600.0)
+        self.simulation.diagnostics = Diagnostics(periode=5)
+        self.simulation.simuler(20 * 3600.0)
+        temoin.simuler(20 * 3600.0)
+        mesures = list(self.simulation.diagnostics.mesures)
+        self.assertEqual([m['temps'] for m in mesures], [0.0, 5 * 3600.0, 10 * 3600.0, 15 * 3600.0])
+        self.assertEqual(mesures[0]['derive_energie'], 0.0)
+        self.assertLess(mesures[-1]['derive_energie'], 1e-6)
+        self.assertLess(mesures[-1]['derive_moment_cinetique'], 1e-9)
+        self.assertLess(mesures[-1]['derive_centre_masse'], 1.0)
+        np.testing.assert_array_equal(self.terre.position, temoin.systeme.planetes[0].position)
+
+    def test_seuil(self):
+        """Test du signalement, puis de l'arrêt, d'une dérive au-delà du seuil."""
+        self.simulation.diagnostics = Diagnostics(periode=1, seuil=1e-3)
+        self.simulation.dt = 30 * 86400.0  # Pas trop grand : l'énergie dérive
+        self.simulation.simuler(12 * 30 * 86400.0)
+        self.assertTrue(self.simulation.diagnostics.derive_excessive)
+        self.assertEqual(self.simulation.temps, 12 * 30 * 86400.0)
+
+        with tempfile.TemporaryDirectory() as dossier:
+            journal = os.path.join(dossier, 'diagnostics.jsonl')
+            self.simulation.diagnostics = Diagnostics(periode=1, seuil=1e-3, arreter=True, journal=journal)
+            with self.assertRaises(DeriveExcessive):
+                self.simulation.simuler(12 * 30 * 86400.0)
+            self.assertLess(self.simulation.temps, 24 * 30 * 86400.0)
+            with open(journal, encoding='utf-8') as f:
+                lignes = [json.loads(ligne) for ligne in f]
+        self.assertGreater(lignes[-1]['derive_energie'], 1e-3)
+        self.assertEqual(len(self.simulation.diagnostics.lignes_hud()), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import csv
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+import numpy as np
+import pygame
+from src.export import capturer_etat, enregistrer_simulation, generer_etats, ExportateurImages
+from src.modele import SystemeSolaire, CorpsCeleste
+from src.simulation import Simulation
+
+
+class TestExport(unittest.TestCase):
+    """Tests de l'export d'images hors écran."""
+    
+    def setUp(self):
+        """Initialisation des tests."""
+        soleil = CorpsCeleste("Soleil", 1.989e30, 6.96e8, [0.0, 0.0, 0.0], [0.0, 0.0, 0.0], (255, 255, 0))
+        terre = CorpsCeleste("Terre", 5.97e24, 6.37e6, [1.496e11, 0.0, 0.0], [0.0, 29.78e3, 0.0], (0, 0, 255))
+        self.systeme = SystemeSolaire(etoiles=[soleil], planetes=[terre])
+        self.simulation = Simulation(self.systeme, dt=86400.0)
+        self.dossier = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        """Nettoie après chaque test."""
+        shutil.rmtree(self.dossier)
+    
+    def test_capturer_etat(self):
+        """Test de la capture de l'état d'un système."""
+        etat = capturer_etat(self.systeme, 12.0)
+        self.assertEqual(etat['temps'], 12.0)
+        self.assertEqual(etat['nb_etoiles'], 1)
+        self.assertEqual(etat['noms'], ["Soleil", "Terre"])
+        self.assertEqual(etat['positions'].shape, (2, 3))
+        
+        # La capture est une copie indépendante du système
+        self.systeme.planetes[0].position[0] = 0.0
+        self.assertEqual(etat['positions'][1, 0], 1.496e11)
+    
+    def test_enregistrer_simulation(self):
+        """Test de l'enregistrement d'une suite d'états."""
+        etats = enregistrer_simulation(self.simulation, 5, 2 * 86400.0)
+        self.assertEqual(len(etats), 5)
+        self.assertEqual([etat['temps'] for etat in etats], [2.0, 4.0, 6.0, 8.0, 10.0])
+    
+    def test_preparer_taches(self):
+        """Test du découpage en lots et du choix des états de préchauffage."""
+        etats = enregistrer_simulation(self.simulation, 10, 86400.0)
+        exportateur = ExportateurImages(duree_trajectoire=3.0, taille_lot=4)
+        taches = list(exportateur.preparer_taches(iter(etats), 1e-9, self.dossier))
+        self.assertEqual([tache[0] for tache in taches], [0, 4, 8])
+        self.assertEqual([len(tache[2]) for tache in taches], [4, 4, 2])
+        # Préchauffage : états des 3 jours précédant le lot
+        self.assertEqual([etat['temps'] for etat in taches[1][1]], [2.0, 3.0, 4.0])
+        self.assertEqual(taches[0][1], [])
+    
+    def test_exporter_deterministe(self):
+        """Test que les images ne dépendent ni du nombre de processus ni de la source des états."""
+        etats = enregistrer_simulation(self.simulation, 6, 5 * 86400.0)
+        dossier_seq = os.path.join(self.dossier, 'sequentiel')
+        dossier_par = os.path.join(self.dossier, 'parallele')
+        
+        exportateur_seq = ExportateurImages(200, 150, nb_processus=1, taille_lot=2)
+        fichiers_seq = exportateur_seq.exporter(etats, dossier_seq, delai_max=120)
+        # Mêmes états fournis par un itérateur, à la même échelle
+        exportateur_par = ExportateurImages(200, 150, nb_processus=2, taille_lot=2)
+        fichiers_par = exportateur_par.exporter(iter(etats), dossier_par,
+                                                echelle=exportateur_seq.calculer_echelle(etats),
+                                                delai_max=120)
+        
+        self.assertEqual([os.path.basename(f) for f in fichiers_seq],
+                         [f"image_{i:06d}.png" for i in range(6)])
+        for chemin_seq, chemin_par in zip(fichiers_seq, fichiers_par):
+            image_seq = pygame.surfarray.array3d(pygame.image.load(chemin_seq))
+            image_par = pygame.surfarray.array3d(pygame.image.load(chemin_par))
+            np.testing.assert_array_equal(image_seq, image_par)
+        
+        with open(os.path.join(dossier_par, 'images.csv'), encoding='utf-8') as f:
+            lignes = list(csv.reader(f))
+        self.assertEqual(lignes[0], ['image', 'temps_jours'])
+        self.assertEqual([float(ligne[1]) for ligne in lignes[1:]], [5.0, 10.0, 15.0, 20.0, 25.0, 30.0])
+    
+    def test_exporter_simulation_en_cours(self):
+        """Test de l'export d'états produits au fur et à mesure par la simulation."""
+        etats = generer_etats(self.simulation, 3, 86400.0)
+        fichiers = ExportateurImages(100, 80, nb_processus=1, taille_lot=2).exporter(
+            etats, self.dossier, delai_max=120)
+        self.assertEqual(len(fichiers), 3)
+        self.assertTrue(all(os.path.exists(chemin) for chemin in fichiers))
+        self.assertEqual(self.simulation.temps, 3 * 86400.0)
+    
+    def test_exporter_echec_encodeur(self):
+        """Test qu'un encodeur vidéo en échec produit une erreur explicite."""
+        etats = enregistrer_simulation(self.simulation, 2, 86400.0)
+        exportateur = ExportateurImages(100, 80, nb_processus=1, taille_lot=2)
+        with patch('src.export.shutil.which', return_value=shutil.which('false')):
+            with self.assertRaises(RuntimeError):
+                exportateur.exporter(etats, self.dossier, video='film.mp4', delai_max=120)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.forces import (ModeleForces, GraviteNewton, RelativiteGenerale, AplatissementJ2, PressionRadiation,
+                        Poussee, selectionner, C, LUMINOSITE_SOLAIRE)
+from src.generateur import disque_kepler, vers_systeme
+from src.modele import CorpsCeleste, SystemeSolaire
+from src.simulation import Simulation
+from src.traceur import Traceur
+
+
+class TestForces(unittest.TestCase):
+    """Tests des termes de force vectorisés et de leur assemblage."""
+
+    def setUp(self):
+        """Crée un système d'une étoile, d'une planète et d'une sonde."""
+        self.soleil = CorpsCeleste("Soleil", 1.989e30, 6.96e8, [0.0, 0.0, 0.0], [0.0, 0.0, 0.0], (255, 255, 0))
+        self.terre = CorpsCeleste("Terre", 5.97e24, 6.37e6, [1.496e11, 0.0, 0.0], [0.0, 29.78e3, 0.0], (0, 0, 255))
+        self.sonde = CorpsCeleste("Sonde", 1000.0, 2.0, [0.0, 1.0e11, 0.0], [-3.0e4, 0.0, 0.0], (255, 255, 255))
+        self.systeme = SystemeSolaire([self.soleil], [self.terre, self.sonde])
+        self.systeme.synchroniser()
+
+    def evaluer(self, terme):
+        """Retourne les accélérations (N, 3) produites par un terme seul."""
+        acceleration = np.zeros((len(self.systeme.masses), 3))
+        terme.ajouter(self.systeme, acceleration)
+        return acceleration
+
+    def test_gravite(self):
+        """Test de la gravitation par blocs, comparée au calcul paire par paire."""
+        systeme = vers_systeme(disque_kepler(60, graine=4))
+        simulation = Simulation(systeme)
+        corps_liste = systeme.synchroniser()
+        attendues = np.array([simulation.calculer_forces(corps) for corps in corps_liste]) / systeme.masses[:, np.newaxis]
+        acceleration = np.zeros((len(corps_liste), 3))
+        GraviteNewton(taille_bloc=100).ajouter(systeme, acceleration)
+        np.testing.assert_allclose(acceleration, attendues, rtol=1e-10, atol=1e-20)
+
+        # Seuls les corps visés reçoivent la gravitation
+        acceleration = np.zeros((len(corps_liste), 3))
+        GraviteNewton(corps=[corps_liste[3].nom]).ajouter(systeme, acceleration)
+        self.assertEqual(np.flatnonzero(np.any(acceleration != 0, axis=1)).tolist(), [3])
+
+    def test_selectionner(self):
+        """Test de la sélection par groupe et par nom, et de sa mise à jour après un retrait."""
+        self.assertEqual(selectionner(self.systeme, 'tous').tolist(), [0, 1, 2])
+        self.assertEqual(selectionner(self.systeme, ['etoiles', 'Sonde', 'Pluton']).tolist(), [0, 2])
+        terme = Poussee(corps='Sonde', force=1.0)
+        self.assertEqual(terme.cibles(self.systeme).tolist(), [2])
+        self.systeme.retirer_corps([self.terre])
+        self.assertEqual(terme.cibles(self.systeme).tolist(), [1])
+
+    def test_relativite(self):
+        """Test de la correction 1PN : 3 GM / (r c²) fois la gravitation, vers l'extérieur, sur une orbite circulaire."""
+        gm = SystemeSolaire.G * self.soleil.masse
+        r = 1.496e11
+        self.terre.vitesse = [0.0, np.sqrt(gm / r), 0.0]
+        acceleration = self.evaluer(RelativiteGenerale(corps='Terre'))
+        np.testing.assert_allclose(acceleration[1], [3 * gm / (r * C ** 2) * gm / r ** 2, 0.0, 0.0], rtol=1e-6)
+        np.testing.assert_array_equal(acceleration[[0, 2]], 0.0)
+
+    def test_j2(self):
+        """Test du terme J2 dans le plan équatorial et sur l'axe de rotation."""
+        gm = SystemeSolaire.G * self.soleil.masse
+        acceleration = self.evaluer(AplatissementJ2(j2=2e-7, corps='tous'))
+        # Équateur : -3/2 J2 GM R² / r⁴, vers le corps central
+        np.testing.assert_allclose(acceleration[1], [-1.5 * 2e-7 * gm * 6.96e8 ** 2 / 1.496e11 ** 4, 0.0, 0.0])
+        # Axe de rotation : +3 J2 GM R² / r⁴, vers l'extérieur
+        acceleration = self.evaluer(AplatissementJ2(j2=2e-7, axe=(0.0, 2.0, 0.0), corps='Sonde'))
+        np.testing.assert_allclose(acceleration[2], [0.0, 3 * 2e-7 * gm * 6.96e8 ** 2 / 1e11 ** 4, 0.0])
+
+    def test_radiation_et_poussee(self):
+        """Test de la pression de rayonnement et de la poussée d'une sonde."""
+        acceleration = self.evaluer(PressionRadiation(corps='Sonde', coefficient=1.5))
+        attendue = 1.5 * LUMINOSITE_SOLAIRE * 2.0 ** 2 / (4 * C * 1e11 ** 2 * 1000.0)
+        np.testing.assert_allclose(acceleration[2], [0.0, attendue, 0.0])
+
+        acceleration = self.evaluer(Poussee(corps='Sonde', force=0.5))
+        np.testing.assert_allclose(acceleration[2], [-0.5 / 1000.0, 0.0, 0.0])
+        acceleration = self.evaluer(Poussee(corps=['Sonde', 'Terre'], force=2.0, direction=[0.0, 0.0, 4.0]))
+        np.testing.assert_allclose(acceleration[1:, 2], [2.0 / 5.97e24, 2.0 / 1000.0])
+
+    def test_depuis_config(self):
+        """Test de la configuration depuis la section "forces" d'un scénario."""
+        modele = ModeleForces.depuis_config([{"terme": "poussee", "corps": "Sonde", "force": 1.0},
+                                             {"terme": "poussee", "corps": "Sonde", "force": 2.0}])
+        self.assertEqual(modele.etiquettes, ['gravite', 'poussee', 'poussee2'])
+        self.assertFalse(modele.gravitation_seule)
+        self.assertTrue(ModeleForces.depuis_config(None).gravitation_seule)
+        with self.assertRaises(ValueError):
+            ModeleForces.depuis_config([{"terme": "magnetisme"}])
+        with self.assertRaises(ValueError):
+            ModeleForces.depuis_config([{"terme": "j2", "inconnu": 1}])
+
+        # Durée de chaque terme, et intervalle de trace par terme
+        traceur = Traceur(capacite=16)
+        for _ in range(2):
+            acceleration = modele.accelerations(self.systeme, traceur)
+        self.assertEqual(modele.nb_evaluations, 2)
+        self.assertTrue(all(duree > 0 for duree in modele.durees.values()))
+        self.assertEqual([e[0] for e in traceur.evenements()][:3], ['forces/gravite', 'forces/poussee', 'forces/poussee2'])
+        self.assertEqual(len(modele.lignes_rapport()), 3)
+        self.assertAlmostEqual(acceleration[2, 0] - self.evaluer(GraviteNewton())[2, 0], -3.0 / 1000.0)
+
+    def test_simulation(self):
+        """Test d'une simulation configurée par un fichier JSON, comparée au calcul paire par paire."""
+        donnees = {
+            "etoiles": [{"nom": "Soleil", "masse": 1.989e30, "rayon": 6.96e8, "position": [0, 0, 0],
+                         "vitesse": [0, 0, 0], "couleur": [255, 255, 0]}],
+            "planetes": [{"nom": "Mercure", "masse": 3.3e23, "rayon": 2.44e6, "position": [5.79e10, 0, 0],
+                          "vitesse": [0, 4.74e4, 0], "couleur": [169, 169, 169]}],
+            "aleatoire": False,
+            "forces": [{"terme": "relativite", "corps": ["Mercure"]}],
+        }
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin = os.path.join(dossier, 'systeme.json')
+            with open(chemin, 'w', encoding='utf-8') as f:
+                json.dump(donnees, f)
+            systeme = SystemeSolaire.depuis_json(chemin)
+            reference = SystemeSolaire.depuis_json(chemin)
+        simulation = Simulation(systeme, dt=3600.0)
+        self.assertEqual(simulation.modele_forces.etiquettes, ['gravite', 'relativite'])
+        paires = Simulation(reference, dt=3600.0)
+        paires.modele_forces = None
+        simulation.simuler(24 * 3600.0)
+        paires.simuler(24 * 3600.0)
+
+        # Écart dû à la seule correction relativiste, très petit devant le déplacement
+        ecart = np.linalg.norm(systeme.positions[1] - reference.positions[1])
+        self.assertGreater(ecart, 0.0)
+        self.assertLess(ecart, 1e-6 * np.linalg.norm(reference.positions[1]))
+
+        # Gravitation seule : même pas que le calcul paire par paire
+        simulation.modele_forces = ModeleForces()
+        systeme.positions[...] = reference.positions
+        systeme.vitesses[...] = reference.vitesses
+        paires.simuler(3600.0)
+        simulation.simuler(3600.0)
+        np.testing.assert_allclose(systeme.positions, reference.positions, rtol=1e-12, atol=1e-3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.generateur import (UA, LACUNES_KIRKWOOD, disque_kepler, ceinture_asteroides, amas_plummer,
+                            binaire_circumbinaire, vers_systeme, ecrire_json)
+from src.modele import SystemeSolaire
+from src.orbites import elements_orbitaux
+
+
+class TestGenerateur(unittest.TestCase):
+    """Tests du générateur de systèmes synthétiques."""
+
+    def verifier_scenario(self, scenario, nb_corps):
+        """Vérifie la forme des colonnes et le référentiel du centre de masse."""
+        for colonne in ('noms', 'masses', 'rayons'):
+            self.assertEqual(scenario[colonne].shape, (nb_corps,))
+        for colonne in ('positions', 'vitesses', 'couleurs'):
+            self.assertEqual(scenario[colonne].shape, (nb_corps, 3))
+        masses = scenario['masses']
+        quantite_mouvement = masses @ scenario['vitesses']
+        self.assertLess(np.linalg.norm(quantite_mouvement), 1e-9 * masses.sum() * np.abs(scenario['vitesses']).max())
+
+    def elements_autour(self, scenario, indice_centre=0):
+        """Calcule les éléments orbitaux des corps autour de l'un d'eux."""
+        masses = scenario['masses']
+        autres = np.arange(len(masses)) != indice_centre
+        return elements_orbitaux(scenario['positions'][autres] - scenario['positions'][indice_centre],
+                                 scenario['vitesses'][autres] - scenario['vitesses'][indice_centre],
+                                 SystemeSolaire.G * (masses[indice_centre] + masses[autres]))
+
+    def test_graine(self):
+        """Test de la reproductibilité d'un scénario pour une graine donnée."""
+        premier, second = disque_kepler(100, graine=3), disque_kepler(100, graine=3)
+        np.testing.assert_array_equal(premier['positions'], second['positions'])
+        self.assertFalse(np.array_equal(premier['positions'], disque_kepler(100, graine=4)['positions']))
+
+    def test_disque_kepler(self):
+        """Test d'un disque de planétésimaux liés entre les rayons demandés."""
+        scenario = disque_kepler(500, graine=1, r_min=1 * UA, r_max=10 * UA)
+        self.verifier_scenario(scenario, 501)
+        self.assertEqual(scenario['nb_etoiles'], 1)
+        self.assertEqual(scenario['noms'][1], 'Planétésimal 0')
+        elements = self.elements_autour(scenario)
+        self.assertTrue(np.all(elements['e'] < 0.5))
+        self.assertTrue(np.all((elements['a'] >= 0.999 * UA) & (elements['a'] <= 10.001 * UA)))
+        # Densité surfacique en r^-1.5 : plus de la moitié des corps dans la moitié intérieure
+        self.assertGreater(np.mean(elements['a'] < 5.5 * UA), 0.5)
+
+    def test_ceinture_asteroides(self):
+        """Test des lacunes de Kirkwood et de la présence de Jupiter."""
+        scenario = ceinture_asteroides(2000, graine=2)
+        self.verifier_scenario(scenario, 2002)
+        self.assertEqual(scenario['noms'][1], 'Jupiter')
+        a = self.elements_autour(scenario)['a'][1:] / UA
+        for centre, demi_largeur in LACUNES_KIRKWOOD:
+            self.assertFalse(np.any(np.abs(a - centre) < 0.99 * demi_largeur))
+        self.assertEqual(len(ceinture_asteroides(10, graine=2, avec_jupiter=False)['masses']), 11)
+
+    def test_amas_plummer(self):
+        """Test de l'équilibre du viriel et du rayon de demi-masse d'un amas de Plummer."""
+        scenario = amas_plummer(2000, graine=5, rayon_plummer=1.0e16)
+        self.verifier_scenario(scenario, 2000)
+        self.assertEqual(scenario['nb_etoiles'], 2000)
+        masses, positions, vitesses = scenario['masses'], scenario['positions'], scenario['vitesses']
+        cinetique = 0.5 * np.sum(masses * np.einsum('ij,ij->i', vitesses, vitesses))
+        i, j = np.triu_indices(len(masses), k=1)
+        potentielle = -SystemeSolaire.G * np.sum(masses[i] * masses[j] / np.linalg.norm(positions[i] - positions[j], axis=1))
+        self.assertAlmostEqual(2 * cinetique / -potentielle, 1.0, delta=0.1)
+        demi_masse = np.median(np.linalg.norm(positions, axis=1))
+        self.assertAlmostEqual(demi_masse / 1.0e16, 1.305, delta=0.1)
+
+    def test_binaire_circumbinaire(self):
+        """Test des orbites de la binaire et des planètes au-delà de la limite de stabilité."""
+        scenario = binaire_circumbinaire(200, graine=7)
+        self.verifier_scenario(scenario, 202)
+        separation = np.linalg.norm(scenario['positions'][1] - scenario['positions'][0])
+        self.assertAlmostEqual(separation / UA, 0.22)
+        distances = np.linalg.norm(scenario['positions'][2:], axis=1)
+        self.assertTrue(np.all(distances > 2.2 * separation))
+
+    def test_json_et_systeme(self):
+        """Test de l'écriture au format JSON, rechargée sans tirage aléatoire."""
+        scenario = binaire_circumbinaire(5, graine=1)
+        systeme = vers_systeme(scenario)
+        self.assertEqual((len(systeme.etoiles), len(systeme.planetes)), (2, 5))
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin = os.path.join(dossier, 'binaire.json')
+            ecrire_json(scenario, chemin)
+            charge = SystemeSolaire.depuis_json(chemin)
+        self.assertEqual([c.nom for c in charge.obtenir_tous_corps()], scenario['noms'].tolist())
+        for corps, position in zip(charge.obtenir_tous_corps(), scenario['positions']):
+            np.testing.assert_array_equal(corps.position, position)
+        self.assertEqual(charge.planetes[0].couleur, (100, 160, 255))
+
+
+if __name__ == '__main__':
+    unittest.main()
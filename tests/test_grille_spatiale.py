@@ -0,0 +1,38 @@
+import unittest
+import pygame
+from src.grille_spatiale import GrilleSpatiale
+
+
+class TestGrilleSpatiale(unittest.TestCase):
+    """Tests pour la classe GrilleSpatiale."""
+    
+    def setUp(self):
+        """Initialisation des tests."""
+        self.grille = GrilleSpatiale(taille_cellule=32)
+    
+    def test_inserer_si_libre(self):
+        """Test du refus des rectangles qui se chevauchent."""
+        self.assertTrue(self.grille.inserer_si_libre(pygame.Rect(10, 10, 50, 20)))
+        self.assertFalse(self.grille.inserer_si_libre(pygame.Rect(40, 20, 50, 20)))
+        self.assertTrue(self.grille.inserer_si_libre(pygame.Rect(60, 10, 50, 20)), "Rectangles adjacents")
+    
+    def test_chevauchement_entre_cellules(self):
+        """Test de la détection d'un chevauchement avec un rectangle couvrant plusieurs cellules."""
+        self.assertTrue(self.grille.inserer_si_libre(pygame.Rect(0, 0, 200, 10)))
+        self.assertFalse(self.grille.est_libre(pygame.Rect(150, 5, 5, 5)))
+        self.assertTrue(self.grille.est_libre(pygame.Rect(150, 50, 5, 5)))
+    
+    def test_coordonnees_negatives(self):
+        """Test avec des rectangles partiellement hors de l'écran."""
+        self.assertTrue(self.grille.inserer_si_libre(pygame.Rect(-40, -40, 50, 50)))
+        self.assertFalse(self.grille.est_libre(pygame.Rect(0, 0, 5, 5)))
+    
+    def test_vider(self):
+        """Test du vidage de la grille."""
+        self.grille.inserer_si_libre(pygame.Rect(10, 10, 50, 20))
+        self.grille.vider()
+        self.assertTrue(self.grille.est_libre(pygame.Rect(10, 10, 50, 20)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.instrumentation import Histogramme, Instrumentation, ExportateurMetriques
+from src.modele import SystemeSolaire, CorpsCeleste
+from src.simulation import Simulation
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Tests de l'instrumentation de la simulation."""
+
+    def setUp(self):
+        """Initialisation des tests."""
+        self.systeme = self.creer_systeme()
+        self.simulation = Simulation(self.systeme, dt=3600.0)
+        self.dossier = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Nettoie après chaque test."""
+        self.dossier.cleanup()
+
+    @staticmethod
+    def creer_systeme():
+        """Crée un système de trois corps."""
+        systeme = SystemeSolaire([], [])
+        systeme.etoiles = [CorpsCeleste("Soleil", 1.989e30, 696340e3, np.zeros(3), np.zeros(3), (255, 255, 0))]
+        systeme.planetes = [
+            CorpsCeleste("Terre", 5.972e24, 6371e3, np.array([1.496e11, 0, 0]), np.array([0, 29780.0, 0]), (0, 0, 255)),
+            CorpsCeleste("Mars", 6.39e23, 3389e3, np.array([2.279e11, 0, 0]), np.array([0, 24070.0, 0]), (255, 0, 0)),
+        ]
+        return systeme
+
+    def test_histogramme(self):
+        """Test des classes cumulées de l'histogramme."""
+        histogramme = Histogramme([0.1, 1.0])
+        for valeur in (0.05, 0.1, 0.5, 2.0):
+            histogramme.observer(valeur)
+        self.assertEqual(histogramme.comptes_cumules(), [2, 3, 4])
+        self.assertAlmostEqual(histogramme.somme, 2.65)
+        self.assertEqual(histogramme.nombre, 4)
+
+    def test_compteurs_et_rappels(self):
+        """Test des compteurs mis à jour et des rappels appelés à chaque pas."""
+        instrumentation = Instrumentation()
+        temps_vus = []
+        instrumentation.ajouter_rappel(lambda simulation: temps_vus.append(simulation.temps))
+        self.simulation.instrumentation = instrumentation
+        self.simulation.simuler(3 * 3600.0)
+
+        self.assertEqual(instrumentation.compteurs['pas'], 3)
+        self.assertEqual(instrumentation.compteurs['evaluations_forces'], 9)
+        self.assertEqual(instrumentation.compteurs['interactions_paires'], 18)
+        self.assertEqual(instrumentation.histogrammes['duree_pas'].nombre, 3)
+        self.assertEqual(instrumentation.jauges['nb_corps'], 3)
+        self.assertEqual(temps_vus, [3600.0, 7200.0, 10800.0])
+
+    def test_resultat_inchange(self):
+        """Test d'une simulation instrumentée, dont le résultat ne change pas."""
+        self.assertIsNone(self.simulation.instrumentation)
+        instrumentee = Simulation(self.creer_systeme(), dt=3600.0)
+        instrumentee.instrumentation = Instrumentation()
+        self.simulation.simuler(5 * 3600.0)
+        instrumentee.simuler(5 * 3600.0)
+        for corps, autre in zip(self.systeme.obtenir_tous_corps(), instrumentee.systeme.obtenir_tous_corps()):
+            np.testing.assert_array_equal(corps.position, autre.position)
+
+    def test_format_prometheus(self):
+        """Test du format texte de Prometheus."""
+        instrumentation = Instrumentation()
+        self.simulation.instrumentation = instrumentation
+        self.simulation.simuler(2 * 3600.0)
+        texte = instrumentation.format_prometheus()
+
+        self.assertIn("# TYPE gravity_pas_total counter\ngravity_pas_total 2\n", texte)
+        self.assertIn("gravity_temps_simule 7200.0\n", texte)
+        self.assertIn('gravity_duree_pas_secondes_bucket{le="+Inf"} 2\n', texte)
+        self.assertIn("gravity_duree_forces_secondes_count 2\n", texte)
+
+    def test_exportateur(self):
+        """Test de l'export périodique vers les fichiers Prometheus et JSON lines."""
+        instrumentation = Instrumentation()
+        prometheus = os.path.join(self.dossier.name, 'gravity.prom')
+        jsonl = os.path.join(self.dossier.name, 'metriques.jsonl')
+        exportateur = ExportateurMetriques(instrumentation, prometheus=prometheus, jsonl=jsonl, periode=3600.0)
+        self.simulation.instrumentation = instrumentation
+        self.simulation.simuler(3 * 3600.0)
+        exportateur.exporter()
+
+        # Premier pas exporté immédiatement, puis la période n'est plus écoulée
+        with open(jsonl, encoding='utf-8') as f:
+            lignes = [json.loads(ligne) for ligne in f]
+        self.assertEqual([ligne['compteurs']['pas'] for ligne in lignes], [1, 3])
+        with open(prometheus, encoding='utf-8') as f:
+            self.assertIn("gravity_pas_total 3\n", f.read())
+        self.assertFalse(os.path.exists(prometheus + '.tmp'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,7 @@ import sys
 from src.main import main
 import os
 import json
+import tempfile
 import pytest
 
 class TestMain(unittest.TestCase):
@@ -67,7 +68,7 @@ class TestMain(unittest.TestCase):
             main()
             
             # Vérifications
-            mock_systeme.depuis_json.assert_called_once_with(self.test_file, randomSpeedRatio=0.1)
+            mock_systeme.depuis_json.assert_called_once_with(self.test_file, randomSpeedRatio=0.1, graine=None)
             mock_simulation.assert_called_once()
             mock_visu.assert_called_once()
 
@@ -199,6 +200,130 @@ class TestMain(unittest.TestCase):
         sys.argv = ['main.py', '--dt', '0.1', '--fichier', 'test.json']
         main()
 
+    @patch('src.main.SystemeSolaire')
+    @patch('src.main.Simulation')
+    @patch('src.main.Visualisation')
+    def test_main_images_par_pas(self, mock_visualisation, mock_simulation, mock_systeme):
+        """Test de l'affichage interpolé entre deux pas de simulation."""
+        mock_systeme.depuis_json.return_value = MagicMock(
+            etoiles=[MagicMock()],
+            planetes=[MagicMock()]
+        )
+        simulation = MagicMock(temps=0.0)
+        simulation.simuler.side_effect = lambda duree: setattr(simulation, 'temps', simulation.temps + duree)
+        mock_simulation.return_value = simulation
+        mock_visualisation.return_value = MagicMock(
+            en_pause=False,
+            gerer_evenements=MagicMock(side_effect=[True, True, True, True, False])
+        )
+
+        sys.argv = ['main.py', '--dt', '3600', '--images-par-pas', '4']
+        main()
+
+        # Cinq images pour quatre images par pas : deux pas de simulation
+        simulation.activer_interpolation.assert_called_once()
+        self.assertEqual(simulation.simuler.call_count, 2)
+        temps_affiches = [appel.args[0] for appel in simulation.positions_interpolees.call_args_list]
+        self.assertEqual(temps_affiches, [900.0, 1800.0, 2700.0, 3600.0, 4500.0])
+
+    @patch('src.export.ExportateurImages')
+    @patch('src.main.SystemeSolaire')
+    @patch('src.main.Simulation')
+    @patch('src.main.Visualisation')
+    def test_main_export(self, mock_visualisation, mock_simulation, mock_systeme, mock_exportateur):
+        """Test du mode export, qui n'ouvre pas de fenêtre."""
+        mock_systeme.depuis_json.return_value = MagicMock(
+            etoiles=[MagicMock()],
+            planetes=[MagicMock()]
+        )
+        mock_exportateur.return_value.exporter.return_value = []
+
+        sys.argv = ['main.py', '--export', 'images', '--images', '12', '--processus', '2']
+        main()
+
+        mock_visualisation.assert_not_called()
+        mock_exportateur.assert_called_once_with(nb_processus=2)
+        args, kwargs = mock_exportateur.return_value.exporter.call_args
+        self.assertEqual(args[1], 'images')
+        self.assertIsNone(kwargs['video'])
+
+    @patch('src.main.Visualisation')
+    def test_main_sans_affichage_metriques(self, mock_visualisation):
+        """Test de la simulation sans fenêtre avec export des métriques."""
+        metriques = "test_metriques.prom"
+        try:
+            sys.argv = ['main.py', '--fichier', self.test_file, '--sans-affichage', '--jours', '1',
+                        '--metriques-prometheus', metriques]
+            main()
+
+            mock_visualisation.assert_not_called()
+            with open(metriques, encoding='utf-8') as f:
+                self.assertIn("gravity_pas_total 4\n", f.read())
+        finally:
+            if os.path.exists(metriques):
+                os.remove(metriques)
+
+    @patch('src.main.Visualisation')
+    def test_main_profil(self, mock_visualisation):
+        """Test du profilage d'une fenêtre de pas, qui arrête une simulation sans fin."""
+        with tempfile.TemporaryDirectory() as dossier:
+            sys.argv = ['main.py', '--fichier', self.test_file, '--sans-affichage', '--profil',
+                        '--profil-memoire', '--fenetre-profil', '3', '--dossier-profil', dossier]
+            main()
+
+            self.assertEqual(sorted(os.listdir(dossier)),
+                             ['memoire.txt', 'profil.collapsed', 'profil.pstats', 'profil.txt'])
+
+    @patch('src.main.Visualisation')
+    def test_main_arret_derive(self, mock_visualisation):
+        """Test de l'arrêt d'une simulation sans fenêtre dont la dérive dépasse le seuil."""
+        with tempfile.TemporaryDirectory() as dossier:
+            journal = os.path.join(dossier, 'diagnostics.jsonl')
+            sys.argv = ['main.py', '--fichier', self.test_file, '--sans-affichage', '--diagnostics', '1',
+                        '--seuil-derive', '0', '--arret-derive', '--journal-diagnostics', journal]
+            main()
+
+            # Arrêt à la deuxième mesure, la première servant de référence
+            with open(journal, encoding='utf-8') as f:
+                self.assertEqual(len(f.readlines()), 2)
+
+    @patch('src.main.Visualisation')
+    def test_main_serveur(self, mock_visualisation):
+        """Test d'une simulation sans fenêtre diffusée par le serveur d'instantanés."""
+        sys.argv = ['main.py', '--fichier', self.test_file, '--sans-affichage', '--jours', '2', '--dt', '86400',
+                    '--serveur', '0']
+        with patch('src.serveur.ServeurInstantanes.publier') as mock_publier, \
+             patch('src.serveur.ServeurInstantanes.arreter') as mock_arreter:
+            main()
+            self.assertEqual(mock_publier.call_count, 2)
+            mock_arreter.assert_called_once()
+        mock_visualisation.assert_not_called()
+
+    @patch('src.main.Visualisation')
+    def test_main_forces(self, mock_visualisation):
+        """Test d'un scénario à termes de force, dont la durée moyenne est affichée en fin de simulation."""
+        with open(self.test_file, encoding='utf-8') as f:
+            data = json.load(f)
+        data['forces'] = [{"terme": "relativite", "corps": ["Terre"]},
+                          {"terme": "j2", "corps": "planetes"}]
+        with open(self.test_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        sys.argv = ['main.py', '--fichier', self.test_file, '--sans-affichage', '--jours', '1']
+        with patch('builtins.print') as mock_print:
+            main()
+        lignes = [str(appel.args[0]) for appel in mock_print.call_args_list if appel.args]
+        for terme in ('gravite', 'relativite', 'j2'):
+            self.assertTrue(any(ligne.strip().startswith(terme) for ligne in lignes), terme)
+
+    def test_import_sans_pygame(self):
+        """Test de l'import du programme principal, qui ne charge pas pygame."""
+        import subprocess
+        racine = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        sortie = subprocess.run([sys.executable, '-c', "import sys, src.main; print('pygame' in sys.modules)"],
+                                cwd=racine, env=dict(os.environ, PYTHONPATH=racine),
+                                capture_output=True, text=True, check=True).stdout
+        self.assertEqual(sortie.strip(), 'False')
+
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -40,6 +40,21 @@ class TestCorpsCeleste(unittest.TestCase):
         self.assertEqual(corps.couleur, (0, 0, 255))
         self.assertTrue(isinstance(corps.id, str))
 
+    def test_representation_compacte(self):
+        """Teste les attributs fixes du corps et l'identifiant tiré à la première lecture."""
+        corps = CorpsCeleste("Test", 1.0, 1.0, [0.0, 0.0, 0.0], [0.0, 0.0, 0.0], (255, 255, 255))
+        self.assertFalse(hasattr(corps, '__dict__'))
+        with self.assertRaises(AttributeError):
+            corps.attribut_inconnu = 1
+        
+        # Sans identifiant tiré, l'égalité est l'identité
+        autre = CorpsCeleste("Test", 1.0, 1.0, [0.0, 0.0, 0.0], [0.0, 0.0, 0.0], (255, 255, 255))
+        self.assertIsNone(corps._id)
+        self.assertNotEqual(corps, autre)
+        self.assertEqual(corps, corps)
+        self.assertEqual(corps.id, corps.id)
+        self.assertEqual(len({corps, autre, corps}), 2)
+
     def test_post_init(self):
         """Teste la conversion des listes en tableaux numpy."""
         corps = CorpsCeleste(
@@ -165,6 +180,128 @@ class TestSystemeSolaire(unittest.TestCase):
         acceleration = self.systeme.calculer_acceleration(self.terre, force, dt)
         self.assertEqual(len(acceleration), 3)
         self.assertGreater(acceleration[0], 0)  # Accélération positive en x
+    
+    def test_tableaux_etat(self):
+        """Teste le rangement de l'état des corps dans les tableaux du système."""
+        corps_liste = self.systeme.synchroniser()
+        self.assertEqual([corps.indice for corps in corps_liste], [0, 1])
+        np.testing.assert_array_equal(self.systeme.positions[1], [1.496e11, 0.0, 0.0])
+        np.testing.assert_array_equal(self.systeme.masses, [1.989e30, 5.97e24])
+        
+        # Les attributs des corps lisent et écrivent les lignes des tableaux
+        self.terre.position += 1.0
+        self.terre.vitesse = np.array([1.0, 2.0, 3.0])
+        self.terre.masse = 6e24
+        np.testing.assert_array_equal(self.systeme.positions[1], [1.496e11 + 1.0, 1.0, 1.0])
+        np.testing.assert_array_equal(self.systeme.vitesses[1], [1.0, 2.0, 3.0])
+        self.assertEqual(self.systeme.masses[1], 6e24)
+        self.systeme.positions[0] = [5.0, 6.0, 7.0]
+        np.testing.assert_array_equal(self.soleil.position, [5.0, 6.0, 7.0])
+    
+    def test_synchroniser(self):
+        """Teste la réindexation après l'ajout et le retrait de corps."""
+        self.systeme.synchroniser()
+        lune = CorpsCeleste("Lune", 7.35e22, 1.74e6, [1.5e11, 0.0, 0.0], [0.0, 30.8e3, 0.0], (200, 200, 200))
+        self.systeme.planetes.append(lune)
+        self.assertIs(lune.systeme, None)
+        self.assertEqual(self.systeme.synchroniser(), [self.soleil, self.terre, lune])
+        self.assertEqual(lune.indice, 2)
+        np.testing.assert_array_equal(self.systeme.positions[2], [1.5e11, 0.0, 0.0])
+        
+        # Un corps retiré garde son état, hors des tableaux
+        self.terre.position += 1.0
+        self.systeme.planetes.remove(self.terre)
+        self.systeme.synchroniser()
+        self.assertIsNone(self.terre.systeme)
+        np.testing.assert_array_equal(self.terre.position, [1.496e11 + 1.0, 1.0, 1.0])
+        self.assertEqual(lune.indice, 1)
+        self.assertEqual(self.systeme.positions.shape, (2, 3))
+    
+    def test_retirer_corps(self):
+        """Teste le retrait de corps avec compactage des tableaux sur place."""
+        lune = CorpsCeleste("Lune", 7.35e22, 1.74e6, [1.5e11, 0.0, 0.0], [0.0, 30.8e3, 0.0], (200, 200, 200))
+        self.systeme.planetes.append(lune)
+        self.systeme.synchroniser()
+        tampon = self.systeme.positions
+        self.terre.rayon = 6.4e6
+        self.assertEqual(self.systeme.rayons[1], 6.4e6)
+        
+        self.systeme.retirer_corps([self.terre, self.terre])
+        self.assertEqual(self.systeme.planetes, [lune])
+        self.assertIsNone(self.terre.systeme)
+        np.testing.assert_array_equal(self.terre.position, [1.496e11, 0.0, 0.0])
+        self.assertEqual(lune.indice, 1)
+        self.assertTrue(np.shares_memory(self.systeme.positions, tampon))
+        np.testing.assert_array_equal(self.systeme.positions, [[0.0, 0.0, 0.0], [1.5e11, 0.0, 0.0]])
+        np.testing.assert_array_equal(self.systeme.rayons, [6.96e8, 1.74e6])
+        # Les vues des corps désignent leur nouvelle ligne, sans réindexation
+        lune.position += 1.0
+        self.assertIs(self.systeme.synchroniser(), self.systeme.corps_indexes)
+        np.testing.assert_array_equal(self.systeme.positions[1], [1.5e11 + 1.0, 1.0, 1.0])
+        
+        # Un corps étranger au système est ignoré
+        self.systeme.retirer_corps([self.terre])
+        self.assertEqual(len(self.systeme.masses), 2)
+    
+    def test_ajouter_retirer_corps(self):
+        """Teste les ajouts et retraits successifs, sans réindexation ni réallocation à chaque ajout."""
+        systeme = self.systeme
+        systeme.synchroniser()
+        tampons = set()
+        planetes = []
+        for i in range(1000):
+            planete = CorpsCeleste(f"P{i}", 1e20 + i, 1e3, [1e11 + i, 0.0, 0.0], [0.0, 3e4, 0.0], (0, 0, 255))
+            systeme.ajouter_corps(planete)
+            planetes.append(planete)
+            tampons.add(id(systeme._tampons['positions']))
+        # Capacité doublée : une dizaine de réallocations pour mille ajouts
+        self.assertLess(len(tampons), 12)
+        
+        etoile = CorpsCeleste("Compagnon", 1e29, 1e8, [5e11, 0.0, 0.0], [0.0, 0.0, 0.0], (255, 0, 0))
+        systeme.ajouter_corps(etoile, etoile=True)
+        identifiant = planetes[500].id
+        self.assertIs(systeme.corps_par_id(identifiant), planetes[500])
+        version = systeme.version_lignes
+        systeme.retirer_corps([self.soleil, planetes[500], planetes[3]])
+        self.assertGreater(systeme.version_lignes, version)
+        self.assertIsNone(systeme.corps_par_id(identifiant))
+        self.assertEqual(systeme.etoiles, [etoile])
+        self.assertIsNone(self.soleil.systeme)
+        
+        # Lignes toujours dans l'ordre des listes, et état de chaque corps sur sa ligne
+        corps_liste = systeme.obtenir_tous_corps()
+        self.assertTrue(systeme.est_indexe(corps_liste))
+        self.assertEqual(len(corps_liste), 1000)
+        for indice, corps in enumerate(corps_liste):
+            self.assertEqual(corps.indice, indice)
+            self.assertEqual(systeme.masses[indice], corps.masse)
+            self.assertIs(systeme.corps_par_id(corps.id), corps)
+        planetes[7].position += 1.0
+        self.assertEqual(systeme.positions[planetes[7].indice, 0], 1e11 + 8.0)
+        np.testing.assert_array_equal(etoile.position, [5e11, 0.0, 0.0])
+        self.assertEqual(systeme.rayons[0], 1e8)
+        with self.assertRaises(ValueError):
+            systeme.ajouter_corps(etoile)
+    
+    def test_charger_scenario(self):
+        """Teste l'ajout d'un scénario en colonnes à un système existant."""
+        self.systeme.synchroniser()
+        scenario = {
+            'noms': np.array(['Etoile', 'Planete']),
+            'masses': np.array([1e30, 1e24]),
+            'rayons': np.array([1e8, 1e6]),
+            'positions': np.array([[1e12, 0.0, 0.0], [2e12, 0.0, 0.0]]),
+            'vitesses': np.zeros((2, 3)),
+            'couleurs': np.array([[255, 0, 0], [255, 0, 0]], dtype=np.uint8),
+            'nb_etoiles': 1,
+        }
+        self.systeme.charger_scenario(scenario)
+        self.assertEqual([corps.nom for corps in self.systeme.obtenir_tous_corps()],
+                         ['Soleil', 'Etoile', 'Terre', 'Planete'])
+        np.testing.assert_array_equal(self.systeme.positions[:, 0], [0.0, 1e12, 1.496e11, 2e12])
+        self.assertEqual(self.systeme.etoiles[1].couleur, (255, 0, 0))
+        self.assertIs(self.systeme.etoiles[1].couleur, self.systeme.planetes[1].couleur)
+        self.assertEqual(self.terre.indice, 2)
 
 
 class TestSystemeSolaireFactory(unittest.TestCase):
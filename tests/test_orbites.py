@@ -0,0 +1,109 @@
+import unittest
+import numpy as np
+from src import orbites
+from src.orbites import elements_orbitaux, points_orbites, elements_systeme
+from src.modele import SystemeSolaire, CorpsCeleste
+
+
+MU_SOLEIL = 1.32712440018e20
+
+
+def etat_depuis_elements(a, e, i, Omega, omega, nu, mu):
+    """Calcule la position et la vitesse correspondant à des éléments orbitaux."""
+    p = a * (1 - e ** 2)
+    r = p / (1 + e * np.cos(nu))
+    position_plan = np.array([r * np.cos(nu), r * np.sin(nu), 0.0])
+    vitesse_plan = np.sqrt(mu / p) * np.array([-np.sin(nu), e + np.cos(nu), 0.0])
+    
+    def rotation_z(angle):
+        c, s = np.cos(angle), np.sin(angle)
+        return np.array([[c, -s, 0.0], [s, c, 0.0], [0.0, 0.0, 1.0]])
+    
+    def rotation_x(angle):
+        c, s = np.cos(angle), np.sin(angle)
+        return np.array([[1.0, 0.0, 0.0], [0.0, c, -s], [0.0, s, c]])
+    
+    rotation = rotation_z(Omega) @ rotation_x(i) @ rotation_z(omega)
+    return rotation @ position_plan, rotation @ vitesse_plan
+
+
+class TestOrbites(unittest.TestCase):
+    """Tests du calcul des éléments orbitaux et des ellipses."""
+    
+    def test_orbite_circulaire(self):
+        """Test des éléments d'une orbite circulaire dans le plan de l'écliptique."""
+        r = 1.496e11
+        v = np.sqrt(MU_SOLEIL / r)
+        elements = elements_orbitaux(np.array([[r, 0.0, 0.0]]), np.array([[0.0, v, 0.0]]), MU_SOLEIL)
+        self.assertAlmostEqual(elements['a'][0] / r, 1.0, places=9)
+        self.assertLess(elements['e'][0], 1e-9)
+        self.assertAlmostEqual(elements['i'][0], 0.0)
+    
+    def test_elements_connus(self):
+        """Test que des éléments quelconques sont retrouvés à partir de l'état correspondant."""
+        attendus = [
+            (1.5e11, 0.2, 0.3, 1.0, 2.0, 0.5),
+            (4.0e11, 0.6, 1.2, 4.0, 0.7, 3.5),
+            (8.0e10, 0.05, 2.5, 0.2, 5.0, 6.0),
+        ]
+        positions, vitesses = zip(*(etat_depuis_elements(*el, MU_SOLEIL) for el in attendus))
+        elements = elements_orbitaux(np.array(positions), np.array(vitesses), MU_SOLEIL)
+        for cle, colonne in zip(['a', 'e', 'i', 'Omega', 'omega', 'nu'], np.array(attendus).T):
+            np.testing.assert_allclose(elements[cle], colonne, rtol=1e-9, atol=1e-9, err_msg=cle)
+    
+    def test_orbite_hyperbolique(self):
+        """Test qu'une orbite non liée n'a pas d'ellipse."""
+        r = 1.496e11
+        v = 2 * np.sqrt(2 * MU_SOLEIL / r)
+        elements = elements_orbitaux(np.array([[r, 0.0, 0.0]]), np.array([[0.0, v, 0.0]]), MU_SOLEIL)
+        self.assertGreater(elements['e'][0], 1.0)
+        self.assertLess(elements['a'][0], 0.0)
+        self.assertTrue(np.isnan(points_orbites(elements, 16)).all())
+    
+    def test_points_orbites(self):
+        """Test que les points échantillonnés sont sur l'ellipse."""
+        a, e = 2.0e11, 0.4
+        position, vitesse = etat_depuis_elements(a, e, 0.5, 1.0, 2.0, 0.0, MU_SOLEIL)
+        elements = elements_orbitaux(position[None, :], vitesse[None, :], MU_SOLEIL)
+        points = points_orbites(elements, 64)[0]
+        self.assertEqual(points.shape, (64, 3))
+        # Le premier point est le périapside, situé à la position de départ
+        np.testing.assert_allclose(points[0], position, rtol=1e-9, atol=1.0)
+        # Somme des distances aux deux foyers constante et égale à 2a
+        second_foyer = -2 * a * e * elements['P'][0]
+        sommes = np.linalg.norm(points, axis=1) + np.linalg.norm(points - second_foyer, axis=1)
+        np.testing.assert_allclose(sommes, 2 * a, rtol=1e-9)
+    
+    def test_elements_systeme(self):
+        """Test des éléments des planètes autour de l'étoile la plus massive."""
+        naine = CorpsCeleste("Naine", 1e29, 1e8, [5e12, 0.0, 0.0], [0.0, 0.0, 0.0], (255, 0, 0))
+        soleil = CorpsCeleste("Soleil", 1.989e30, 6.96e8, [1e9, 0.0, 0.0], [0.0, 1e3, 0.0], (255, 255, 0))
+        v = np.sqrt(SystemeSolaire.G * (1.989e30 + 5.97e24) / 1.496e11)
+        terre = CorpsCeleste("Terre", 5.97e24, 6.37e6, [1e9 + 1.496e11, 0.0, 0.0], [0.0, 1e3 + v, 0.0], (0, 0, 255))
+        systeme = SystemeSolaire(etoiles=[naine, soleil], planetes=[terre])
+        elements = elements_systeme(systeme)
+        self.assertEqual(elements['noms'], ["Terre"])
+        self.assertAlmostEqual(elements['a'][0] / 1.496e11, 1.0, places=9)
+        self.assertLess(elements['e'][0], 1e-9)
+
+    def test_etat_depuis_elements(self):
+        """Test du calcul vectorisé des positions et vitesses, inverse des éléments orbitaux."""
+        a = np.array([1.496e11, 2.279e11, -5e11])
+        e = np.array([0.0167, 0.3, 1.5])
+        i = np.array([0.0, 0.4, 1.0])
+        Omega = np.array([0.0, 1.2, 4.0])
+        omega = np.array([0.5, 2.0, 0.3])
+        nu = np.array([1.0, 3.0, 0.2])
+        positions, vitesses = orbites.etat_depuis_elements(a, e, i, Omega, omega, nu, MU_SOLEIL)
+
+        for k in range(3):
+            position, vitesse = etat_depuis_elements(a[k], e[k], i[k], Omega[k], omega[k], nu[k], MU_SOLEIL)
+            np.testing.assert_allclose(positions[k], position, rtol=1e-12, atol=1e-3)
+            np.testing.assert_allclose(vitesses[k], vitesse, rtol=1e-12, atol=1e-9)
+        elements = elements_orbitaux(positions[:2], vitesses[:2], MU_SOLEIL)
+        np.testing.assert_allclose(elements['a'], a[:2], rtol=1e-9)
+        np.testing.assert_allclose(elements['nu'], nu[:2], rtol=1e-9)
+
+
+if __name__ == '__main__':
+    unittest.main()
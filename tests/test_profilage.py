@@ -0,0 +1,73 @@
+import os
+import pstats
+import tempfile
+import tracemalloc
+import unittest
+import numpy as np
+from src.profilage import SessionProfilage
+from src.modele import SystemeSolaire, CorpsCeleste
+from src.simulation import Simulation
+
+
+class TestSessionProfilage(unittest.TestCase):
+    """Tests du profilage en ligne de commande."""
+
+    def setUp(self):
+        """Initialisation des tests."""
+        self.dossier = tempfile.TemporaryDirectory()
+        systeme = SystemeSolaire([], [])
+        systeme.etoiles = [CorpsCeleste("Soleil", 1.989e30, 696340e3, np.zeros(3), np.zeros(3), (255, 255, 0))]
+        systeme.planetes = [CorpsCeleste(f"P{i}", 1e24, 1e6, np.array([1e11 * (i + 1), 0, 0]),
+                                         np.array([0, 3e4, 0]), (255, 255, 255)) for i in range(20)]
+        self.simulation = Simulation(systeme, dt=3600.0)
+
+    def tearDown(self):
+        """Nettoie après chaque test."""
+        self.dossier.cleanup()
+
+    def test_fenetre(self):
+        """Test de la fenêtre en itérations puis en temps simulé."""
+        session = SessionProfilage(self.dossier.name, nb_iterations=3)
+        self.assertEqual([session.avancer(0.0) for _ in range(3)], [False, False, True])
+        session = SessionProfilage(self.dossier.name, nb_iterations=None, duree=7200.0)
+        self.assertEqual([session.avancer(t) for t in (3600.0, 7200.0, 10800.0)], [False, False, True])
+
+    def test_profil_cpu(self):
+        """Test des fichiers pstats et piles repliées."""
+        session = SessionProfilage(self.dossier.name, nb_iterations=None, periode_echantillonnage=0.001)
+        session.demarrer()
+        for _ in range(1000):
+            self.simulation.simuler(3600.0)
+            if sum(session.piles.values()) >= 5:
+                break
+        fichiers = session.arreter()
+
+        noms = sorted(os.path.basename(f) for f in fichiers)
+        self.assertEqual(noms, ['profil.collapsed', 'profil.pstats', 'profil.txt'])
+        statistiques = pstats.Stats(os.path.join(self.dossier.name, 'profil.pstats'))
+        self.assertTrue(any(fonction[2] == 'simuler' for fonction in statistiques.stats))
+        with open(os.path.join(self.dossier.name, 'profil.collapsed'), encoding='utf-8') as f:
+            lignes = [ligne.rsplit(' ', 1) for ligne in f.read().splitlines()]
+        self.assertGreaterEqual(sum(int(nombre) for _, nombre in lignes), 5)
+        self.assertTrue(any('simulation.py:simuler;' in pile for pile, _ in lignes))
+
+    def test_profil_memoire(self):
+        """Test du rapport des allocations regroupées par module."""
+        session = SessionProfilage(self.dossier.name, cpu=False, memoire=True)
+        session.demarrer()
+        positions = [corps.position.copy() for corps in self.simulation.systeme.obtenir_tous_corps()]
+        self.simulation.simuler(3600.0)
+        fichiers = session.arreter()
+
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertEqual([os.path.basename(f) for f in fichiers], ['memoire.txt'])
+        with open(fichiers[0], encoding='utf-8') as f:
+            rapport = f.read()
+        for module in ('modele', 'simulation', 'visualisation', 'autres'):
+            self.assertIn(f"== {module} :", rapport)
+        self.assertIn('test_profilage.py', rapport)
+        del positions
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import csv
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from src.profileur import ProfileurImages
+
+
+class TestProfileurImages(unittest.TestCase):
+    """Tests du profileur des images."""
+    
+    def setUp(self):
+        """Initialisation des tests."""
+        # Horloge simulée : une image toutes les 20 ms
+        self.horloge = patch('src.profileur.time.perf_counter', side_effect=[0.0] + [0.02 * i for i in range(1, 50)])
+        self.horloge.start()
+        self.profileur = ProfileurImages(taille_historique=100)
+    
+    def tearDown(self):
+        """Nettoie après chaque test."""
+        self.horloge.stop()
+    
+    def enregistrer(self, nb_images):
+        """Enregistre des images de durées connues."""
+        for _ in range(nb_images):
+            self.profileur.enregistrer_simulation(0.004, 2)
+            self.profileur.enregistrer_image({'echelle': 0.001, 'flip': 0.003})
+    
+    def test_cadence(self):
+        """Test du calcul de la cadence et des pas simulés par seconde."""
+        self.assertEqual(self.profileur.images_par_seconde(), 0.0)
+        self.enregistrer(11)
+        self.assertAlmostEqual(self.profileur.images_par_seconde(), 50.0)
+        self.assertAlmostEqual(self.profileur.pas_par_seconde(), 100.0)
+        self.assertEqual(len(self.profileur.intervalles()), 10)
+    
+    def test_durees_moyennes(self):
+        """Test de la moyenne par phase, simulation en premier."""
+        self.enregistrer(5)
+        moyennes = self.profileur.durees_moyennes()
+        self.assertEqual(list(moyennes), ['simulation', 'echelle', 'flip'])
+        self.assertAlmostEqual(moyennes['simulation'], 0.004)
+        self.assertAlmostEqual(moyennes['flip'], 0.003)
+    
+    def test_exporter_csv(self):
+        """Test de l'export d'une ligne par image, durées en millisecondes."""
+        self.enregistrer(3)
+        chemin = os.path.join(tempfile.mkdtemp(), 'profil.csv')
+        self.profileur.exporter_csv(chemin)
+        with open(chemin, encoding='utf-8') as f:
+            lignes = list(csv.reader(f))
+        os.remove(chemin)
+        self.assertEqual(lignes[0], ['image', 'horodatage_s', 'intervalle_ms', 'pas',
+                                     'simulation_ms', 'echelle_ms', 'flip_ms'])
+        self.assertEqual(len(lignes), 4)
+        self.assertEqual(lignes[1][2], '')
+        self.assertAlmostEqual(float(lignes[2][2]), 20.0)
+        self.assertAlmostEqual(float(lignes[2][4]), 4.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
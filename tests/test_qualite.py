@@ -0,0 +1,68 @@
+import unittest
+import time
+from src.qualite import ControleurQualite
+
+
+class TestControleurQualite(unittest.TestCase):
+    """Tests pour la classe ControleurQualite."""
+    
+    def setUp(self):
+        """Initialisation des tests."""
+        self.controleur = ControleurQualite(budget=0.02, images_degradation=3,
+                                            images_amelioration=5, lissage=0.0)
+    
+    def test_degradation_hors_budget(self):
+        """Test de la baisse de qualité après plusieurs images hors budget."""
+        for _ in range(2):
+            self.assertEqual(self.controleur.mettre_a_jour(0.05), 0)
+        self.assertEqual(self.controleur.mettre_a_jour(0.05), 1)
+        self.assertEqual(self.controleur.parametres['pas_trajectoire'], 2)
+    
+    def test_niveau_borne(self):
+        """Test que le niveau reste dans les bornes."""
+        for _ in range(100):
+            self.controleur.mettre_a_jour(1.0)
+        self.assertEqual(self.controleur.niveau, self.controleur.niveau_max)
+        self.assertTrue(self.controleur.parametres['points'])
+        for _ in range(1000):
+            self.controleur.mettre_a_jour(0.001)
+        self.assertEqual(self.controleur.niveau, 0)
+    
+    def test_hysteresis(self):
+        """Test que la qualité ne change pas entre les deux seuils."""
+        self.controleur.niveau = 2
+        for _ in range(100):
+            self.controleur.mettre_a_jour(0.015)  # Entre 60% et 100% du budget
+        self.assertEqual(self.controleur.niveau, 2)
+        
+        # Une alternance d'images lentes et rapides ne fait pas osciller le niveau
+        for _ in range(50):
+            self.controleur.mettre_a_jour(0.05)
+            self.controleur.mettre_a_jour(0.001)
+        self.assertEqual(self.controleur.niveau, 2)
+    
+    def test_amelioration_avec_marge(self):
+        """Test du rétablissement de la qualité lorsqu'il reste de la marge."""
+        self.controleur.niveau = 2
+        for _ in range(4):
+            self.controleur.mettre_a_jour(0.005)
+        self.assertEqual(self.controleur.niveau, 2)
+        self.controleur.mettre_a_jour(0.005)
+        self.assertEqual(self.controleur.niveau, 1)
+    
+    def test_inactif(self):
+        """Test qu'un contrôleur inactif ne change pas le niveau."""
+        self.controleur.actif = False
+        for _ in range(10):
+            self.controleur.mettre_a_jour(1.0)
+        self.assertEqual(self.controleur.niveau, 0)
+    
+    def test_phase(self):
+        """Test de la mesure de la durée d'une phase."""
+        with self.controleur.phase('test'):
+            time.sleep(0.01)
+        self.assertGreaterEqual(self.controleur.durees_phases['test'], 0.009)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import os
+import socket
+import tempfile
+import time
+import unittest
+import numpy as np
+from src.client import ClientInstantanes
+from src.generateur import disque_kepler, vers_systeme
+from src.modele import SystemeSolaire
+from src.serveur import (ServeurInstantanes, ENTETE, COMMANDE, encoder_json, encoder_etat, decoder_etat,
+                         ouvrir_socket)
+from src.simulation import Simulation
+
+
+class TestServeur(unittest.TestCase):
+    """Tests du serveur d'instantanés et de son client."""
+
+    def setUp(self):
+        """Démarre un serveur sur un port libre, diffusant une petite simulation."""
+        self.simulation = Simulation(vers_systeme(disque_kepler(20, graine=1)), dt=3600.0)
+        self.serveur = ServeurInstantanes(port=0)
+        self.serveur.demarrer()
+        self.clients = []
+
+    def tearDown(self):
+        """Ferme les clients et arrête le serveur."""
+        for client in self.clients:
+            client.fermer()
+        self.serveur.arreter()
+
+    def connecter(self, **options):
+        """Connecte un client abonné au serveur de test."""
+        hote, port = self.serveur.adresse
+        client = ClientInstantanes(hote, port)
+        client.connecter(**options)
+        self.clients.append(client)
+        self.assertEqual(client.attendre_reponse(), {'ok': True, 'commande': 'abonner'})
+        return client
+
+    def publier_jusqua(self, condition, delai=5.0):
+        """Fait avancer et publie la simulation jusqu'à ce qu'une condition soit remplie."""
+        fin = time.monotonic() + delai
+        while not condition():
+            self.assertLess(time.monotonic(), fin)
+            self.simulation.simuler(3600.0)
+            self.serveur.publier(self.simulation)
+            time.sleep(0.005)
+
+    def test_encoder_etat(self):
+        """Test de l'encodage binaire d'un instantané, en simple et double précision."""
+        positions = np.random.default_rng(0).normal(0, 1e11, (5, 3))
+        vitesses = np.random.default_rng(1).normal(0, 3e4, (5, 3))
+        for octets, tolerance in ((8, 0.0), (4, 1e-7)):
+            message = encoder_etat(12.5, 3, positions, vitesses, octets)
+            longueur, _ = ENTETE.unpack_from(message)
+            self.assertEqual(longueur, len(message) - ENTETE.size)
+            temps, version, positions_lues, vitesses_lues = decoder_etat(message[ENTETE.size:])
+            self.assertEqual((temps, version), (12.5, 3))
+            np.testing.assert_allclose(positions_lues, positions, rtol=tolerance)
+            np.testing.assert_allclose(vitesses_lues, vitesses, rtol=tolerance)
+
+    def test_diffusion(self):
+        """Test de la réception du catalogue et d'instantanés identiques à l'état simulé."""
+        client = self.connecter(frequence=200.0, precision=64)
+        self.publier_jusqua(lambda: client.nb_etats >= 3)
+        self.assertEqual(len(client.catalogue['noms']), 21)
+
+        # Dernier instantané publié, une fois la simulation arrêtée
+        time.sleep(0.01)
+        self.serveur.publier(self.simulation)
+        fin = time.monotonic() + 5.0
+        while client.etat[0] != self.simulation.temps:
+            self.assertLess(time.monotonic(), fin)
+            client.attendre_etat(0.1)
+        systeme = client.systeme()
+        self.assertIsInstance(systeme, SystemeSolaire)
+        np.testing.assert_array_equal(systeme.positions, self.simulation.systeme.positions)
+        self.assertEqual([corps.nom for corps in systeme.obtenir_tous_corps()], client.catalogue['noms'])
+
+    def test_commandes(self):
+        """Test des commandes de pilotage, exécutées dans le fil de la simulation."""
+        client = self.connecter()
+        client.envoyer({'commande': 'pause'})
+        client.envoyer({'commande': 'acceleration', 'facteur': 0.5})
+        client.envoyer({'commande': 'inconnue'})
+        self.assertFalse(client.attendre_reponse()['ok'])
+        self.publier_jusqua(lambda: self.serveur.en_pause and self.serveur.acceleration == 0.5)
+        self.assertEqual([self.serveur.duree_a_simuler(3600.0) for _ in range(4)], [0.0, 3600.0, 0.0, 3600.0])
+
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin = os.path.join(dossier, 'sauvegarde.npz')
+            client.envoyer({'commande': 'sauvegarde', 'chemin': chemin})
+            self.publier_jusqua(lambda: os.path.exists(chemin))
+            restaure = SystemeSolaire.depuis_npz(chemin)
+            restaure.synchroniser()
+            np.testing.assert_array_equal(restaure.positions, self.simulation.systeme.positions)
+
+    def test_client_lent(self):
+        """Test d'un abonné qui ne lit rien : ses instantanés sont remplacés sans ralentir la simulation."""
+        simulation = Simulation(vers_systeme(disque_kepler(20000, graine=2)), dt=3600.0)
+        hote, port = self.serveur.adresse
+        connexion = ouvrir_socket(hote, port)
+        connexion.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        connexion.sendall(encoder_json(COMMANDE, {'commande': 'abonner', 'frequence': 1000.0, 'precision': 64}))
+        try:
+            debut = time.perf_counter()
+            for _ in range(200):
+                self.serveur.publier(simulation)
+                time.sleep(0.002)
+            duree = time.perf_counter() - debut
+            statistiques = self.serveur.statistiques()
+            self.assertEqual(statistiques['abonnes'], 1)
+            self.assertGreater(statistiques['remplaces'], 100)
+            self.assertLess(statistiques['envoyes'], 100)
+            self.assertLess(duree, 5.0)
+        finally:
+            connexion.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 import numpy as np
-from src.simulation import Simulation
+from src.simulation import Simulation, interpoler_hermite
 from src.modele import SystemeSolaire, CorpsCeleste
 
 
@@ -94,6 +94,47 @@ class TestSimulation(unittest.TestCase):
         tolerance = 1e-6  # 0.0001% de différence relative
         difference_relative = abs((energie_finale - energie_initiale) / energie_initiale)
         self.assertLess(difference_relative, tolerance)
+    
+    def test_interpoler_hermite(self):
+        """Test que l'interpolation reproduit exactement un mouvement cubique."""
+        def position(t):
+            return np.array([[t ** 3 - 2 * t, 4 * t ** 2, 1.0]])
+        
+        def vitesse(t):
+            return np.array([[3 * t ** 2 - 2, 8 * t, 0.0]])
+        
+        t0, t1 = 1.0, 3.0
+        for s in (0.0, 0.25, 0.5, 1.0):
+            attendu = position(t0 + s * (t1 - t0))
+            obtenu = interpoler_hermite(position(t0), vitesse(t0), position(t1), vitesse(t1), t1 - t0, s)
+            np.testing.assert_allclose(obtenu, attendu)
+    
+    def test_positions_interpolees(self):
+        """Test des positions affichées entre deux pas de simulation."""
+        self.assertIsNone(self.simulation.positions_interpolees(0.0))
+        self.simulation.activer_interpolation()
+        depart = self.planete.position.copy()
+        
+        # Un seul état connu : positions courantes
+        np.testing.assert_array_equal(self.simulation.positions_interpolees(1800.0)[1], depart)
+        
+        self.simulation.simuler(3600.0)
+        arrivee = self.planete.position.copy()
+        np.testing.assert_allclose(self.simulation.positions_interpolees(0.0)[1], depart)
+        np.testing.assert_allclose(self.simulation.positions_interpolees(3600.0)[1], arrivee)
+        
+        # À mi-pas, la position est proche du point de l'orbite correspondant
+        milieu = self.simulation.positions_interpolees(1800.0)[1]
+        self.assertGreater(milieu[1], depart[1])
+        self.assertLess(milieu[1], arrivee[1])
+        self.assertAlmostEqual(milieu[1], (depart[1] + arrivee[1]) / 2, delta=1e3)
+        
+        # Même nombre de corps, mais lignes modifiées : pas d'interpolation entre corps différents
+        lune = CorpsCeleste("Lune", 7.35e22, 1.74e6, [1.5e11, 0.0, 0.0], [0.0, 30.8e3, 0.0], (200, 200, 200))
+        self.systeme.ajouter_corps(lune)
+        self.systeme.retirer_corps([self.planete])
+        self.simulation.memoriser_etat()
+        np.testing.assert_array_equal(self.simulation.positions_interpolees(0.0)[1], lune.position)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,96 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+import numpy as np
+from src.traceur import Traceur, TRACEUR_NUL
+from src.qualite import ControleurQualite
+from src.modele import SystemeSolaire, CorpsCeleste
+from src.simulation import Simulation
+
+
+class TestTraceur(unittest.TestCase):
+    """Tests du traceur au format Chrome trace-event."""
+
+    def setUp(self):
+        """Initialisation des tests."""
+        self.dossier = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Nettoie après chaque test."""
+        self.dossier.cleanup()
+
+    def test_tampon_circulaire(self):
+        """Test du remplacement des intervalles les plus anciens lorsque le tampon est plein."""
+        traceur = Traceur(capacite=3)
+        for i in range(5):
+            traceur.enregistrer(f"e{i}", 1000 * i, 1000 * i + 10)
+        self.assertEqual(traceur.nb_perdus, 2)
+        evenements = traceur.evenements()
+        self.assertEqual([e[0] for e in evenements], ['e2', 'e3', 'e4'])
+        self.assertEqual(evenements[0][1:3], (2000, 10))
+        self.assertEqual(evenements[0][3], threading.get_native_id())
+
+    def test_span(self):
+        """Test de l'enregistrement d'un bloc, y compris en cas d'exception."""
+        traceur = Traceur(capacite=8)
+        with self.assertRaises(ValueError):
+            with traceur.span('bloc'):
+                raise ValueError()
+        (nom, debut, duree, _), = traceur.evenements()
+        self.assertEqual(nom, 'bloc')
+        self.assertGreaterEqual(duree, 0)
+
+    def test_traceur_nul(self):
+        """Test du traceur inactif, qui n'enregistre rien."""
+        with TRACEUR_NUL.span('bloc'):
+            TRACEUR_NUL.enregistrer('autre', 0, 1)
+        self.assertFalse(TRACEUR_NUL.actif)
+
+    def test_phases_simulation_et_rendu(self):
+        """Test des intervalles de chaque pas et des phases mesurées par le contrôleur de qualité."""
+        systeme = SystemeSolaire([], [])
+        systeme.etoiles = [CorpsCeleste("Soleil", 1.989e30, 696340e3, np.zeros(3), np.zeros(3), (255, 255, 0))]
+        systeme.planetes = [CorpsCeleste("Terre", 5.972e24, 6371e3, np.array([1.496e11, 0, 0]),
+                                         np.array([0, 29780.0, 0]), (0, 0, 255))]
+        simulation = Simulation(systeme, dt=3600.0)
+        traceur = Traceur(capacite=64)
+        simulation.traceur = traceur
+        simulation.simuler(2 * 3600.0)
+        qualite = ControleurQualite()
+        qualite.traceur = traceur
+        with qualite.phase('corps'):
+            pass
+
+        noms = [e[0] for e in traceur.evenements()]
+        self.assertEqual(noms, ['forces/gravite', 'forces', 'kick', 'drift'] * 2 + ['simuler', 'corps'])
+        # Les phases d'un pas se suivent et sont incluses dans l'appel de simuler,
+        # chaque terme de force dans la phase des forces
+        evenements = traceur.evenements()
+        self.assertLessEqual(evenements[1][1] + evenements[1][2], evenements[2][1])
+        self.assertLessEqual(evenements[1][1], evenements[0][1])
+        self.assertLessEqual(evenements[0][1] + evenements[0][2], evenements[1][1] + evenements[1][2])
+        self.assertLessEqual(evenements[8][1], evenements[1][1])
+        self.assertAlmostEqual(qualite.durees_phases['corps'], evenements[9][2] * 1e-9)
+
+    def test_export_chrome(self):
+        """Test du fichier JSON au format Chrome trace-event."""
+        traceur = Traceur(capacite=8)
+        debut = traceur._origine
+        traceur.enregistrer('pas', debut + 1500, debut + 4000)
+        chemin = os.path.join(self.dossier.name, 'trace.json')
+        traceur.exporter_chrome(chemin)
+
+        with open(chemin, encoding='utf-8') as f:
+            trace = json.load(f)
+        metadonnees, evenement = trace['traceEvents']
+        self.assertEqual(metadonnees['ph'], 'M')
+        self.assertEqual(metadonnees['args']['name'], threading.current_thread().name)
+        self.assertEqual(evenement, {'ph': 'X', 'name': 'pas', 'pid': 1, 'tid': threading.get_native_id(),
+                                     'ts': 1.5, 'dur': 2.5})
+        self.assertEqual(trace['otherData']['perdus'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
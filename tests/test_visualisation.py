@@ -3,6 +3,8 @@ import numpy as np
 import pygame
 from src.visualisation import Visualisation
 from src.modele import SystemeSolaire, CorpsCeleste
+from src.simulation import Simulation
+from src.diagnostics import Diagnostics
 from unittest.mock import patch, MagicMock
 
 
@@ -21,12 +23,14 @@ class TestVisualisation(unittest.TestCase):
         corps1.rayon = 696340e3  # Rayon du Soleil
         corps1.couleur = (255, 255, 0)
         corps1.nom = "Soleil"  # Ajout du nom
+        corps1.masse = 1.989e30
         
         corps2 = MagicMock()
         corps2.position = np.array([1.0e11, 0.0, 0.0])
         corps2.rayon = 6371e3  # Rayon de la Terre
         corps2.couleur = (0, 0, 255)
         corps2.nom = "Terre"  # Ajout du nom
+        corps2.masse = 5.972e24
         
         self.systeme.obtenir_tous_corps.return_value = [corps1, corps2]
         self.systeme.etoiles = [corps1]
@@ -64,6 +68,36 @@ class TestVisualisation(unittest.TestCase):
         self.assertNotEqual(x, 400)  # Ne devrait pas être au centre
         self.assertEqual(y, 300)  # Devrait être sur l'axe horizontal
     
+    def test_projeter(self):
+        """Test de la projection vectorisée des positions."""
+        positions = np.array([
+            [0.0, 0.0, 0.0],
+            [1.496e11, -2.0e10, 5.0e9],
+            [-7.5e10, 3.3e10, 0.0]
+        ])
+        echelle = 1e-9
+        coordonnees = self.visu.projeter(positions, echelle)
+        self.assertEqual(coordonnees.shape, (3, 2))
+        for position, pixel in zip(positions, coordonnees):
+            self.assertEqual(tuple(pixel), self.visu.convertir_coordonnees(position, echelle))
+    
+    def test_calculer_tailles(self):
+        """Test du calcul vectorisé de la taille des corps."""
+        rayons = np.array([6.96e8, 6.37e6, 1.0, 1e30])
+        tailles = self.visu.calculer_tailles(rayons, 1e-9)
+        self.assertEqual(tailles[0], int(np.log1p(6.96e8 * 1e-7) * 5.0))
+        self.assertEqual(tailles[2], 2, "La taille minimale est de 2 pixels")
+        self.assertEqual(tailles[3], int(min(self.visu.largeur, self.visu.hauteur) * 0.2),
+                         "La taille est limitée à 20% de la fenêtre")
+    
+    def test_calculer_echelle_positions_fournies(self):
+        """Test du calcul de l'échelle à partir d'un tableau de positions."""
+        positions, _, _ = self.visu.extraire_etat(self.systeme.obtenir_tous_corps())
+        self.visu.echelle_courante = None
+        echelle = self.visu.calculer_echelle(self.systeme, positions)
+        self.visu.echelle_courante = None
+        self.assertEqual(echelle, self.visu.calculer_echelle(self.systeme))
+    
     def test_ajouter_point_trajectoire(self):
         """Test de l'ajout d'un point à la trajectoire."""
         position = np.array([1.496e11, 0.0, 0.0])
@@ -250,6 +284,37 @@ class TestVisualisation(unittest.TestCase):
         couleur_apres = self.visu.ecran.get_at((self.visu.largeur // 2, self.visu.hauteur // 2))
         self.assertNotEqual(couleur_avant, couleur_apres, "La grille devrait avoir été dessinée même avec une grande échelle")
 
+    def test_dessiner_grille_en_cache(self):
+        """Test de la réutilisation de la grille pré-rendue."""
+        self.visu.dessiner_grille(1e-10)
+        grille = self.visu._couche_grille
+        self.visu.dessiner_grille(1e-10)
+        self.assertIs(self.visu._couche_grille, grille, "La grille ne devrait pas être régénérée")
+        
+        # Changement d'échelle : la grille est régénérée
+        self.visu.dessiner_grille(2e-10)
+        self.assertIsNot(self.visu._couche_grille, grille)
+        
+        # Redimensionnement : la grille est invalidée
+        pygame.event.post(pygame.event.Event(pygame.VIDEORESIZE, size=(1024, 768)))
+        self.visu.gerer_evenements()
+        self.assertIsNone(self.visu._couche_grille)
+        self.visu.dessiner_grille(2e-10)
+        self.assertEqual(self.visu._couche_grille.get_size(), (1024, 768))
+    
+    def test_calculer_pas_grille(self):
+        """Test de l'adaptation de l'espacement de la grille à l'échelle."""
+        rayon_max = 500.0
+        for echelle in (1e-13, 1e-12, 1e-10, 1e-9, 1e-8):
+            ua_en_pixels = 149597870700 * echelle
+            pas = Visualisation.calculer_pas_grille(ua_en_pixels, rayon_max)
+            nb_anneaux = int(rayon_max / (pas * ua_en_pixels))
+            self.assertGreaterEqual(nb_anneaux, 2)
+            self.assertLessEqual(nb_anneaux, 6)
+            # Le pas est une valeur ronde (1, 2 ou 5 × 10^k)
+            mantisse = pas / 10.0 ** np.floor(np.log10(pas))
+            self.assertTrue(any(np.isclose(mantisse, m) for m in (1.0, 2.0, 5.0)))
+    
     def test_afficher(self):
         """Test de l'affichage du système solaire."""
         # Sauvegarde l'état initial
@@ -350,6 +415,205 @@ class TestVisualisation(unittest.TestCase):
             # Vérifie que le programme peut continuer après l'erreur
             self.visu.afficher(self.systeme)  # Ne devrait pas lever d'erreur
 
+    def test_couche_trajectoires_incrementale(self):
+        """Test du tracé incrémental des trajectoires sur la couche persistante."""
+        terre = self.systeme.planetes[0]
+        self.visu.afficher(self.systeme)
+        couche = self.visu.couche_trajectoires
+        self.assertIsNotNone(couche)
+        
+        # Déplace la Terre : seul le nouveau segment est tracé sur la même couche
+        terre.position = np.array([1.0e11, 2.0e10, 0.0])
+        self.visu.mettre_a_jour_temps(1.0)
+        self.visu.afficher(self.systeme)
+        self.assertIs(self.visu.couche_trajectoires, couche, "La couche ne devrait pas être recréée")
+        echelle = self.visu._echelle_couche
+        milieu = self.visu.convertir_coordonnees(np.array([1.0e11, 1.0e10, 0.0]), echelle)
+        self.assertEqual(couche.get_at(milieu)[3], 255, "Le nouveau segment devrait être tracé")
+    
+    def test_couche_trajectoires_reconstruction(self):
+        """Test de la reconstruction de la couche lors d'un changement de taille."""
+        self.visu.afficher(self.systeme)
+        couche = self.visu.couche_trajectoires
+        
+        event = pygame.event.Event(pygame.VIDEORESIZE, size=(1024, 768))
+        pygame.event.post(event)
+        self.visu.gerer_evenements()
+        self.visu.afficher(self.systeme)
+        self.assertIsNot(self.visu.couche_trajectoires, couche)
+        self.assertEqual(self.visu.couche_trajectoires.get_size(), (1024, 768))
+    
+    def test_estomper_couche_trajectoires(self):
+        """Test de l'estompage progressif des segments anciens."""
+        self.visu.duree_trajectoire = 10.0
+        self.visu.reconstruire_couche_trajectoires(1e-9)
+        terre = self.systeme.planetes[0]
+        self.visu.ajouter_point_trajectoire(terre, np.array([1.0e11, 0.0, 0.0]))
+        self.visu.ajouter_point_trajectoire(terre, np.array([1.0e11, 5.0e10, 0.0]))
+        pixel = self.visu.convertir_coordonnees(np.array([1.0e11, 2.5e10, 0.0]), 1e-9)
+        self.assertEqual(self.visu.couche_trajectoires.get_at(pixel)[3], 255)
+        
+        # À mi-parcours de la durée de conservation, l'opacité est divisée par deux
+        self.visu.mettre_a_jour_temps(5.0)
+        self.visu.estomper_couche_trajectoires()
+        self.assertAlmostEqual(self.visu.couche_trajectoires.get_at(pixel)[3], 128, delta=1)
+        
+        # Au-delà de la durée de conservation, le segment a disparu
+        self.visu.mettre_a_jour_temps(10.0)
+        self.visu.estomper_couche_trajectoires()
+        self.assertEqual(self.visu.couche_trajectoires.get_at(pixel)[3], 0)
+    
+    def test_afficher_reutilise_textes(self):
+        """Test que les noms et la date ne sont pas rendus à nouveau à chaque image."""
+        self.visu.afficher(self.systeme)
+        echecs = self.visu.cache_rendu.echecs
+        texte_date = self.visu._texte_date
+        
+        self.visu.afficher(self.systeme)
+        self.assertEqual(self.visu.cache_rendu.echecs, echecs, "Aucun texte ne devrait être rendu à nouveau")
+        self.assertIs(self.visu._texte_date, texte_date, "La date inchangée ne devrait pas être rendue à nouveau")
+        
+        self.visu.mettre_a_jour_temps(1.0)
+        self.visu.afficher(self.systeme)
+        self.assertIsNot(self.visu._texte_date, texte_date)
+    
+    def test_afficher_elimine_corps_hors_ecran(self):
+        """Test que les corps hors de la fenêtre ne sont pas dessinés."""
+        # Position hors de la fenêtre même avec l'échelle minimale
+        self.systeme.planetes[0].position = np.array([1.0e16, 0.0, 0.0])
+        self.visu.afficher(self.systeme)
+        with patch('pygame.draw.circle') as mock_cercle:
+            self.visu.afficher(self.systeme)
+            self.assertEqual(mock_cercle.call_count, 1, "Seul le Soleil devrait être dessiné")
+    
+    def test_afficher_etiquettes_sans_chevauchement(self):
+        """Test que seule l'étiquette du corps le plus massif est affichée en cas de chevauchement."""
+        legere = CorpsCeleste("Legere", 1.0, 1.0, [1.0e11, 0.0, 0.0], [0.0, 0.0, 0.0], (255, 0, 0))
+        lourde = CorpsCeleste("Lourde", 1e25, 1.0, [1.0e11, 1.0e8, 0.0], [0.0, 0.0, 0.0], (0, 255, 0))
+        corps_liste = [legere, lourde]
+        coordonnees = np.array([[300, 300], [301, 301]])
+        tailles = np.array([2, 2])
+        
+        self.visu.ecran = MagicMock()
+        self.visu.afficher_etiquettes(corps_liste, coordonnees, tailles, np.array([1, 0]))
+        self.assertEqual(self.visu.ecran.blit.call_count, 1)
+        self.assertIs(self.visu.ecran.blit.call_args[0][0],
+                      self.visu.cache_rendu.texte("Lourde", self.visu.BLANC, 24))
+        
+        # Des étiquettes éloignées sont toutes affichées
+        coordonnees = np.array([[100, 100], [400, 400]])
+        self.visu.ecran.reset_mock()
+        self.visu.afficher_etiquettes(corps_liste, coordonnees, tailles, np.array([1, 0]))
+        self.assertEqual(self.visu.ecran.blit.call_count, 2)
+    
+    def test_afficher_points_grand_nombre(self):
+        """Test de l'affichage des petits corps sous forme de points au-delà du seuil."""
+        soleil = CorpsCeleste("Soleil", 1.989e30, 6.96e8, [0.0, 0.0, 0.0], [0.0, 0.0, 0.0], (255, 255, 0))
+        terre = CorpsCeleste("Terre", 5.97e24, 6.37e6, [1.0e11, 0.0, 0.0], [0.0, 0.0, 0.0], (0, 0, 255))
+        asteroides = [
+            CorpsCeleste(f"A{i}", 1e15, 1e3, [-5.0e10, (i - 2) * 2.0e10, 0.0], [0.0, 0.0, 0.0], (255, 0, 255))
+            for i in range(5)
+        ]
+        systeme = SystemeSolaire(etoiles=[soleil], planetes=[terre] + asteroides)
+        self.visu.seuil_points = 3
+        
+        detailles = self.visu.selectionner_corps_detailles(systeme, np.array(
+            [c.masse for c in systeme.obtenir_tous_corps()]))
+        self.assertEqual(detailles.tolist(), [True, True] + [False] * 5)
+        
+        self.visu.afficher(systeme)
+        echelle = self.visu.echelle_courante
+        for asteroide in asteroides:
+            pixel = self.visu.convertir_coordonnees(asteroide.position, echelle)
+            self.assertEqual(tuple(self.visu.ecran.get_at(pixel))[:3], (255, 0, 255))
+        
+        # Seuls les corps détaillés ont une trajectoire
+        self.assertIn(terre, self.visu.trajectoires)
+        self.assertNotIn(asteroides[0], self.visu.trajectoires)
+    
+    def test_dessiner_points_hors_ecran(self):
+        """Test que les points hors de l'écran sont ignorés."""
+        coordonnees = np.array([[-5, 10], [10, 10], [self.visu.largeur, 10]])
+        couleurs = np.array([[255, 0, 0]] * 3, dtype=np.uint8)
+        self.visu.ecran.fill(self.visu.NOIR)
+        self.visu.dessiner_points(coordonnees, couleurs)
+        self.assertEqual(tuple(self.visu.ecran.get_at((10, 10)))[:3], (255, 0, 0))
+    
+    def test_calculer_densite(self):
+        """Test de l'histogramme du nombre de corps par pixel."""
+        echelle = 1e-9
+        pixels = np.array([[10, 20], [10, 20], [5, 7], [-1, 0], [0, self.visu.hauteur]])
+        centre = np.array([self.visu.largeur / 2, self.visu.hauteur / 2])
+        positions = np.zeros((len(pixels), 3))
+        positions[:, :2] = (pixels + 0.5 - centre) / echelle
+        densite = self.visu.calculer_densite(positions, echelle)
+        self.assertEqual(densite.shape, (self.visu.largeur, self.visu.hauteur))
+        self.assertEqual(densite[10, 20], 2)
+        self.assertEqual(densite[5, 7], 1)
+        self.assertEqual(densite.sum(), 3, "Les corps hors de l'écran sont ignorés")
+    
+    def test_calculer_densite_corps_tres_eloigne(self):
+        """Test qu'un corps dont la coordonnée dépasse la plage des entiers 32 bits est ignoré."""
+        positions = np.array([[3e21, 0.0, 0.0], [0.0, 0.0, 0.0]])
+        densite = self.visu.calculer_densite(positions, 1e-12)
+        self.assertEqual(densite.sum(), 1)
+        self.assertEqual(densite[self.visu.largeur // 2, self.visu.hauteur // 2], 1)
+    
+    def test_afficher_densite(self):
+        """Test de l'affichage en carte de densité avec lissage temporel."""
+        soleil = CorpsCeleste("Soleil", 1.989e30, 6.96e8, [0.0, 0.0, 0.0], [0.0, 0.0, 0.0], (255, 255, 0))
+        particules = [
+            CorpsCeleste(f"P{i}", 1e10, 1.0, [-5.0e10, 5.0e10, 0.0], [0.0, 0.0, 0.0], (255, 255, 255))
+            for i in range(20)
+        ]
+        systeme = SystemeSolaire(etoiles=[soleil], planetes=particules)
+        self.visu.seuil_densite = 10
+        self.visu.lissage_densite = 0.5
+        
+        self.visu.afficher(systeme)
+        self.assertTrue(self.visu.densite_active(len(systeme.obtenir_tous_corps())))
+        pixel = self.visu.convertir_coordonnees(particules[0].position, self.visu.echelle_courante)
+        self.assertEqual(self.visu._densite_lissee[pixel], 20)
+        self.assertNotEqual(tuple(self.visu.ecran.get_at(pixel))[:3], self.visu.NOIR)
+        self.assertNotIn(particules[0], self.visu.trajectoires)
+        
+        # Les particules se déplacent : l'ancienne position s'estompe progressivement
+        for particule in particules:
+            particule.position = np.array([5.0e10, 5.0e10, 0.0])
+        self.visu.afficher(systeme)
+        self.assertEqual(self.visu._densite_lissee[pixel], 10)
+    
+    def test_basculer_mode_densite(self):
+        """Test de la bascule de la carte de densité au clavier."""
+        self.visu.afficher(self.systeme)
+        self.assertFalse(self.visu.densite_active(2))
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, {'key': pygame.K_d}))
+        self.visu.gerer_evenements()
+        self.assertTrue(self.visu.mode_densite)
+        self.assertTrue(self.visu.densite_active(2))
+    
+    def test_afficher_qualite_reduite(self):
+        """Test de l'affichage aux niveaux de qualité les plus bas."""
+        self.visu.qualite.actif = False
+        self.visu.qualite.niveau = 3
+        self.visu.afficher(self.systeme)
+        self.assertIsNone(self.visu._couche_grille, "La grille ne devrait pas être dessinée")
+        
+        # Au niveau minimal, la Terre est affichée comme un point sans trajectoire ni nom
+        self.visu.qualite.niveau = self.visu.qualite.niveau_max
+        self.visu.trajectoires.clear()
+        with patch('pygame.draw.circle') as mock_cercle:
+            self.visu.afficher(self.systeme)
+        self.assertEqual(mock_cercle.call_count, 1, "Seul le Soleil devrait être dessiné en cercle")
+        self.assertNotIn(self.systeme.planetes[0], self.visu.trajectoires)
+    
+    def test_afficher_mesure_phases(self):
+        """Test de la mesure des phases du rendu."""
+        self.visu.afficher(self.systeme)
+        for phase in ('echelle', 'grille', 'hud', 'trajectoires', 'corps', 'etiquettes', 'flip'):
+            self.assertIn(phase, self.visu.qualite.durees_phases)
+        self.assertIsNotNone(self.visu.qualite.duree_moyenne)
+    
     def test_couleur_pastel(self):
         """Test de la conversion d'une couleur en version pastel."""
         # Test avec une couleur rouge
@@ -381,6 +645,105 @@ class TestVisualisation(unittest.TestCase):
         blanc = (255, 255, 255)
         blanc_pastel = self.visu.couleur_pastel(blanc)
         self.assertEqual(blanc_pastel, blanc, "Le blanc devrait rester blanc")
+    
+    def test_afficher_positions_interpolees(self):
+        """Test de l'affichage de positions fournies à la place des positions courantes."""
+        soleil = CorpsCeleste("Soleil", 1.989e30, 6.96e8, [0.0, 0.0, 0.0], [0.0, 0.0, 0.0], (255, 255, 0))
+        terre = CorpsCeleste("Terre", 5.97e24, 6.37e6, [1.496e11, 0.0, 0.0], [0.0, 29.78e3, 0.0], (0, 0, 255))
+        systeme = SystemeSolaire(etoiles=[soleil], planetes=[terre])
+        positions = np.array([[0.0, 0.0, 0.0], [0.0, 1.496e11, 0.0]])
+        
+        self.visu.afficher(systeme, positions)
+        
+        point, _ = self.visu.trajectoires[terre][-1]
+        np.testing.assert_array_equal(point, positions[1])
+        np.testing.assert_array_equal(terre.position, [1.496e11, 0.0, 0.0])
+    
+    def test_afficher_orbites(self):
+        """Test du tracé des ellipses, recalculées seulement si les éléments changent."""
+        soleil = CorpsCeleste("Soleil", 1.989e30, 6.96e8, [0.0, 0.0, 0.0], [0.0, 0.0, 0.0], (255, 255, 0))
+        terre = CorpsCeleste("Terre", 5.97e24, 6.37e6, [1.496e11, 0.0, 0.0], [0.0, 29.78e3, 0.0], (0, 0, 255))
+        systeme = SystemeSolaire(etoiles=[soleil], planetes=[terre])
+        self.visu.afficher_orbites = True
+        self.visu.periode_orbites = 1
+        
+        self.visu.afficher(systeme)
+        self.assertIn(terre, self.visu._orbites)
+        self.assertNotIn(terre, self.visu.trajectoires, "Les ellipses remplacent les trajectoires")
+        points = self.visu._orbites[terre][1]
+        
+        # Variation négligeable : l'ellipse est conservée
+        terre.vitesse[1] *= 1 + 1e-6
+        self.visu.afficher(systeme)
+        self.assertIs(self.visu._orbites[terre][1], points)
+        
+        # Variation importante : l'ellipse est recalculée
+        terre.vitesse[1] *= 1.1
+        self.visu.afficher(systeme)
+        self.assertIsNot(self.visu._orbites[terre][1], points)
+    
+    def test_trajectoires_apres_retrait(self):
+        """Test des trajectoires et des orbites lorsque des corps retirés libèrent leurs lignes."""
+        soleil = CorpsCeleste("Soleil", 1.989e30, 6.96e8, [0.0, 0.0, 0.0], [0.0, 0.0, 0.0], (255, 255, 0))
+        naine = CorpsCeleste("Naine", 1e29, 1e8, [-1.0e11, 0.0, 0.0], [0.0, 0.0, 0.0], (255, 0, 0))
+        planetes = [CorpsCeleste(f"P{i}", 1e24, 1e6, [(i + 1) * 5.0e10, 0.0, 0.0], [0.0, 3e4, 0.0], (0, 0, 255))
+                    for i in range(3)]
+        systeme = SystemeSolaire(etoiles=[naine, soleil], planetes=list(planetes))
+        self.visu.afficher(systeme)
+        
+        # La dernière planète prend la ligne de la première : sa trajectoire la suit
+        systeme.retirer_corps([planetes[0]])
+        planetes[2].position += [0.0, 1.0e10, 0.0]
+        self.visu.afficher(systeme)
+        self.assertNotIn(planetes[0], self.visu.trajectoires)
+        self.assertEqual(len(self.visu.trajectoires[planetes[2]]), 2)
+        np.testing.assert_array_equal(self.visu.trajectoires[planetes[2]][-1][0], planetes[2].position)
+        
+        # Les orbites sont recalculées dès que l'étoile centrale change de ligne
+        self.visu.afficher_orbites = True
+        self.visu.periode_orbites = 1000
+        self.visu.afficher(systeme)
+        self.assertEqual(self.visu._centre_orbites, 1)
+        systeme.retirer_corps([naine])
+        self.visu.afficher(systeme)
+        self.assertEqual(self.visu._centre_orbites, 0)
+        self.assertIs(self.visu._etoile_orbites, soleil)
+    
+    def test_afficher_profileur(self):
+        """Test de l'enregistrement des phases de chaque image et du panneau du profileur."""
+        self.visu.afficher(self.systeme)
+        self.assertNotIn('profileur', self.visu.qualite.durees_phases)
+        
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_p))
+        self.visu.gerer_evenements()
+        self.assertTrue(self.visu.afficher_profileur)
+        self.visu.profileur.enregistrer_simulation(0.002, 3)
+        self.visu.afficher(self.systeme)
+        
+        self.assertEqual(len(self.visu.profileur.historique), 2)
+        _, intervalle, pas, durees = self.visu.profileur.historique[-1]
+        self.assertGreater(intervalle, 0)
+        self.assertEqual(pas, 3)
+        for phase in ['simulation', 'echelle', 'grille', 'trajectoires', 'corps', 'etiquettes', 'flip', 'profileur']:
+            self.assertIn(phase, durees)
+        # Textes rendus avant l'enregistrement de l'image : phases de la première image
+        self.assertEqual(len(self.visu._textes_profileur), 1 + len(self.visu.profileur.historique[0][3]))
+    
+    def test_afficher_diagnostics(self):
+        """Test de l'affichage de la dérive des quantités conservées."""
+        soleil = CorpsCeleste("Soleil", 1.989e30, 6.96e8, [0.0, 0.0, 0.0], [0.0, 0.0, 0.0], (255, 255, 0))
+        terre = CorpsCeleste("Terre", 5.97e24, 6.37e6, [1.496e11, 0.0, 0.0], [0.0, 29.78e3, 0.0], (0, 0, 255))
+        simulation = Simulation(SystemeSolaire(etoiles=[soleil], planetes=[terre]), dt=3600.0)
+        simulation.diagnostics = Diagnostics(periode=1)
+        self.visu.diagnostics = simulation.diagnostics
+        self.visu.afficher(simulation.systeme)  # Aucune mesure : rien n'est affiché
+        
+        simulation.simuler(2 * 3600.0)
+        echecs = self.visu.cache_rendu.echecs
+        self.visu.afficher(simulation.systeme)
+        self.assertEqual(self.visu.cache_rendu.echecs, echecs + 2)
+        for ligne in simulation.diagnostics.lignes_hud():
+            self.assertIn((ligne, self.visu.GRIS, 20, None), self.visu.cache_rendu._textes)
 
 
 if __name__ == '__main__':